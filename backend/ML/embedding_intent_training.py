@@ -0,0 +1,84 @@
+import os
+import sys
+import random
+import logging
+import numpy as np
+from pathlib import Path
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import train_test_split, GridSearchCV
+from sklearn.metrics import classification_report, accuracy_score
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from intent_classifier_training import TRAINING_DATA, generate_additional_data
+from core.langgraph.tools.vector_store import load_embedding_model, embedding_model_id
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def encode_texts(model, texts):
+    # 런타임 EmbeddingService와 같이 정규화한 벡터로 학습해야 헤드를 그대로 쓸 수 있음
+    vectors = np.asarray(model.encode(texts, batch_size=64), dtype='float32')
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1.0)
+
+def train_embedding_intent_classifier():
+    all_data = TRAINING_DATA + generate_additional_data()
+    random.shuffle(all_data)
+    # 런타임에서 템플릿 검색과 임베딩을 공유하도록 TF-IDF와 달리 원문 그대로 인코딩
+    texts = [" ".join(item["text"].split()) for item in all_data]
+    intents = [item["intent"] for item in all_data]
+    
+    X_train, X_test, y_train, y_test = train_test_split(
+        texts, intents, test_size=0.2, random_state=42, stratify=intents
+    )
+    
+    model_id = embedding_model_id()
+    logger.info(f"임베딩 모델 로드 중: {model_id}")
+    model = load_embedding_model()
+    X_train_vec = encode_texts(model, X_train)
+    X_test_vec = encode_texts(model, X_test)
+    
+    grid_search = GridSearchCV(
+        LogisticRegression(max_iter=2000),
+        {'C': [0.1, 1, 10, 100]},
+        cv=5,
+        scoring='accuracy',
+        verbose=1
+    )
+    
+    logger.info("그리드 서치를 통한 최적 하이퍼파라미터 탐색 중...")
+    grid_search.fit(X_train_vec, y_train)
+    
+    best_model = grid_search.best_estimator_
+    logger.info(f"최적 하이퍼파라미터: {grid_search.best_params_}")
+    
+    y_pred = best_model.predict(X_test_vec)
+    accuracy = accuracy_score(y_test, y_pred)
+    logger.info(f"테스트 정확도: {accuracy:.4f}")
+    logger.info("\n분류 보고서:")
+    report = classification_report(y_test, y_pred)
+    logger.info(f"\n{report}")
+    
+    base_dir = Path(__file__).resolve().parent.parent
+    model_dir = base_dir / "core" / "langgraph" / "data"
+    model_dir.mkdir(parents=True, exist_ok=True)
+    head_path = model_dir / "intent_embedding_head.npz"
+    
+    # 추론은 NumPy 행렬곱 한 번이면 되므로 scikit-learn 객체 대신 가중치만 저장
+    np.savez(
+        head_path,
+        weights=best_model.coef_.astype('float32'),
+        bias=best_model.intercept_.astype('float32'),
+        labels=np.array(best_model.classes_, dtype=str),
+        model_id=np.array(model_id)
+    )
+    
+    logger.info(f"임베딩 의도 분류 헤드를 {str(head_path)}에 저장함")
+    return str(head_path)
+
+if __name__ == "__main__":
+    train_embedding_intent_classifier()
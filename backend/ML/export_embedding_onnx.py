@@ -0,0 +1,45 @@
+import sys
+import logging
+import argparse
+from pathlib import Path
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "sentence-transformers/paraphrase-multilingual-mpnet-base-v2"
+
+def export_quantized_model(model_name, output_dir, quantization):
+    from sentence_transformers import SentenceTransformer, export_dynamic_quantized_onnx_model
+    
+    output_dir = Path(output_dir)
+    logger.info(f"ONNX 변환 시작: {model_name}")
+    # backend="onnx"로 로드하면 ONNX 파일이 없을 때 자동으로 변환됨
+    model = SentenceTransformer(model_name, backend="onnx")
+    model.save(str(output_dir))
+    
+    logger.info(f"int8 동적 양자화 시작 (설정: {quantization})")
+    export_dynamic_quantized_onnx_model(model, quantization, str(output_dir))
+    
+    model_file = f"onnx/model_qint8_{quantization}.onnx"
+    logger.info(f"양자화 모델 저장 완료: {output_dir / model_file}")
+    logger.info("다음 환경 변수로 사용:")
+    logger.info(f"  EMBEDDING_MODEL={output_dir}")
+    logger.info("  EMBEDDING_BACKEND=onnx")
+    logger.info(f"  EMBEDDING_MODEL_FILE={model_file}")
+    return output_dir / model_file
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="임베딩 모델을 int8 양자화 ONNX로 변환")
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--output", default=str(Path(__file__).resolve().parent.parent / "data" / "onnx_embedding"))
+    parser.add_argument("--quantization", default="avx2", choices=["arm64", "avx2", "avx512", "avx512_vnni"])
+    args = parser.parse_args()
+    
+    try:
+        export_quantized_model(args.model, args.output, args.quantization)
+    except Exception as e:
+        logger.error(f"ONNX 변환 중 오류 발생: {str(e)}", exc_info=True)
+        sys.exit(1)
@@ -1,6 +1,10 @@
 from fastapi import FastAPI, UploadFile, File, HTTPException, Header, Body
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from fastapi.encoders import jsonable_encoder
 import shutil
+import asyncio
+import json
 import uuid
 import sys
 import os
@@ -12,10 +16,6 @@ from typing import Dict, Any, List, Optional
 
 load_dotenv()
 
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-if not OPENAI_API_KEY:
-    raise ValueError("OPENAI_API_KEY 환경 변수가 설정되지 않았습니다.")
-
 logging.basicConfig(
     level=os.getenv("LOG_LEVEL", "INFO"),
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -30,10 +30,20 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from core.langgraph.graph import create_order_analysis_workflow
 from core.langgraph.state import WorkflowState
-from core.db import init_db, populate_db, get_menu_categories
+from core.langgraph.deadline import create_deadline
+from core.db import get_connection_manager
+from core.menu_snapshot import get_menu_snapshot_store
+from core.async_db import get_async_db
 from core.models.order import OrderSessionManager
 from core.langgraph.nodes.stt_node import load_model
 from core.langgraph.tools.vector_store import VectorStore
+from core.langgraph.tools.circuit_breaker import get_llm_circuit_breaker
+from core.langgraph.tools.llm_backends import get_llm_router, configured_backend_names
+from core.langgraph.speculation import get_speculation_manager
+
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+if "openai" in configured_backend_names() and not OPENAI_API_KEY:
+    raise ValueError("OPENAI_API_KEY 환경 변수가 설정되지 않았습니다.")
 
 app = FastAPI()
 
@@ -73,10 +83,13 @@ async def startup_event():
     vector_store = VectorStore()  
     logger.info("SentenceTransformer 모델 초기화 완료")
     
+    watch_interval = float(os.getenv("RESPONSE_TEMPLATES_WATCH_INTERVAL", 0))
+    if watch_interval > 0:
+        vector_store.start_template_watcher(watch_interval)
+    
     cleanup_old_files()
 
-    init_db()
-    populate_db()
+    await get_async_db().initialize()
     logger.info("DB 초기화 완료")
     
     global session_manager
@@ -90,6 +103,11 @@ async def startup_event():
     logger.info("LangGraph 워크플로우 초기화 완료")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    await get_async_db().shutdown()
+
+
 session_manager = None
 order_analysis_chain = None
 
@@ -97,15 +115,283 @@ order_analysis_chain = None
 @app.get("/menu")
 async def get_menu():
     try:
+        snapshot = await get_async_db().get_menu_snapshot()
         return {
             "status": "success",
-            "data": get_menu_categories()
+            "data": snapshot.categories
         }
     except Exception as e:
         logger.error(f"메뉴 조회 오류: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _save_audio_upload(audio_file: UploadFile, session_id: str, suffix: str = "") -> Path:
+    file_contents = await audio_file.read()
+    await audio_file.seek(0) 
+    
+    if len(file_contents) == 0:
+        logger.error("빈 오디오 파일 수신")
+        raise HTTPException(status_code=400, detail="Empty audio file received")
+    
+    logger.info(f"수신된 오디오 파일 크기: {len(file_contents)} bytes")
+    
+    timestamp = int(time.time())
+    unique_filename = f"{session_id}{suffix}_{timestamp}.webm"
+    temp_file_path = UPLOAD_DIR / unique_filename
+
+    with temp_file_path.open("wb") as buffer:
+        shutil.copyfileobj(audio_file.file, buffer)
+    
+    logger.info(f"임시 파일 저장 완료: {temp_file_path}")
+    return temp_file_path
+
+
+def _remove_temp_file(temp_file_path: Path):
+    try:
+        temp_file_path.unlink()
+        logger.info(f"임시 파일 삭제 완료: {temp_file_path}")
+    except Exception as e:
+        logger.warning(f"임시 파일 삭제 실패: {str(e)}")
+
+
+def _build_initial_state(session, session_id: str, temp_file_path: Path, analysis=None) -> WorkflowState:
+    return {
+        "audio_path": str(temp_file_path),
+        "text": "",
+        "analysis": analysis,
+        "response": None,
+        "session_id": session_id,
+        "conversation_history": session.conversation_history,
+        "pending_clarifications": session.pending_clarifications,
+        "current_order": session.current_order,
+        "deadline": create_deadline()
+    }
+
+
+def _keeps_session_state(response: Dict[str, Any]) -> bool:
+    # 일상 대화이거나 대체 응답이 기존 명확화 질문을 다시 묻는 경우(keep_pending) 세션의 주문/명확화 항목과 응답 문구를 유지
+    return response.get("is_casual_conversation", False) or response.get("keep_pending", False)
+
+
+def _finalize_order_result(session_id: str, session, result: Dict[str, Any]) -> Dict[str, Any]:
+    if not result.get("analysis"):
+        logger.warning("분석 결과 X, 기본값 사용")
+        result["analysis"] = {
+            "items": [],
+            "total_price": 0,
+            "special_requests": ""
+        }
+    
+    if _keeps_session_state(result["response"]) and session.current_order:
+        logger.info(f"일상 대화 감지: 기존 주문 정보 유지 (세션 ID: {session_id})")
+        result["analysis"] = session.current_order
+    
+    session_manager.update_session(session_id, result["analysis"])
+    logger.info(f"세션 업데이트 완료 (세션 ID: {session_id})")
+    
+    if not result.get("response"):
+        logger.warning("응답 X, 기본 응답 사용")
+        result["response"] = {
+            "message": "주문 처리 중 오류가 발생했습니다. 다시 시도해주세요.",
+            "needs_clarification": False,
+            "clarification_items": []
+        }
+        
+    system_response = result["response"]["message"]
+    session_manager.add_conversation(session_id, "assistant", system_response)
+    logger.info(f"시스템 응답: {system_response}")
+     
+    if result["response"]["needs_clarification"]:
+        if result.get("pending_clarifications_resolved", False):
+            logger.info("규칙 기반 노드에서 명확화 항목이 해결된 것으로 감지")
+            
+            session_manager.clear_pending_clarifications(session_id)
+            
+            if result["response"]["clarification_items"]:
+                first_item = result["response"]["clarification_items"][0]
+                session_manager.add_pending_clarification(session_id, first_item)
+                logger.info(f"새 명확화 항목 추가: {first_item}")
+                result["response"]["clarification_items"] = [first_item]
+        else:
+            session_manager.clear_pending_clarifications(session_id)
+            if result["response"]["clarification_items"]:
+                first_item = result["response"]["clarification_items"][0]
+                session_manager.add_pending_clarification(session_id, first_item)
+                logger.info(f"명확화 항목 추가: {first_item}")
+                
+                result["response"]["clarification_items"] = [first_item]
+    else:
+        session_manager.clear_pending_clarifications(session_id)
+    
+    if result["response"]["needs_clarification"] and result["response"]["clarification_items"]:
+        if not _keeps_session_state(result["response"]):
+            result["response"]["message"] = result["response"]["clarification_items"][0]
+    
+    return {
+        "status": "success",
+        "session_id": session_id,
+        "data": {
+            "order": result["analysis"],
+            "message": result["response"]["message"],
+            "needs_clarification": result["response"]["needs_clarification"],
+            "clarification_items": result["response"]["clarification_items"],
+            "is_casual_conversation": result["response"].get("is_casual_conversation", False),
+            "order_complete": False,
+            "should_continue_ordering": True,
+            "asking_for_more_items": False
+        }
+    }
+
+
+def _finalize_clarification_result(session_id: str, session, result: Dict[str, Any]) -> Dict[str, Any]:
+    if not result.get("analysis"):
+        logger.warning("분석 결과 X, 기존 주문 정보 유지")
+        result["analysis"] = session.current_order or {
+            "items": [],
+            "total_price": 0,
+            "special_requests": ""
+        }
+    
+    if _keeps_session_state(result["response"]) and session.current_order:
+        logger.info(f"명확화 중 일상 대화 감지: 기존 주문 정보 유지 (세션 ID: {session_id})")
+        result["analysis"] = session.current_order
+    
+    session_manager.update_session(session_id, result["analysis"])
+    logger.info(f"명확화 응답 후 세션 업데이트 완료 (세션 ID: {session_id})")
+    
+    if result.get("text"):
+        session_manager.add_conversation(session_id, "user", result.get("text"))
+    
+    if not result.get("response"):
+        logger.warning("응답 X, 기본 응답 사용")
+        result["response"] = {
+            "message": "주문 처리 중 오류가 발생했습니다. 다시 시도해주세요.",
+            "needs_clarification": False,
+            "clarification_items": [],
+            "is_casual_conversation": False,
+            "order_complete": False,
+            "should_continue_ordering": True,
+            "asking_for_more_items": False
+        }
+    
+    system_response = result["response"]["message"]
+    session_manager.add_conversation(session_id, "assistant", system_response)
+    logger.info(f"시스템 응답: {system_response}")
+    
+    if result.get("pending_clarifications_resolved", False):
+        logger.info("규칙 기반 노드에서 명확화 항목이 해결된 것으로 감지")
+        
+        if session.pending_clarifications:
+            session_manager.resolve_pending_clarification(session_id)
+            logger.info("명확화 항목 해결 처리 완료")
+    elif not _keeps_session_state(result["response"]):
+        
+        if session.pending_clarifications:
+            session_manager.resolve_pending_clarification(session_id)
+            logger.info("사용자 응답에 따라 첫 번째 명확화 항목 제거")
+    else:
+        logger.info("일상 대화로 감지되어 명확화 항목 유지")
+    
+    if result["response"]["needs_clarification"]:
+        if result["response"]["clarification_items"]:
+            if _keeps_session_state(result["response"]):
+                logger.info("일상 대화 감지: 기존 명확화 항목 유지")
+            else:
+                new_item = result["response"]["clarification_items"][0]
+                is_duplicate = False
+                for item in session.pending_clarifications:
+                    if item.lower() == new_item.lower():
+                        is_duplicate = True
+                        break
+                
+                if not is_duplicate:
+                    session_manager.add_pending_clarification(session_id, new_item)
+                    logger.info(f"새 명확화 항목 추가: {new_item}")
+    
+    has_pending_clarifications = len(session.pending_clarifications) > 0
+    
+    if has_pending_clarifications:
+        next_item = session.pending_clarifications[0]
+        result["response"]["clarification_items"] = [next_item]
+        if not _keeps_session_state(result["response"]):
+            result["response"]["message"] = next_item
+        result["response"]["needs_clarification"] = True
+        logger.info(f"다음 명확화 항목 처리: {next_item}")
+    else:
+        if result["response"].get("clarification_items") and not _keeps_session_state(result["response"]):
+            
+            new_clarification = result["response"]["clarification_items"][0]
+            session_manager.add_pending_clarification(session_id, new_clarification)
+            result["response"]["needs_clarification"] = True
+            result["response"]["message"] = new_clarification  
+            logger.info(f"새 명확화 항목 추가됨 (세션에 없었음): {new_clarification}")
+        else:
+            result["response"]["clarification_items"] = []
+            if not _keeps_session_state(result["response"]):
+                
+                if result["response"].get("asking_for_more_items", False):
+                    result["response"]["message"] = "더 주문하실 것이 있으신가요?"
+                    result["response"]["clarification_items"] = ["더 주문하실 것이 있으신가요?"]
+                    result["response"]["needs_clarification"] = True
+                    
+                    session_manager.add_pending_clarification(session_id, "더 주문하실 것이 있으신가요?")
+                else:
+                    
+                    result["response"]["message"] = "주문이 완료되었습니다. 감사합니다!"
+                    result["response"]["needs_clarification"] = False
+            else:
+                
+                result["response"]["needs_clarification"] = False
+            
+            logger.info("모든 명확화 항목 처리 완료")
+    
+    
+    has_pending_clarifications_after_update = len(session.pending_clarifications) > 0
+    if has_pending_clarifications_after_update:
+        result["response"]["needs_clarification"] = True
+        if len(result["response"]["clarification_items"]) == 0:
+            result["response"]["clarification_items"] = [session.pending_clarifications[0]]
+            
+            if not _keeps_session_state(result["response"]):
+                result["response"]["message"] = session.pending_clarifications[0]
+        logger.info(f"응답 전 최종 확인: 명확화 항목 있음 ({session.pending_clarifications[0]})")
+    
+    return {
+        "status": "success",
+        "session_id": session_id,
+        "data": {
+            "order": result["analysis"],
+            "message": result["response"]["message"],
+            "needs_clarification": result["response"]["needs_clarification"],
+            "clarification_items": result["response"]["clarification_items"],
+            "is_casual_conversation": result["response"].get("is_casual_conversation", False),
+            "order_complete": result["response"].get("order_complete", False),
+            "should_continue_ordering": True,
+            "asking_for_more_items": result["response"].get("asking_for_more_items", False)
+        }
+    }
+
+
+def _get_or_create_session(session_id: Optional[str]):
+    if not session_id:
+        session_id = str(uuid.uuid4())
+        logger.info(f"새 세션 생성: {session_id}")
+    
+    session = session_manager.get_session(session_id)
+    if not session:
+        logger.info(f"기존 세션 없음, 새로 생성: {session_id}")
+        session = session_manager.create_session(session_id)
+    return session_id, session
+
+
+def _get_existing_session(session_id: str):
+    session = session_manager.get_session(session_id)
+    if not session:
+        logger.error(f"세션을 찾을 수 없음: {session_id}")
+        raise HTTPException(status_code=404, detail="Session not found")
+    return session
+
+
 @app.post("/analyze-order")
 async def analyze_order_endpoint(
     audio_file: UploadFile = File(...),
@@ -114,129 +400,25 @@ async def analyze_order_endpoint(
     try:
         logger.info(f"음성 분석 요청 수신: 파일={audio_file.filename}, 세션ID={session_id}")
         
-        if not session_id:
-            session_id = str(uuid.uuid4())
-            logger.info(f"새 세션 생성: {session_id}")
-        
-        session = session_manager.get_session(session_id)
-        if not session:
-            logger.info(f"기존 세션 없음, 새로 생성: {session_id}")
-            session = session_manager.create_session(session_id)
-        
-        file_contents = await audio_file.read()
-        await audio_file.seek(0) 
-        
-        if len(file_contents) == 0:
-            logger.error("빈 오디오 파일 수신")
-            raise HTTPException(status_code=400, detail="Empty audio file received")
-        
-        logger.info(f"수신된 오디오 파일 크기: {len(file_contents)} bytes")
-        
-        timestamp = int(time.time())
-        unique_filename = f"{session_id}_{timestamp}.webm"
-        temp_file_path = UPLOAD_DIR / unique_filename
-    
-        with temp_file_path.open("wb") as buffer:
-            shutil.copyfileobj(audio_file.file, buffer)
-        
-        logger.info(f"임시 파일 저장 완료: {temp_file_path}")
+        session_id, session = _get_or_create_session(session_id)
+        temp_file_path = await _save_audio_upload(audio_file, session_id)
         
         session_manager.add_conversation(session_id, "user", "음성 주문")
         
-        initial_state: WorkflowState = {
-            "audio_path": str(temp_file_path),
-            "text": "",
-            "analysis": None,
-            "response": None,
-            "session_id": session_id,
-            "conversation_history": session.conversation_history,
-            "pending_clarifications": session.pending_clarifications,
-            "current_order": session.current_order
-        }
+        initial_state = _build_initial_state(session, session_id, temp_file_path)
         
         logger.info("LangGraph 워크플로우 실행 시작")
         try:
-            result = order_analysis_chain.invoke(initial_state)
+            result = await order_analysis_chain.ainvoke(initial_state)
             if not result:
                 logger.error("LangGraph 워크플로우가 None 반환")
                 raise ValueError("워크플로우 실행 결과가 없음")
                 
             logger.info(f"LangGraph 워크플로우 실행 완료: 인식된 텍스트={result.get('text', '')}")
             
-            try:
-                temp_file_path.unlink()
-                logger.info(f"임시 파일 삭제 완료: {temp_file_path}")
-            except Exception as e:
-                logger.warning(f"임시 파일 삭제 실패: {str(e)}")
+            _remove_temp_file(temp_file_path)
             
-            
-            if not result.get("analysis"):
-                logger.warning("분석 결과 X, 기본값 사용")
-                result["analysis"] = {
-                    "items": [],
-                    "total_price": 0,
-                    "special_requests": ""
-                }
-            
-            if result["response"].get("is_casual_conversation", False) and session.current_order:
-                logger.info(f"일상 대화 감지: 기존 주문 정보 유지 (세션 ID: {session_id})")
-                result["analysis"] = session.current_order
-            
-            session_manager.update_session(session_id, result["analysis"])
-            logger.info(f"세션 업데이트 완료 (세션 ID: {session_id})")
-            
-            if not result.get("response"):
-                logger.warning("응답 X, 기본 응답 사용")
-                result["response"] = {
-                    "message": "주문 처리 중 오류가 발생했습니다. 다시 시도해주세요.",
-                    "needs_clarification": False,
-                    "clarification_items": []
-                }
-                
-            system_response = result["response"]["message"]
-            session_manager.add_conversation(session_id, "assistant", system_response)
-            logger.info(f"시스템 응답: {system_response}")
-             
-            if result["response"]["needs_clarification"]:
-                if result.get("pending_clarifications_resolved", False):
-                    logger.info("규칙 기반 노드에서 명확화 항목이 해결된 것으로 감지")
-                    
-                    session_manager.clear_pending_clarifications(session_id)
-                    
-                    if result["response"]["clarification_items"]:
-                        first_item = result["response"]["clarification_items"][0]
-                        session_manager.add_pending_clarification(session_id, first_item)
-                        logger.info(f"새 명확화 항목 추가: {first_item}")
-                        result["response"]["clarification_items"] = [first_item]
-                else:
-                    session_manager.clear_pending_clarifications(session_id)
-                    if result["response"]["clarification_items"]:
-                        first_item = result["response"]["clarification_items"][0]
-                        session_manager.add_pending_clarification(session_id, first_item)
-                        logger.info(f"명확화 항목 추가: {first_item}")
-                        
-                        result["response"]["clarification_items"] = [first_item]
-            else:
-                session_manager.clear_pending_clarifications(session_id)
-            
-            if result["response"]["needs_clarification"] and result["response"]["clarification_items"]:
-                if not result["response"].get("is_casual_conversation", False):
-                    result["response"]["message"] = result["response"]["clarification_items"][0]
-            
-            response_data = {
-                "status": "success",
-                "session_id": session_id,
-                "data": {
-                    "order": result["analysis"],
-                    "message": result["response"]["message"],
-                    "needs_clarification": result["response"]["needs_clarification"],
-                    "clarification_items": result["response"]["clarification_items"],
-                    "is_casual_conversation": result["response"].get("is_casual_conversation", False),
-                    "order_complete": False,
-                    "should_continue_ordering": True,
-                    "asking_for_more_items": False
-                }
-            }
+            response_data = _finalize_order_result(session_id, session, result)
             
             logger.info(f"음성 분석 응답 전송: 세션ID={session_id}")
             return response_data
@@ -260,49 +442,17 @@ async def respond_to_clarification(
     try:
         logger.info(f"음성 명확화 응답 수신: 파일={audio_file.filename}, 세션ID={session_id}")
         
-        session = session_manager.get_session(session_id)
-        if not session:
-            logger.error(f"세션을 찾을 수 없음: {session_id}")
-            raise HTTPException(status_code=404, detail="Session not found")
-        
-        file_contents = await audio_file.read()
-        await audio_file.seek(0) 
-        
-        if len(file_contents) == 0:
-            logger.error("빈 오디오 파일 수신")
-            raise HTTPException(status_code=400, detail="Empty audio file received")
-        
-        logger.info(f"수신된 오디오 파일 크기: {len(file_contents)} bytes")
-        
-        timestamp = int(time.time())
-        unique_filename = f"{session_id}_clarification_{timestamp}.webm"
-        temp_file_path = UPLOAD_DIR / unique_filename
-        
-        with temp_file_path.open("wb") as buffer:
-            shutil.copyfileobj(audio_file.file, buffer)
-        
-        logger.info(f"임시 파일 저장 완료: {temp_file_path}")
+        session = _get_existing_session(session_id)
+        temp_file_path = await _save_audio_upload(audio_file, session_id, "_clarification")
         
-        conversation_history = session.conversation_history
-        pending_clarifications = session.pending_clarifications
-        
-        if not pending_clarifications:
+        if not session.pending_clarifications:
             logger.info("처리할 명확화 항목이 없지만 워크플로우를 계속 실행")
         
-        initial_state: WorkflowState = {
-            "audio_path": str(temp_file_path),
-            "text": "",
-            "analysis": session.current_order,
-            "response": None,
-            "session_id": session_id,
-            "conversation_history": conversation_history,
-            "pending_clarifications": pending_clarifications,
-            "current_order": session.current_order
-        }
+        initial_state = _build_initial_state(session, session_id, temp_file_path, analysis=session.current_order)
         
         logger.info("명확화 응답 처리를 위한 LangGraph 워크플로우 실행 시작")
         try:
-            result = order_analysis_chain.invoke(initial_state)
+            result = await order_analysis_chain.ainvoke(initial_state)
             
             if not result:
                 logger.error("LangGraph 워크플로우가 None 반환")
@@ -310,140 +460,11 @@ async def respond_to_clarification(
                 
             logger.info(f"LangGraph 워크플로우 실행 완료: 인식된 텍스트={result.get('text', '')}")
             
-            try:
-                temp_file_path.unlink()
-                logger.info(f"임시 파일 삭제 완료: {temp_file_path}")
-            except Exception as e:
-                logger.warning(f"임시 파일 삭제 실패: {str(e)}")
-            
-            if not result.get("analysis"):
-                logger.warning("분석 결과 X, 기존 주문 정보 유지")
-                result["analysis"] = session.current_order or {
-                    "items": [],
-                    "total_price": 0,
-                    "special_requests": ""
-                }
-            
-            if result["response"].get("is_casual_conversation", False) and session.current_order:
-                logger.info(f"명확화 중 일상 대화 감지: 기존 주문 정보 유지 (세션 ID: {session_id})")
-                result["analysis"] = session.current_order
-            
-            session_manager.update_session(session_id, result["analysis"])
-            logger.info(f"명확화 응답 후 세션 업데이트 완료 (세션 ID: {session_id})")
-            
-            if result.get("text"):
-                session_manager.add_conversation(session_id, "user", result.get("text"))
-            
-            if not result.get("response"):
-                logger.warning("응답 X, 기본 응답 사용")
-                result["response"] = {
-                    "message": "주문 처리 중 오류가 발생했습니다. 다시 시도해주세요.",
-                    "needs_clarification": False,
-                    "clarification_items": [],
-                    "is_casual_conversation": False,
-                    "order_complete": False,
-                    "should_continue_ordering": True,
-                    "asking_for_more_items": False
-                }
-            
-            system_response = result["response"]["message"]
-            session_manager.add_conversation(session_id, "assistant", system_response)
-            logger.info(f"시스템 응답: {system_response}")
-            
-            if result.get("pending_clarifications_resolved", False):
-                logger.info("규칙 기반 노드에서 명확화 항목이 해결된 것으로 감지")
-                
-                if session.pending_clarifications:
-                    session_manager.resolve_pending_clarification(session_id)
-                    logger.info("명확화 항목 해결 처리 완료")
-            elif not result["response"].get("is_casual_conversation", False):
-                
-                if session.pending_clarifications:
-                    session_manager.resolve_pending_clarification(session_id)
-                    logger.info("사용자 응답에 따라 첫 번째 명확화 항목 제거")
-            else:
-                logger.info("일상 대화로 감지되어 명확화 항목 유지")
-            
-            if result["response"]["needs_clarification"]:
-                if result["response"]["clarification_items"]:
-                    if result["response"].get("is_casual_conversation", False):
-                        logger.info("일상 대화 감지: 기존 명확화 항목 유지")
-                    else:
-                        new_item = result["response"]["clarification_items"][0]
-                        is_duplicate = False
-                        for item in session.pending_clarifications:
-                            if item.lower() == new_item.lower():
-                                is_duplicate = True
-                                break
-                        
-                        if not is_duplicate:
-                            session_manager.add_pending_clarification(session_id, new_item)
-                            logger.info(f"새 명확화 항목 추가: {new_item}")
+            _remove_temp_file(temp_file_path)
             
-            has_pending_clarifications = len(session.pending_clarifications) > 0
-            
-            if has_pending_clarifications:
-                next_item = session.pending_clarifications[0]
-                result["response"]["clarification_items"] = [next_item]
-                if not result["response"].get("is_casual_conversation", False):
-                    result["response"]["message"] = next_item
-                result["response"]["needs_clarification"] = True
-                logger.info(f"다음 명확화 항목 처리: {next_item}")
-            else:
-                if result["response"].get("clarification_items") and not result["response"].get("is_casual_conversation", False):
-                    
-                    new_clarification = result["response"]["clarification_items"][0]
-                    session_manager.add_pending_clarification(session_id, new_clarification)
-                    result["response"]["needs_clarification"] = True
-                    result["response"]["message"] = new_clarification  
-                    logger.info(f"새 명확화 항목 추가됨 (세션에 없었음): {new_clarification}")
-                else:
-                    result["response"]["clarification_items"] = []
-                    if not result["response"].get("is_casual_conversation", False):
-                        
-                        if result["response"].get("asking_for_more_items", False):
-                            result["response"]["message"] = "더 주문하실 것이 있으신가요?"
-                            result["response"]["clarification_items"] = ["더 주문하실 것이 있으신가요?"]
-                            result["response"]["needs_clarification"] = True
-                            
-                            session_manager.add_pending_clarification(session_id, "더 주문하실 것이 있으신가요?")
-                        else:
-                            
-                            result["response"]["message"] = "주문이 완료되었습니다. 감사합니다!"
-                            result["response"]["needs_clarification"] = False
-                    else:
-                        
-                        result["response"]["needs_clarification"] = False
-                    
-                    logger.info("모든 명확화 항목 처리 완료")
-            
-            
-            has_pending_clarifications_after_update = len(session.pending_clarifications) > 0
-            if has_pending_clarifications_after_update:
-                result["response"]["needs_clarification"] = True
-                if len(result["response"]["clarification_items"]) == 0:
-                    result["response"]["clarification_items"] = [session.pending_clarifications[0]]
-                    
-                    if not result["response"].get("is_casual_conversation", False):
-                        result["response"]["message"] = session.pending_clarifications[0]
-                logger.info(f"응답 전 최종 확인: 명확화 항목 있음 ({session.pending_clarifications[0]})")
-            
-            response_data = {
-                "status": "success",
-                "session_id": session_id,
-                "data": {
-                    "order": result["analysis"],
-                    "message": result["response"]["message"],
-                    "needs_clarification": result["response"]["needs_clarification"],
-                    "clarification_items": result["response"]["clarification_items"],
-                    "is_casual_conversation": result["response"].get("is_casual_conversation", False),
-                    "order_complete": result["response"].get("order_complete", False),
-                    "should_continue_ordering": True,
-                    "asking_for_more_items": result["response"].get("asking_for_more_items", False)
-                }
-            }
+            response_data = _finalize_clarification_result(session_id, session, result)
             
-            logger.info(f"명확화 응답 전송: 세션ID={session_id}, 명확화 필요={result['response']['needs_clarification']}, 명확화 항목={result['response']['clarification_items']}")
+            logger.info(f"명확화 응답 전송: 세션ID={session_id}, 명확화 필요={response_data['data']['needs_clarification']}, 명확화 항목={response_data['data']['clarification_items']}")
             return response_data
             
         except Exception as e:
@@ -455,6 +476,128 @@ async def respond_to_clarification(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _format_sse(event: str, data: Dict[str, Any]) -> str:
+    payload = json.dumps(jsonable_encoder(data), ensure_ascii=False)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+def _stream_workflow(initial_state: WorkflowState, finalize, temp_file_path: Path) -> StreamingResponse:
+    async def event_generator():
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        
+        def event_sink(event: str, data: Dict[str, Any]):
+            loop.call_soon_threadsafe(queue.put_nowait, (event, data))
+        
+        initial_state["event_sink"] = event_sink
+        
+        async def run_workflow():
+            try:
+                return await order_analysis_chain.ainvoke(initial_state)
+            finally:
+                queue.put_nowait(None)
+        
+        def complete(result) -> Dict[str, Any]:
+            if not result:
+                logger.error("LangGraph 워크플로우가 None 반환")
+                raise ValueError("워크플로우 실행 결과가 없음")
+            logger.info(f"LangGraph 스트리밍 워크플로우 실행 완료: 인식된 텍스트={result.get('text', '')}")
+            result.pop("event_sink", None)
+            return finalize(result)
+        
+        def complete_detached(task: asyncio.Task):
+            # 클라이언트가 끊긴 뒤 끝난 워크플로우도 세션에 주문을 반영하고 임시 파일을 삭제
+            try:
+                if not task.cancelled():
+                    complete(task.result())
+                    logger.info("스트리밍 연결 종료 후 워크플로우 결과를 세션에 반영")
+            except Exception as e:
+                logger.error(f"스트리밍 연결 종료 후 결과 처리 중 오류: {str(e)}", exc_info=True)
+            finally:
+                _remove_temp_file(temp_file_path)
+        
+        workflow_task = asyncio.create_task(run_workflow())
+        handled = False
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                event, data = item
+                yield _format_sse(event, data)
+            
+            handled = True
+            try:
+                result = await asyncio.shield(workflow_task)
+                yield _format_sse("result", complete(result))
+            except Exception as e:
+                logger.error(f"스트리밍 분석 중 오류: {str(e)}", exc_info=True)
+                yield _format_sse("error", {"status": "error", "detail": str(e)})
+        finally:
+            if handled:
+                _remove_temp_file(temp_file_path)
+            else:
+                # 중간에 연결이 끊기면(GeneratorExit/취소) STT/LLM 스레드는 취소할 수 없으므로 끝까지 실행한 뒤 결과를 반영
+                logger.info("스트리밍 클라이언트 연결 종료: 워크플로우 완료 후 세션 반영")
+                workflow_task.add_done_callback(complete_detached)
+    
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.post("/analyze-order/stream")
+async def analyze_order_stream_endpoint(
+    audio_file: UploadFile = File(...),
+    session_id: str = Header(None)
+):
+    try:
+        logger.info(f"스트리밍 음성 분석 요청 수신: 파일={audio_file.filename}, 세션ID={session_id}")
+        
+        session_id, session = _get_or_create_session(session_id)
+        temp_file_path = await _save_audio_upload(audio_file, session_id)
+        
+        session_manager.add_conversation(session_id, "user", "음성 주문")
+        
+        initial_state = _build_initial_state(session, session_id, temp_file_path)
+        return _stream_workflow(
+            initial_state,
+            lambda result: _finalize_order_result(session_id, session, result),
+            temp_file_path
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"분석 중 예상치 못한 오류: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/respond-clarification/stream")
+async def respond_to_clarification_stream(
+    audio_file: UploadFile = File(...),
+    session_id: str = Header(...)
+):
+    try:
+        logger.info(f"스트리밍 음성 명확화 응답 수신: 파일={audio_file.filename}, 세션ID={session_id}")
+        
+        session = _get_existing_session(session_id)
+        temp_file_path = await _save_audio_upload(audio_file, session_id, "_clarification")
+        
+        initial_state = _build_initial_state(session, session_id, temp_file_path, analysis=session.current_order)
+        return _stream_workflow(
+            initial_state,
+            lambda result: _finalize_clarification_result(session_id, session, result),
+            temp_file_path
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"명확화 응답 처리 중 오류: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.get("/admin/cleanup-sessions")
 async def cleanup_sessions(max_age_minutes: int = 30):
     try:
@@ -486,6 +629,60 @@ async def get_sessions():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/admin/reload-templates")
+async def reload_templates():
+    try:
+        stats = await asyncio.to_thread(VectorStore().reload_templates)
+        return {
+            "status": "success",
+            "data": stats
+        }
+    except Exception as e:
+        logger.error(f"응답 템플릿 재로드 중 오류: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/admin/llm-status")
+async def get_llm_status():
+    try:
+        return {
+            "status": "success",
+            "data": {
+                "circuit_breaker": get_llm_circuit_breaker().get_state(),
+                "backends": get_llm_router().get_stats(),
+                "speculation": get_speculation_manager().get_stats()
+            }
+        }
+    except Exception as e:
+        logger.error(f"LLM 상태 조회 중 오류: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/admin/db-status")
+async def get_db_status():
+    try:
+        return {
+            "status": "success",
+            "data": {
+                "connections": get_connection_manager().get_stats(),
+                "executor": get_async_db().get_stats(),
+                "menu_snapshot": get_menu_snapshot_store().get_stats()
+            }
+        }
+    except Exception as e:
+        logger.error(f"DB 상태 조회 중 오류: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/admin/llm-status/reset")
+async def reset_llm_circuit_breaker():
+    get_llm_circuit_breaker().reset()
+    return {
+        "status": "success",
+        "message": "LLM 회로 차단기를 초기화했습니다."
+    }
+
+
 if __name__ == "__main__":
     import uvicorn
     host = os.getenv("HOST", "0.0.0.0")
@@ -0,0 +1,168 @@
+import os
+import sys
+import time
+import asyncio
+import logging
+import tempfile
+import threading
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import core.db as db
+from core.async_db import AsyncDB
+from core.menu_snapshot import get_menu_snapshot, get_menu_snapshot_store
+from core.models.menu import MenuCategory, MenuItem, MenuOption
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+ITEM_COUNT = 500
+ITEMS_PER_CATEGORY = 50
+DURATION_SECONDS = 5.0
+MENU_REQUESTS_PER_SECOND = 50
+# 메뉴 관리자가 가격을 바꾸는 간격, 바뀔 때마다 다음 /menu 요청이 스냅샷을 다시 만듦
+MENU_UPDATE_INTERVAL = 0.5
+# 기본 executor를 가득 채우는 동시 음성 요청 수와 요청당 STT/LLM 블로킹 시간
+AUDIO_CONCURRENCY = 2 * min(32, (os.cpu_count() or 1) + 4)
+AUDIO_STEP_SECONDS = 0.2
+
+TEMPERATURE = [MenuOption(id=1, name="핫", price_adjustment=0), MenuOption(id=2, name="아이스", price_adjustment=500)]
+SIZE = [MenuOption(id=3, name="레귤러", price_adjustment=0), MenuOption(id=4, name="라지", price_adjustment=1000)]
+
+def populate_synthetic():
+    db.init_db()
+    db.populate_db([
+        MenuCategory(
+            id=c,
+            name=f"카테고리{c}",
+            description=f"설명{c}",
+            items=[
+                MenuItem(
+                    id=i,
+                    category_id=c,
+                    name=f"메뉴{i}",
+                    description=f"메뉴{i} 설명",
+                    base_price=3000 + i % 20 * 100,
+                    required_options={"온도": TEMPERATURE, "크기": SIZE}
+                )
+                for i in range((c - 1) * ITEMS_PER_CATEGORY + 1, c * ITEMS_PER_CATEGORY + 1)
+            ]
+        )
+        for c in range(1, ITEM_COUNT // ITEMS_PER_CATEGORY + 1)
+    ], force=True)
+
+def menu_updater(stop: threading.Event):
+    # 운영 중 메뉴 변경(품절/가격)을 흉내, 별도 연결로 쓰기
+    price = 0
+    while not stop.wait(MENU_UPDATE_INTERVAL):
+        price += 1
+        with db.get_connection_manager().transaction() as conn:
+            conn.execute("UPDATE menu_items SET base_price = 3000 + ? WHERE id = 1", (price,))
+
+def fake_audio_step():
+    # Whisper/LLM 호출처럼 GIL을 놓고 기다리는 블로킹 작업
+    time.sleep(AUDIO_STEP_SECONDS)
+
+async def audio_worker(stop: asyncio.Event):
+    # 그래프 노드처럼 asyncio.to_thread(기본 executor)로 블로킹 단계를 실행
+    while not stop.is_set():
+        await asyncio.to_thread(fake_audio_step)
+
+async def menu_inline():
+    # 변경 전: async 핸들러 안에서 동기 호출, 스냅샷 확인/재생성 동안 이벤트 루프가 멈춤
+    return get_menu_snapshot().categories
+
+async def menu_to_thread():
+    # 기본 executor로 넘기는 방식, 음성 요청이 executor를 채우면 그 뒤에 줄을 섬
+    return (await asyncio.to_thread(get_menu_snapshot)).categories
+
+def make_menu_async_db(async_db: AsyncDB):
+    async def menu_async_db():
+        return (await async_db.get_menu_snapshot()).categories
+    return menu_async_db
+
+async def measure(handler, with_audio: bool):
+    stop = asyncio.Event()
+    audio_tasks = [asyncio.create_task(audio_worker(stop)) for _ in range(AUDIO_CONCURRENCY if with_audio else 0)]
+    await asyncio.sleep(0.1)
+
+    latencies = []
+    # 루프 지연: 같은 시점에 다른 코루틴이 얼마나 늦게 깨어나는지 (인라인 DB 호출의 영향)
+    loop_lags = []
+
+    async def one_request():
+        start = time.perf_counter()
+        await handler()
+        latencies.append(time.perf_counter() - start)
+
+    async def probe_loop():
+        while not stop.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.01)
+            loop_lags.append(time.perf_counter() - start - 0.01)
+
+    probe = asyncio.create_task(probe_loop())
+    requests = []
+    interval = 1.0 / MENU_REQUESTS_PER_SECOND
+    deadline = time.perf_counter() + DURATION_SECONDS
+    next_at = time.perf_counter()
+    while time.perf_counter() < deadline:
+        requests.append(asyncio.create_task(one_request()))
+        next_at += interval
+        await asyncio.sleep(max(0.0, next_at - time.perf_counter()))
+    await asyncio.gather(*requests)
+    stop.set()
+    await asyncio.gather(probe, *audio_tasks)
+
+    latencies = np.array(latencies) * 1000
+    loop_lags = np.array(loop_lags) * 1000
+    return (
+        len(latencies),
+        float(np.percentile(latencies, 50)),
+        float(np.percentile(latencies, 99)),
+        float(np.percentile(loop_lags, 99))
+    )
+
+async def run_all():
+    async_db = AsyncDB(max_workers=int(os.getenv("DB_EXECUTOR_WORKERS", 2)))
+    handlers = [
+        ("inline", menu_inline),
+        ("to_thread", menu_to_thread),
+        ("async_db", make_menu_async_db(async_db))
+    ]
+    logger.info(f"{'handler':>10} {'audio':>6} {'requests':>9} {'p50(ms)':>8} {'p99(ms)':>8} {'loop lag p99':>13}")
+    for with_audio in (False, True):
+        for name, handler in handlers:
+            count, p50, p99, lag = await measure(handler, with_audio)
+            logger.info(f"{name:>10} {str(with_audio):>6} {count:>9} {p50:>8.2f} {p99:>8.2f} {lag:>13.2f}")
+    logger.info(f"DB 스레드 풀: {async_db.get_stats()}")
+    await async_db.shutdown()
+
+def run_benchmark():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db.DB_PATH = Path(tmp_dir) / "menu.db"
+        populate_synthetic()
+        # 요청마다 변경 카운터를 확인하도록 확인 간격 0
+        store = get_menu_snapshot_store()
+        store.check_interval = 0.0
+        store.refresh()
+        logger.info(f"메뉴 {ITEM_COUNT}개, 동시 음성 요청 {AUDIO_CONCURRENCY}개, /menu {MENU_REQUESTS_PER_SECOND}회/초")
+
+        stop = threading.Event()
+        updater = threading.Thread(target=menu_updater, args=(stop,), daemon=True)
+        updater.start()
+        try:
+            asyncio.run(run_all())
+        finally:
+            stop.set()
+            updater.join()
+            db.get_connection_manager().close_all()
+
+if __name__ == "__main__":
+    run_benchmark()
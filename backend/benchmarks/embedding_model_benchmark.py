@@ -0,0 +1,123 @@
+import os
+import sys
+import json
+import time
+import logging
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.langgraph.tools.vector_store import load_embedding_model
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+TEMPLATES_PATH = Path(__file__).resolve().parent.parent / "core" / "langgraph" / "data" / "response_templates.json"
+ONNX_EXPORT_DIR = os.getenv("ONNX_EXPORT_DIR", str(Path(__file__).resolve().parent.parent / "data" / "onnx_embedding"))
+
+# (이름, 모델, 백엔드, 모델 파일) - 첫 번째 후보가 품질 비교 기준
+CANDIDATES = [
+    ("mpnet-torch", "sentence-transformers/paraphrase-multilingual-mpnet-base-v2", "torch", None),
+    ("mpnet-onnx-int8", ONNX_EXPORT_DIR, "onnx", "onnx/model_qint8_avx2.onnx"),
+    ("minilm-torch", "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2", "torch", None),
+    ("minilm-onnx-int8", "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2", "onnx", "onnx/model_qint8_avx2.onnx"),
+]
+
+# 템플릿 변형 문장 외에 실제 키오스크 발화에 가까운 문장
+EXTRA_QUERIES = [
+    ("안녕하세요", "greeting"),
+    ("주문하려고 하는데요", "greeting"),
+    ("수고하세요", "farewell"),
+    ("감사합니다 안녕히 계세요", "farewell"),
+    ("메뉴 좀 보여주세요", "request_menu"),
+    ("뭐 있어요?", "request_menu"),
+    ("다시 말해 주실래요?", "request_repeat"),
+    ("잘 못 들었어요", "request_repeat"),
+    ("이게 다예요", "order_complete"),
+    ("그걸로 주문할게요", "order_complete"),
+]
+LATENCY_QUERIES = 200
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def load_dataset():
+    with open(TEMPLATES_PATH, "r", encoding="utf-8") as f:
+        templates = json.load(f)["templates"]
+    queries = [(variation, template["type"]) for template in templates for variation in template.get("variations", [])]
+    queries.extend(EXTRA_QUERIES)
+    return templates, queries
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype='float32')
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+def evaluate(name, model_name, backend, model_file, templates, queries):
+    rss_before = rss_mb()
+    start = time.perf_counter()
+    model = load_embedding_model(model_name, backend, model_file)
+    load_seconds = time.perf_counter() - start
+    rss_delta = rss_mb() - rss_before
+
+    template_vectors = normalize(model.encode([template["text"] for template in templates]))
+    query_vectors = normalize(model.encode([text for text, _ in queries]))
+    predictions = np.argmax(query_vectors @ template_vectors.T, axis=1)
+    correct = sum(templates[p]["type"] == expected for p, (_, expected) in zip(predictions, queries))
+
+    # 요청 경로와 같이 발화 하나씩 인코딩
+    model.encode([queries[0][0]])
+    timings = []
+    for i in range(LATENCY_QUERIES):
+        text = queries[i % len(queries)][0]
+        start = time.perf_counter()
+        model.encode([text])
+        timings.append(time.perf_counter() - start)
+    timings = np.array(timings) * 1000
+
+    return {
+        "name": name,
+        "dimension": template_vectors.shape[1],
+        "load_seconds": load_seconds,
+        "rss_mb": rss_delta,
+        "accuracy": correct / len(queries),
+        "p50_ms": float(np.percentile(timings, 50)),
+        "p99_ms": float(np.percentile(timings, 99)),
+        "predictions": predictions
+    }
+
+def run_benchmark():
+    templates, queries = load_dataset()
+    logger.info(f"템플릿 {len(templates)}개, 평가 문장 {len(queries)}개")
+    results = []
+    for name, model_name, backend, model_file in CANDIDATES:
+        try:
+            results.append(evaluate(name, model_name, backend, model_file, templates, queries))
+        except Exception as e:
+            logger.warning(f"{name} 건너뜀: {str(e)}")
+
+    if not results:
+        logger.error("평가할 수 있는 모델이 없습니다.")
+        return
+    baseline = results[0]["predictions"]
+    logger.info(
+        f"{'model':>18} {'dim':>5} {'load(s)':>8} {'rss(MB)':>8} {'acc':>6} {'agree':>6} {'p50(ms)':>8} {'p99(ms)':>8}"
+    )
+    for result in results:
+        agreement = float(np.mean(result["predictions"] == baseline))
+        logger.info(
+            f"{result['name']:>18} {result['dimension']:>5} {result['load_seconds']:>8.2f} {result['rss_mb']:>8.0f} "
+            f"{result['accuracy']:>6.3f} {agreement:>6.3f} {result['p50_ms']:>8.2f} {result['p99_ms']:>8.2f}"
+        )
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,136 @@
+import os
+import sys
+import time
+import random
+import logging
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import train_test_split
+from sklearn.svm import SVC
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+sys.path.append(os.path.join(BACKEND_DIR, "ML"))
+
+from intent_classifier_training import TRAINING_DATA, generate_additional_data, preprocess_text
+from core.langgraph.tools.intent_classifier import EmbeddingIntentHead
+from core.langgraph.tools.vector_store import load_embedding_model, embedding_model_id
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+SEED = 42
+# 학습 문장과 표현이 다른 실제 발화, 일반화 정도를 따로 확인
+HELD_OUT = [
+    ("아아 한 잔이요", "주문"),
+    ("콜드브루 라지로 하나 주실래요", "주문"),
+    ("따뜻한 라떼 두 개요", "주문"),
+    ("얼음 빼 주세요", "옵션_선택"),
+    ("사이즈 업 해주세요", "옵션_선택"),
+    ("시럽은 넣지 마세요", "옵션_선택"),
+    ("안녕하세요 주문할게요", "인사"),
+    ("여기 처음인데요", "인사"),
+    ("수고 많으세요 다음에 봬요", "작별"),
+    ("잘 마셨습니다", "작별"),
+    ("여기 몇 시에 닫아요?", "일상_대화"),
+    ("화장실 비밀번호가 뭐예요?", "일상_대화"),
+]
+
+def load_split():
+    random.seed(SEED)
+    all_data = TRAINING_DATA + generate_additional_data()
+    texts = [" ".join(item["text"].split()) for item in all_data]
+    intents = [item["intent"] for item in all_data]
+    return train_test_split(texts, intents, test_size=0.2, random_state=SEED, stratify=intents)
+
+def percentiles(timings):
+    timings = np.array(timings) * 1000
+    return float(np.percentile(timings, 50)), float(np.percentile(timings, 99))
+
+def time_per_utterance(predict, texts):
+    predict(texts[0])
+    timings = []
+    for text in texts:
+        start = time.perf_counter()
+        predict(text)
+        timings.append(time.perf_counter() - start)
+    return percentiles(timings)
+
+def run_tfidf(X_train, X_test, y_train, y_test, held_texts, held_labels):
+    vectorizer = TfidfVectorizer(ngram_range=(1, 2), max_features=5000, min_df=2, max_df=0.8)
+    classifier = SVC(probability=True, C=10, kernel='linear')
+    classifier.fit(vectorizer.fit_transform([preprocess_text(text) for text in X_train]), y_train)
+
+    def predict(text):
+        vector = vectorizer.transform([preprocess_text(text)])
+        probabilities = classifier.predict_proba(vector)[0]
+        return classifier.classes_[probabilities.argmax()]
+
+    return {
+        "name": "tfidf+svc",
+        "test_accuracy": accuracy_score(y_test, [predict(text) for text in X_test]),
+        "held_out_accuracy": accuracy_score(held_labels, [predict(text) for text in held_texts]),
+        "latency": time_per_utterance(predict, X_test)
+    }
+
+def run_embedding(X_train, X_test, y_train, y_test, held_texts, held_labels):
+    model = load_embedding_model()
+
+    def encode(texts):
+        vectors = np.asarray(model.encode(texts), dtype='float32')
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    classifier = LogisticRegression(max_iter=2000, C=10)
+    classifier.fit(encode(X_train), y_train)
+    head = EmbeddingIntentHead(classifier.coef_, classifier.intercept_, list(classifier.classes_), embedding_model_id())
+
+    test_vectors = encode(X_test)
+    held_vectors = encode(held_texts)
+    results = {
+        "name": "embedding+linear",
+        "test_accuracy": accuracy_score(y_test, [head.predict_vector(v)["intent"] for v in test_vectors]),
+        "held_out_accuracy": accuracy_score(held_labels, [head.predict_vector(v)["intent"] for v in held_vectors]),
+        # 임베딩을 새로 계산하는 경우(턴의 첫 사용처)
+        "latency": time_per_utterance(lambda text: head.predict_vector(encode([text])[0]), X_test)
+    }
+
+    # 같은 턴의 템플릿 검색/응답 캐시는 메모된 임베딩을 재사용하므로 분류기 자체 비용은 헤드 연산뿐
+    timings = []
+    for vector in test_vectors:
+        start = time.perf_counter()
+        head.predict_vector(vector)
+        timings.append(time.perf_counter() - start)
+    results["head_latency"] = percentiles(timings)
+    return results
+
+def run_benchmark():
+    X_train, X_test, y_train, y_test = load_split()
+    held_texts = [text for text, _ in HELD_OUT]
+    held_labels = [label for _, label in HELD_OUT]
+    logger.info(f"학습 {len(X_train)}개, 테스트 {len(X_test)}개, 별도 발화 {len(HELD_OUT)}개")
+
+    results = [run_tfidf(X_train, X_test, y_train, y_test, held_texts, held_labels)]
+    try:
+        results.append(run_embedding(X_train, X_test, y_train, y_test, held_texts, held_labels))
+    except Exception as e:
+        logger.warning(f"임베딩 분류기 건너뜀: {str(e)}")
+
+    logger.info(f"{'classifier':>18} {'test acc':>9} {'held acc':>9} {'p50(ms)':>8} {'p99(ms)':>8}")
+    for result in results:
+        p50, p99 = result["latency"]
+        logger.info(
+            f"{result['name']:>18} {result['test_accuracy']:>9.3f} {result['held_out_accuracy']:>9.3f} "
+            f"{p50:>8.3f} {p99:>8.3f}"
+        )
+        if "head_latency" in result:
+            p50, p99 = result["head_latency"]
+            logger.info(f"{'  (shared vector)':>18} {'':>9} {'':>9} {p50:>8.3f} {p99:>8.3f}")
+
+if __name__ == "__main__":
+    run_benchmark()
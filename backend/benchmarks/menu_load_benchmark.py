@@ -0,0 +1,161 @@
+import os
+import sys
+import time
+import sqlite3
+import logging
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import core.db as db
+from core.models.menu import MenuCategory, MenuItem, MenuOption
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+ITEM_COUNTS = [50, 500, 5000]
+ITEMS_PER_CATEGORY = 50
+REPEATS = 5
+
+TEMPERATURE = [MenuOption(id=1, name="핫", price_adjustment=0), MenuOption(id=2, name="아이스", price_adjustment=500)]
+SIZE = [MenuOption(id=3, name="레귤러", price_adjustment=0), MenuOption(id=4, name="라지", price_adjustment=1000)]
+SHOT = [MenuOption(id=5, name="샷 추가", price_adjustment=500)]
+
+def populate_synthetic(item_count: int):
+    db.init_db()
+    category_count = (item_count + ITEMS_PER_CATEGORY - 1) // ITEMS_PER_CATEGORY
+    menu_data = [
+        MenuCategory(
+            id=c,
+            name=f"카테고리{c}",
+            description=f"설명{c}",
+            items=[
+                MenuItem(
+                    id=i,
+                    category_id=c,
+                    name=f"메뉴{i}",
+                    description=f"메뉴{i} 설명",
+                    base_price=3000 + i % 20 * 100,
+                    required_options={"온도": TEMPERATURE, "크기": SIZE},
+                    optional_options={"추가": SHOT}
+                )
+                for i in range((c - 1) * ITEMS_PER_CATEGORY + 1, min(c * ITEMS_PER_CATEGORY, item_count) + 1)
+            ]
+        )
+        for c in range(1, category_count + 1)
+    ]
+    db.populate_db(menu_data, force=True)
+
+def legacy_get_menu_categories():
+    # 변경 전 구현 형태: 호출마다 연결을 열고 카테고리별/메뉴별로 쿼리 (1 + 카테고리 수 + 메뉴 수)
+    conn = sqlite3.connect(db.DB_PATH)
+    conn.row_factory = sqlite3.Row
+    cursor = conn.cursor()
+    categories = []
+    queries = 1
+    cursor.execute("SELECT id, name, description FROM categories")
+    for category_row in cursor.fetchall():
+        items = []
+        cursor.execute(
+            """
+            SELECT id, name, description, base_price, image_url, is_available
+            FROM menu_items
+            WHERE category_id = ?
+            """,
+            (category_row['id'],)
+        )
+        queries += 1
+        for item_row in cursor.fetchall():
+            cursor.execute(
+                """
+                SELECT g.name AS group_name, l.is_required, o.id, o.name, o.price_adjustment
+                FROM menu_item_option_groups l
+                JOIN option_groups g ON g.id = l.group_id
+                JOIN option_group_options go ON go.group_id = g.id
+                JOIN options o ON o.id = go.option_id
+                WHERE l.menu_item_id = ?
+                ORDER BY l.position, go.position
+                """,
+                (item_row['id'],)
+            )
+            queries += 1
+            groups = {"required": {}, "optional": {}}
+            for r in cursor.fetchall():
+                groups["required" if r['is_required'] else "optional"].setdefault(r['group_name'], []).append(
+                    MenuOption(id=r['id'], name=r['name'], price_adjustment=r['price_adjustment'])
+                )
+            items.append(MenuItem(
+                id=item_row['id'],
+                category_id=category_row['id'],
+                name=item_row['name'],
+                description=item_row['description'],
+                base_price=item_row['base_price'],
+                image_url=item_row['image_url'],
+                is_available=bool(item_row['is_available']),
+                required_options=groups["required"],
+                optional_options=groups["optional"]
+            ))
+        categories.append(MenuCategory(
+            id=category_row['id'],
+            name=category_row['name'],
+            description=category_row['description'],
+            items=items
+        ))
+    conn.close()
+    return categories, queries
+
+def summarize(categories):
+    return [
+        (
+            category.id,
+            [
+                (
+                    item.id, item.name, item.base_price, item.is_available,
+                    {name: [(o.id, o.name, o.price_adjustment) for o in options] for name, options in item.required_options.items()},
+                    {name: [(o.id, o.name, o.price_adjustment) for o in options] for name, options in item.optional_options.items()}
+                )
+                for item in category.items
+            ]
+        )
+        for category in categories
+    ]
+
+def measure(load):
+    load()
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        load()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings)) * 1000
+
+def run_benchmark():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db.DB_PATH = Path(tmp_dir) / "menu.db"
+        manager = db.get_connection_manager()
+        logger.info(f"{'items':>6} {'legacy(ms)':>11} {'legacy q':>9} {'bulk(ms)':>9} {'bulk q':>7} {'speedup':>8}")
+        for item_count in ITEM_COUNTS:
+            populate_synthetic(item_count)
+
+            legacy_result, legacy_queries = legacy_get_menu_categories()
+            before = manager.get_stats()["queries"]
+            bulk_result = db.get_menu_categories()
+            bulk_queries = manager.get_stats()["queries"] - before
+            assert summarize(legacy_result) == summarize(bulk_result)
+
+            legacy_ms = measure(legacy_get_menu_categories)
+            bulk_ms = measure(db.get_menu_categories)
+            logger.info(
+                f"{item_count:>6} {legacy_ms:>11.1f} {legacy_queries:>9} {bulk_ms:>9.1f} {bulk_queries:>7} "
+                f"{legacy_ms / bulk_ms:>7.1f}x"
+            )
+        manager.close_all()
+
+if __name__ == "__main__":
+    run_benchmark()
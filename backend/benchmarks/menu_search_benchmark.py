@@ -0,0 +1,89 @@
+import os
+import sys
+import time
+import logging
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import core.db as db
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+ITEM_COUNT = 5000
+REPEATS = 200
+BASES = ["아메리카노", "카페라떼", "바닐라라떼", "콜드브루", "그린티 라떼", "캐모마일", "치즈케이크", "티라미수"]
+FLAVORS = ["", "헤이즐넛 ", "시나몬 ", "흑당 ", "오트 ", "디카페인 ", "제주 ", "말차 ", "딸기 ", "카라멜 "]
+# (검색어, 설명) - 정확한 이름, 3글자 이상 부분 문자열, 2글자 부분 문자열, 별칭, 없는 메뉴
+QUERIES = ["아메리카노", "메리카", "콜드브", "라떼", "아아", "존재하지않는메뉴"]
+
+def populate_synthetic():
+    db.init_db()
+    with db.get_connection_manager().transaction() as conn:
+        conn.execute("DELETE FROM menu_aliases")
+        conn.execute("DELETE FROM option_group_options")
+        conn.execute("DELETE FROM option_groups")
+        conn.execute("DELETE FROM menu_items")
+        conn.execute("DELETE FROM categories")
+        conn.execute("INSERT INTO categories (id, name, description) VALUES (1, '메뉴', '')")
+        conn.executemany(
+            """
+            INSERT INTO menu_items (id, category_id, name, description, base_price)
+            VALUES (?, 1, ?, ?, 4000)
+            """,
+            [
+                (i, f"{FLAVORS[i % len(FLAVORS)]}{BASES[i % len(BASES)]} {i}", f"설명 {i}")
+                for i in range(1, ITEM_COUNT + 1)
+            ]
+        )
+        conn.execute("INSERT INTO menu_aliases (menu_item_id, alias) VALUES (?, '아아')", (len(BASES) * len(FLAVORS),))
+
+def legacy_lookup(query: str):
+    # 변경 전: LIKE '%...%'의 첫 행(순서 보장 없음), 없으면 전체 메뉴를 읽어 파이썬에서 부분 일치
+    row = db.get_connection_manager().fetchone(
+        "SELECT id, name FROM menu_items WHERE name LIKE ?", (f"%{query}%",)
+    )
+    if row:
+        return row['name']
+    rows = db.get_connection_manager().fetchall("SELECT id, name FROM menu_items")
+    matches = [r['name'] for r in rows if query.lower() in r['name'].lower()]
+    return min(matches, key=len) if matches else None
+
+def search_lookup(query: str):
+    results = db.search_menu(query, limit=1, include_description=False)
+    return results[0]["name"] if results else None
+
+def measure(lookup, query: str):
+    lookup(query)
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        lookup(query)
+        timings.append(time.perf_counter() - start)
+    timings = np.array(timings) * 1000
+    return float(np.percentile(timings, 50)), float(np.percentile(timings, 99))
+
+def run_benchmark():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db.DB_PATH = Path(tmp_dir) / "menu.db"
+        populate_synthetic()
+        logger.info(f"메뉴 {ITEM_COUNT}개, FTS 색인 사용: {db._has_search_index()}")
+        logger.info(f"{'query':>14} {'like p50':>9} {'like p99':>9} {'fts p50':>8} {'fts p99':>8}  like -> / search ->")
+        for query in QUERIES:
+            like_p50, like_p99 = measure(legacy_lookup, query)
+            fts_p50, fts_p99 = measure(search_lookup, query)
+            logger.info(
+                f"{query:>14} {like_p50:>9.3f} {like_p99:>9.3f} {fts_p50:>8.3f} {fts_p99:>8.3f}  "
+                f"{legacy_lookup(query)} / {search_lookup(query)}"
+            )
+        db.get_connection_manager().close_all()
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,194 @@
+import os
+import sys
+import json
+import time
+import random
+import logging
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import core.db as db
+from core.models.menu import MenuCategory, MenuItem, MenuOption
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+ITEM_COUNTS = [500, 5000]
+ITEMS_PER_CATEGORY = 50
+REPEATS = 5
+LOOKUPS = 300
+SEED = 42
+
+TEMPERATURE = [MenuOption(id=1, name="핫", price_adjustment=0), MenuOption(id=2, name="아이스", price_adjustment=500)]
+SIZE = [MenuOption(id=3, name="레귤러", price_adjustment=0), MenuOption(id=4, name="라지", price_adjustment=1000)]
+# 메뉴마다 옵션 구성이 조금씩 다르도록 추가 옵션 10종
+EXTRAS = [MenuOption(id=10 + n, name=f"추가{n}", price_adjustment=100 * n) for n in range(10)]
+
+def synthetic_menu(item_count: int):
+    category_count = (item_count + ITEMS_PER_CATEGORY - 1) // ITEMS_PER_CATEGORY
+    return [
+        MenuCategory(
+            id=c,
+            name=f"카테고리{c}",
+            description=f"설명{c}",
+            items=[
+                MenuItem(
+                    id=i,
+                    category_id=c,
+                    name=f"메뉴{i}",
+                    description=f"메뉴{i} 설명",
+                    base_price=3000 + i % 20 * 100,
+                    required_options={"온도": TEMPERATURE, "크기": SIZE},
+                    optional_options={"추가": EXTRAS[:i % len(EXTRAS) + 1]}
+                )
+                for i in range((c - 1) * ITEMS_PER_CATEGORY + 1, min(c * ITEMS_PER_CATEGORY, item_count) + 1)
+            ]
+        )
+        for c in range(1, category_count + 1)
+    ]
+
+def populate_legacy(menu_data):
+    # 변경 전 저장 방식: 메뉴 행의 JSON 열 + 메뉴마다 옵션을 복사한 인덱스 없는 menu_options
+    with db.get_connection_manager().transaction() as conn:
+        conn.execute("DROP TABLE IF EXISTS legacy_menu_items")
+        conn.execute("DROP TABLE IF EXISTS legacy_menu_options")
+        conn.execute("""
+        CREATE TABLE legacy_menu_items (
+            id INTEGER PRIMARY KEY,
+            category_id INTEGER,
+            name TEXT NOT NULL,
+            description TEXT,
+            base_price INTEGER NOT NULL,
+            image_url TEXT,
+            is_available BOOLEAN DEFAULT 1,
+            required_options TEXT DEFAULT '{}',
+            optional_options TEXT DEFAULT '{}'
+        )
+        """)
+        conn.execute("""
+        CREATE TABLE legacy_menu_options (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            menu_item_id INTEGER,
+            name TEXT NOT NULL,
+            price_adjustment INTEGER DEFAULT 0
+        )
+        """)
+        for category in menu_data:
+            for item in category.items:
+                groups = [item.required_options, item.optional_options]
+                conn.execute(
+                    "INSERT INTO legacy_menu_items VALUES (?, ?, ?, ?, ?, ?, 1, ?, ?)",
+                    (item.id, item.category_id, item.name, item.description, item.base_price, item.image_url) + tuple(
+                        json.dumps({
+                            name: [{"id": o.id, "name": o.name, "price_adjustment": o.price_adjustment} for o in options]
+                            for name, options in group.items()
+                        }, ensure_ascii=False)
+                        for group in groups
+                    )
+                )
+                conn.executemany(
+                    "INSERT INTO legacy_menu_options (menu_item_id, name, price_adjustment) VALUES (?, ?, ?)",
+                    [(item.id, o.name, o.price_adjustment) for group in groups for options in group.values() for o in options]
+                )
+
+def parse_legacy(raw):
+    return {
+        name: [MenuOption(id=o['id'], name=o['name'], price_adjustment=o['price_adjustment']) for o in options]
+        for name, options in json.loads(raw).items()
+    }
+
+def legacy_load_all():
+    # 변경 전 get_menu_categories의 옵션 부분: JSON 문자열별로 한 번씩 파싱
+    rows = db.get_connection_manager().fetchall(
+        "SELECT id, required_options, optional_options FROM legacy_menu_items ORDER BY category_id, id"
+    )
+    parsed = {}
+    result = {}
+    for row in rows:
+        for column in ("required_options", "optional_options"):
+            if row[column] not in parsed:
+                parsed[row[column]] = parse_legacy(row[column])
+        result[row['id']] = (parsed[row['required_options']], parsed[row['optional_options']])
+    return result
+
+def relational_load_all():
+    # get_menu_categories가 쓰는 옵션 로더: 조인 한 번을 정렬 순서대로 한 번 훑어 구성
+    return {
+        item_id: (groups["required"], groups["optional"])
+        for item_id, groups in db._load_option_groups().items()
+    }
+
+def legacy_lookup(item_id: int):
+    # 변경 전 get_menu_item: JSON 파싱 + menu_item_id 인덱스가 없는 menu_options 전체 스캔
+    manager = db.get_connection_manager()
+    row = manager.fetchone(
+        "SELECT id, required_options, optional_options FROM legacy_menu_items WHERE id = ?", (item_id,)
+    )
+    options = manager.fetchall(
+        "SELECT id, name, price_adjustment FROM legacy_menu_options WHERE menu_item_id = ?", (item_id,)
+    )
+    return parse_legacy(row['required_options']), parse_legacy(row['optional_options']), options
+
+def summarize(groups):
+    return {name: [(o.id, o.name, o.price_adjustment) for o in options] for name, options in groups.items()}
+
+def median_ms(load):
+    load()
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        load()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings)) * 1000
+
+def lookup_percentiles(lookup, item_ids):
+    lookup(item_ids[0])
+    timings = []
+    for item_id in item_ids:
+        start = time.perf_counter()
+        lookup(item_id)
+        timings.append(time.perf_counter() - start)
+    timings = np.array(timings) * 1000
+    return float(np.percentile(timings, 50)), float(np.percentile(timings, 99))
+
+def run_benchmark():
+    random.seed(SEED)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db.DB_PATH = Path(tmp_dir) / "menu.db"
+        manager = db.get_connection_manager()
+        db.init_db()
+        logger.info(
+            f"{'items':>6} {'load json(ms)':>14} {'load rel(ms)':>13} "
+            f"{'lookup json p50/p99':>20} {'lookup rel p50/p99':>19}"
+        )
+        for item_count in ITEM_COUNTS:
+            menu_data = synthetic_menu(item_count)
+            db.populate_db(menu_data, force=True)
+            populate_legacy(menu_data)
+
+            legacy = legacy_load_all()
+            relational = relational_load_all()
+            assert all(
+                summarize(legacy[item_id][0]) == summarize(relational[item_id][0])
+                and summarize(legacy[item_id][1]) == summarize(relational[item_id][1])
+                for item_id in legacy
+            )
+
+            item_ids = [random.randint(1, item_count) for _ in range(LOOKUPS)]
+            legacy_p50, legacy_p99 = lookup_percentiles(legacy_lookup, item_ids)
+            relational_p50, relational_p99 = lookup_percentiles(db.get_menu_item, item_ids)
+            logger.info(
+                f"{item_count:>6} {median_ms(legacy_load_all):>14.1f} {median_ms(relational_load_all):>13.1f} "
+                f"{legacy_p50:>10.3f}/{legacy_p99:<9.3f} {relational_p50:>9.3f}/{relational_p99:<9.3f}"
+            )
+        manager.close_all()
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,78 @@
+import os
+import sys
+import time
+import random
+import logging
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.models.menu import MENU_DATA
+from core.langgraph.tools.option_index import MenuOptionIndex
+from core.langgraph.tools.pricing import PricingEngine
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+ORDER_SIZES = [10, 100, 1000, 10000]
+REPEAT = 5
+
+def build_order(option_index: MenuOptionIndex, size: int):
+    rng = random.Random(size)
+    entries = list(option_index.entries.values())
+    items = []
+    for _ in range(size):
+        entry = rng.choice(entries)
+        options = []
+        for groups in (entry.required_options, entry.optional_options):
+            for names in groups.values():
+                options.append(rng.choice(list(names)))
+        items.append({"name": entry.name, "quantity": rng.randint(1, 3), "options": options, "price": 0})
+    return {"items": items, "total_price": 0, "special_requests": ""}
+
+def naive_total(option_index: MenuOptionIndex, order) -> int:
+    # 엔진 도입 전처럼 매번 메뉴와 옵션을 처음부터 찾아 합산
+    total = 0
+    for item in order["items"]:
+        entry = option_index.lookup(item["name"])
+        unit = entry.base_price + sum(entry.option_price(option) or 0 for option in item["options"])
+        total += unit * item["quantity"]
+    return total
+
+def timed(func, *args) -> float:
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def run_benchmark():
+    option_index = MenuOptionIndex(MENU_DATA)
+    logger.info(f"{'items':>8} {'naive(ms)':>10} {'cold(ms)':>10} {'warm(ms)':>10} {'1-change(ms)':>13}")
+    for size in ORDER_SIZES:
+        order = build_order(option_index, size)
+
+        naive_ms = timed(naive_total, option_index, order)
+
+        def cold():
+            PricingEngine(lambda: option_index).price_order(order)
+        cold_ms = timed(cold)
+
+        engine = PricingEngine(lambda: option_index)
+        engine.price_order(order)
+        expected = naive_total(option_index, order)
+        assert order["total_price"] == expected, "가격 불일치"
+        warm_ms = timed(engine.price_order, order)
+
+        def change_one():
+            order["items"][size // 2]["quantity"] += 1
+            engine.price_order(order)
+        change_ms = timed(change_one)
+
+        logger.info(f"{size:>8} {naive_ms:>10.3f} {cold_ms:>10.3f} {warm_ms:>10.3f} {change_ms:>13.3f}")
+
+if __name__ == "__main__":
+    run_benchmark()
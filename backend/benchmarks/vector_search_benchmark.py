@@ -0,0 +1,69 @@
+import os
+import sys
+import time
+import logging
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.langgraph.tools.vector_store import NumpyInnerProductIndex, FAISS_AVAILABLE
+
+if FAISS_AVAILABLE:
+    import faiss
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# 현재 템플릿 수(수십 개)부터 템플릿/변형 문장을 크게 늘린 경우까지
+TEMPLATE_COUNTS = [8, 50, 200, 1000, 5000, 20000]
+DIMENSION = 768
+QUERIES = 500
+TOP_K = 3
+
+def normalized_vectors(count: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((count, DIMENSION)).astype('float32')
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+def per_query_latency(index, queries: np.ndarray):
+    # 실제 요청처럼 한 번에 쿼리 하나씩 검색
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        index.search(query.reshape(1, -1), TOP_K)
+        timings.append(time.perf_counter() - start)
+    timings = np.array(timings) * 1e6
+    return float(np.percentile(timings, 50)), float(np.percentile(timings, 99))
+
+def run_benchmark():
+    if not FAISS_AVAILABLE:
+        logger.warning("faiss가 없어 NumPy 백엔드만 측정합니다.")
+    logger.info(f"{'templates':>10} {'numpy p50(us)':>14} {'numpy p99(us)':>14} {'faiss p50(us)':>14} {'faiss p99(us)':>14} {'top-k 일치':>10}")
+    for count in TEMPLATE_COUNTS:
+        vectors = normalized_vectors(count, count)
+        queries = normalized_vectors(QUERIES, count + 1)
+
+        numpy_index = NumpyInnerProductIndex(DIMENSION)
+        numpy_index.add(vectors)
+        numpy_p50, numpy_p99 = per_query_latency(numpy_index, queries)
+
+        faiss_p50 = faiss_p99 = float("nan")
+        agreement = float("nan")
+        if FAISS_AVAILABLE:
+            faiss_index = faiss.IndexFlatIP(DIMENSION)
+            faiss_index.add(vectors)
+            faiss_p50, faiss_p99 = per_query_latency(faiss_index, queries)
+            _, numpy_top = numpy_index.search(queries, TOP_K)
+            _, faiss_top = faiss_index.search(queries, TOP_K)
+            agreement = float(np.mean(numpy_top == faiss_top))
+
+        logger.info(
+            f"{count:>10} {numpy_p50:>14.1f} {numpy_p99:>14.1f} {faiss_p50:>14.1f} {faiss_p99:>14.1f} {agreement:>10.3f}"
+        )
+
+if __name__ == "__main__":
+    run_benchmark()
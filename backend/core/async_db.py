@@ -0,0 +1,129 @@
+from typing import Dict, Any, List, Optional, Callable, TypeVar
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import logging
+import os
+import threading
+import time
+from . import db
+from .menu_snapshot import MenuSnapshot, get_menu_snapshot_store
+
+logger = logging.getLogger("async_db")
+
+T = TypeVar("T")
+
+
+class AsyncDB:
+    # async 핸들러용 DB 접근, SQLite 호출을 전용 스레드 풀에서 실행해 이벤트 루프를 막지 않음
+    # STT/LLM 노드가 쓰는 기본 executor(asyncio.to_thread)와 분리해 음성 처리 중에도 메뉴 조회가 줄 서지 않음
+    # 풀의 각 스레드는 ConnectionManager의 스레드별 연결을 계속 재사용
+    def __init__(self, max_workers: int = 2):
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.stats = {
+            "calls": 0,
+            "inline_calls": 0,
+            "wait_seconds": 0.0,
+            "max_wait_seconds": 0.0,
+            "run_seconds": 0.0
+        }
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="db")
+        return self._executor
+
+    async def run(self, func: Callable[..., T], *args, **kwargs) -> T:
+        submitted = time.perf_counter()
+
+        def call():
+            # 풀에서 실행을 기다린 시간과 실제 실행 시간을 나눠 기록
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                finished = time.perf_counter()
+                with self._lock:
+                    self.stats["calls"] += 1
+                    self.stats["wait_seconds"] += started - submitted
+                    self.stats["max_wait_seconds"] = max(self.stats["max_wait_seconds"], started - submitted)
+                    self.stats["run_seconds"] += finished - started
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), call)
+
+    async def get_menu_snapshot(self) -> MenuSnapshot:
+        # 확인 간격 안의 스냅샷은 스레드 전환 없이 바로 반환, 변경 확인/재생성이 필요할 때만 풀에서 실행
+        store = get_menu_snapshot_store()
+        snapshot = store.fresh()
+        if snapshot is not None:
+            with self._lock:
+                self.stats["inline_calls"] += 1
+            return snapshot
+        return await self.run(store.current)
+
+    async def fetchall(self, sql: str, params=()) -> List[Any]:
+        return await self.run(db.get_connection_manager().fetchall, sql, params)
+
+    async def fetchone(self, sql: str, params=()) -> Optional[Any]:
+        return await self.run(db.get_connection_manager().fetchone, sql, params)
+
+    async def search_menu(self, query: str, limit: int = 5, include_description: bool = True) -> List[db.MenuSearchResult]:
+        return await self.run(db.search_menu, query, limit, include_description)
+
+    async def get_menu_by_name(self, menu_name: str) -> Optional[Dict[str, Any]]:
+        return await self.run(db.get_menu_by_name, menu_name)
+
+    async def get_menu_by_id(self, item_id: int) -> Optional[Dict[str, Any]]:
+        return await self.run(db.get_menu_by_id, item_id)
+
+    async def get_menu_item(self, item_id: int):
+        return await self.run(db.get_menu_item, item_id)
+
+    async def initialize(self) -> MenuSnapshot:
+        # 시작 시 마이그레이션, 시드, 첫 스냅샷을 DB 스레드에서 순서대로 실행
+        def initialize_db():
+            db.init_db()
+            db.populate_db()
+            # 스냅샷 갱신 시 옵션 인덱스 등 의존 캐시에 변경이 통지됨
+            return get_menu_snapshot_store().refresh()
+        return await self.run(initialize_db)
+
+    async def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+
+        def close():
+            # 진행 중인 DB 작업이 끝나길 기다리는 동안 이벤트 루프(다른 종료 처리)를 막지 않도록 별도 스레드에서 대기
+            if executor is not None:
+                executor.shutdown(wait=True)
+                logger.info(f"DB 스레드 풀 종료: {self.get_stats()}")
+            db.get_connection_manager().close_all()
+        await asyncio.to_thread(close)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+        calls = stats["calls"]
+        stats["max_workers"] = self.max_workers
+        stats["avg_wait_ms"] = round(stats["wait_seconds"] / calls * 1000, 4) if calls else 0.0
+        stats["max_wait_ms"] = round(stats.pop("max_wait_seconds") * 1000, 4)
+        stats["wait_seconds"] = round(stats["wait_seconds"], 4)
+        stats["run_seconds"] = round(stats["run_seconds"], 4)
+        return stats
+
+
+_async_db: Optional[AsyncDB] = None
+_async_db_lock = threading.Lock()
+
+
+def get_async_db() -> AsyncDB:
+    global _async_db
+    if _async_db is None:
+        with _async_db_lock:
+            if _async_db is None:
+                _async_db = AsyncDB(max_workers=int(os.getenv("DB_EXECUTOR_WORKERS", 2)))
+    return _async_db
@@ -1,21 +1,173 @@
 import sqlite3
+import hashlib
 import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator, TypedDict
 from .models.menu import MenuCategory, MenuItem, MenuOption, MENU_DATA
 
+logger = logging.getLogger("db")
+
 DB_PATH = Path("data/menu.db")
+# 연결마다 유지하는 prepared statement LRU 크기, SQL 문자열이 같으면 파싱 없이 재사용
+DB_CACHED_STATEMENTS = int(os.getenv("DB_CACHED_STATEMENTS", 128))
+DB_SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", 50))
 
-def init_db():
-    DB_PATH.parent.mkdir(exist_ok=True)
-    
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute("DROP TABLE IF EXISTS menu_options")
-    cursor.execute("DROP TABLE IF EXISTS menu_items")
-    cursor.execute("DROP TABLE IF EXISTS categories")
-    
+# WAL: 읽기와 쓰기가 서로 막지 않음 / synchronous=NORMAL: WAL에서는 커밋마다 fsync하지 않아도 안전
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA foreign_keys=ON",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-8000",
+    "PRAGMA mmap_size=67108864",
+    "PRAGMA busy_timeout=5000"
+)
+
+
+class ConnectionManager:
+    # 스레드별로 연결을 한 번만 열어 재사용, 요청마다 파일을 여는 대신 이미 열린 연결과 캐시된 statement를 씀
+    def __init__(self, db_path, cached_statements: int = 128, slow_query_ms: float = 50):
+        self.db_path = Path(db_path)
+        self.cached_statements = cached_statements
+        self.slow_query_seconds = slow_query_ms / 1000
+        self._local = threading.local()
+        self._connections: Dict[int, sqlite3.Connection] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.stats = {
+            "connections_opened": 0,
+            "connect_seconds": 0.0,
+            "queries": 0,
+            "query_seconds": 0.0,
+            "max_query_seconds": 0.0,
+            "slow_queries": 0
+        }
+
+    def _connect(self) -> sqlite3.Connection:
+        start = time.perf_counter()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # close_all()이 다른 스레드의 연결을 닫을 수 있도록 check_same_thread는 끄고, 사용은 소유 스레드로 한정
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=self.cached_statements)
+        conn.row_factory = sqlite3.Row
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self._connections[threading.get_ident()] = conn
+            self.stats["connections_opened"] += 1
+            self.stats["connect_seconds"] += elapsed
+        logger.debug(f"SQLite 연결 생성 ({elapsed * 1000:.2f}ms, 스레드 {threading.current_thread().name})")
+        return conn
+
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.generation != self._generation:
+            conn = self._connect()
+            self._local.conn = conn
+            self._local.generation = self._generation
+        return conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = self.connection()
+        with conn:
+            yield conn
+
+    def _record(self, sql: str, elapsed: float):
+        with self._lock:
+            self.stats["queries"] += 1
+            self.stats["query_seconds"] += elapsed
+            self.stats["max_query_seconds"] = max(self.stats["max_query_seconds"], elapsed)
+            if elapsed >= self.slow_query_seconds:
+                self.stats["slow_queries"] += 1
+                logger.warning(f"느린 쿼리 ({elapsed * 1000:.1f}ms): {' '.join(sql.split())[:200]}")
+
+    def fetchall(self, sql: str, params=()) -> List[sqlite3.Row]:
+        start = time.perf_counter()
+        rows = self.connection().execute(sql, params).fetchall()
+        self._record(sql, time.perf_counter() - start)
+        return rows
+
+    def fetchone(self, sql: str, params=()) -> Optional[sqlite3.Row]:
+        start = time.perf_counter()
+        row = self.connection().execute(sql, params).fetchone()
+        self._record(sql, time.perf_counter() - start)
+        return row
+
+    def close_all(self):
+        # 다음 접근 때 각 스레드가 새 연결을 열도록 세대 번호를 올림
+        with self._lock:
+            self._generation += 1
+            connections = list(self._connections.values())
+            self._connections.clear()
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                logger.warning(f"SQLite 연결 종료 실패: {str(e)}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            stats["open_connections"] = len(self._connections)
+        queries = stats["queries"]
+        stats["avg_query_ms"] = round(stats["query_seconds"] / queries * 1000, 4) if queries else 0.0
+        stats["max_query_ms"] = round(stats.pop("max_query_seconds") * 1000, 4)
+        stats["query_seconds"] = round(stats["query_seconds"], 4)
+        stats["connect_seconds"] = round(stats["connect_seconds"], 4)
+        stats["path"] = str(self.db_path)
+        return stats
+
+
+_connection_manager: Optional[ConnectionManager] = None
+_connection_manager_lock = threading.Lock()
+
+
+def get_connection_manager() -> ConnectionManager:
+    global _connection_manager
+    if _connection_manager is None:
+        with _connection_manager_lock:
+            if _connection_manager is None:
+                _connection_manager = ConnectionManager(
+                    DB_PATH,
+                    cached_statements=DB_CACHED_STATEMENTS,
+                    slow_query_ms=DB_SLOW_QUERY_MS
+                )
+    return _connection_manager
+
+
+MENU_TABLES = ("categories", "menu_items", "menu_options")
+
+def _create_change_tracking(cursor, tables=MENU_TABLES):
+    # 메뉴 테이블이 바뀔 때마다 증가하는 카운터, 메모리 스냅샷이 쿼리 한 번으로 변경 여부를 확인
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS menu_meta (
+        key TEXT PRIMARY KEY,
+        value INTEGER NOT NULL
+    )
+    """)
+    cursor.execute("INSERT OR IGNORE INTO menu_meta (key, value) VALUES ('data_version', 0)")
+    for table in tables:
+        for operation in ("INSERT", "UPDATE", "DELETE"):
+            cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_{operation.lower()}_version
+            AFTER {operation} ON {table}
+            BEGIN
+                UPDATE menu_meta SET value = value + 1 WHERE key = 'data_version';
+            END
+            """)
+
+def get_menu_data_version() -> int:
+    row = get_connection_manager().fetchone("SELECT value FROM menu_meta WHERE key = 'data_version'")
+    return row['value'] if row else 0
+
+def _migration_base_schema(cursor):
+    # 이전 init_db로 만든 DB에도 그대로 적용되도록 모두 IF NOT EXISTS
     cursor.execute("""
     CREATE TABLE IF NOT EXISTS categories (
         id INTEGER PRIMARY KEY,
@@ -39,6 +191,9 @@ def init_db():
     )
     """)
     
+    # 전체 메뉴를 카테고리 순으로 한 번에 읽을 때 정렬 없이 인덱스 순서로 스캔
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_menu_items_category ON menu_items (category_id, id)")
+    
     cursor.execute("""
     CREATE TABLE IF NOT EXISTS menu_options (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -49,235 +204,487 @@ def init_db():
     )
     """)
     
-    conn.commit()
-    conn.close()
-
-def populate_db():
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    _create_change_tracking(cursor)
     
-    cursor.execute("DELETE FROM menu_options")
-    cursor.execute("DELETE FROM menu_items")
-    cursor.execute("DELETE FROM categories")
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS seed_state (
+        name TEXT PRIMARY KEY,
+        content_hash TEXT NOT NULL,
+        seeded_at TEXT NOT NULL
+    )
+    """)
+
+# 검색 색인의 aliases 열: 별칭들과 공백을 뺀 메뉴 이름을 줄바꿈으로 구분
+SEARCH_ALIASES_SQL = """
+    coalesce((SELECT group_concat(alias, char(10)) FROM menu_aliases WHERE menu_item_id = {item_id}), '')
+    || char(10) || replace({name}, ' ', '')
+"""
+
+def _migration_menu_search(cursor):
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS menu_aliases (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        menu_item_id INTEGER NOT NULL,
+        alias TEXT NOT NULL,
+        UNIQUE (menu_item_id, alias),
+        FOREIGN KEY (menu_item_id) REFERENCES menu_items (id)
+    )
+    """)
+    _create_change_tracking(cursor, ("menu_aliases",))
     
     try:
-        cursor.execute("DELETE FROM sqlite_sequence WHERE name='menu_options'")
-    except sqlite3.OperationalError:
-        pass
+        # trigram 토크나이저는 SQLite 3.34 이상의 FTS5가 필요, 없으면 search_menu가 LIKE 검색으로 대체
+        cursor.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS menu_search
+        USING fts5(name, aliases, description, tokenize = 'trigram')
+        """)
+    except sqlite3.OperationalError as e:
+        logger.warning(f"FTS5 trigram 색인을 만들 수 없어 LIKE 검색을 사용합니다: {str(e)}")
+        return
+    
+    new_aliases = SEARCH_ALIASES_SQL.format(item_id="new.id", name="new.name")
+    cursor.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS menu_items_search_insert AFTER INSERT ON menu_items
+    BEGIN
+        INSERT INTO menu_search (rowid, name, aliases, description)
+        VALUES (new.id, new.name, {new_aliases}, new.description);
+    END
+    """)
+    cursor.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS menu_items_search_update AFTER UPDATE OF id, name, description ON menu_items
+    BEGIN
+        DELETE FROM menu_search WHERE rowid = old.id;
+        INSERT INTO menu_search (rowid, name, aliases, description)
+        VALUES (new.id, new.name, {new_aliases}, new.description);
+    END
+    """)
+    cursor.execute("""
+    CREATE TRIGGER IF NOT EXISTS menu_items_search_delete AFTER DELETE ON menu_items
+    BEGIN
+        DELETE FROM menu_search WHERE rowid = old.id;
+    END
+    """)
+    for operation, row in (("INSERT", "new"), ("DELETE", "old")):
+        aliases = SEARCH_ALIASES_SQL.format(item_id=f"{row}.menu_item_id", name="menu_items.name")
+        cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS menu_aliases_search_{operation.lower()} AFTER {operation} ON menu_aliases
+        BEGIN
+            UPDATE menu_search
+            SET aliases = (SELECT {aliases} FROM menu_items WHERE menu_items.id = {row}.menu_item_id)
+            WHERE rowid = {row}.menu_item_id;
+        END
+        """)
+    
+    aliases = SEARCH_ALIASES_SQL.format(item_id="menu_items.id", name="menu_items.name")
+    cursor.execute(f"""
+    INSERT INTO menu_search (rowid, name, aliases, description)
+    SELECT id, name, {aliases}, description FROM menu_items
+    """)
+
+def _option_rows(item_options) -> Dict[str, List[tuple]]:
+    # item_options: (메뉴 id, 필수 옵션 그룹, 선택 옵션 그룹), 그룹은 {그룹명: [(옵션 id, 이름, 가격 조정)]}
+    options: Dict[int, tuple] = {}
+    group_ids: Dict[tuple, int] = {}
+    groups, group_options, item_groups = [], [], []
+    for item_id, required_groups, optional_groups in item_options:
+        position = 0
+        for is_required, option_groups in ((1, required_groups), (0, optional_groups)):
+            for group_name, group in (option_groups or {}).items():
+                for option_id, name, price_adjustment in group:
+                    # 같은 옵션(예: 핫/아이스)은 여러 메뉴가 id로 공유, 정의가 다르면 처음 것을 유지
+                    if option_id in options and options[option_id] != (option_id, name, price_adjustment):
+                        logger.warning(f"옵션 id {option_id}의 정의가 메뉴마다 다릅니다: {options[option_id]} / {name}")
+                    options.setdefault(option_id, (option_id, name, price_adjustment))
+                
+                # 이름과 옵션 구성이 같은 그룹(예: 온도 = 핫/아이스)은 메뉴 사이에서 한 행을 공유
+                option_ids = tuple(dict.fromkeys(option[0] for option in group))
+                group_id = group_ids.get((group_name, option_ids))
+                if group_id is None:
+                    group_id = group_ids[(group_name, option_ids)] = len(group_ids) + 1
+                    groups.append((group_id, group_name))
+                    group_options.extend(
+                        (group_id, option_id, option_position) for option_position, option_id in enumerate(option_ids)
+                    )
+                item_groups.append((item_id, group_id, is_required, position))
+                position += 1
+    return {
+        "options": sorted(options.values()),
+        "option_groups": groups,
+        "option_group_options": group_options,
+        "menu_item_option_groups": item_groups
+    }
+
+def _write_option_rows(cursor, rows: Dict[str, List[tuple]]):
+    cursor.executemany(
+        """
+        INSERT INTO options (id, name, price_adjustment) VALUES (?, ?, ?)
+        ON CONFLICT (id) DO UPDATE SET name = excluded.name, price_adjustment = excluded.price_adjustment
+        WHERE name IS NOT excluded.name OR price_adjustment IS NOT excluded.price_adjustment
+        """,
+        rows["options"]
+    )
+    # 그룹 id는 시드할 때마다 새로 매기는 내부 키이므로 그룹과 연결은 통째로 다시 씀
+    cursor.execute("DELETE FROM menu_item_option_groups")
+    cursor.execute("DELETE FROM option_group_options")
+    cursor.execute("DELETE FROM option_groups")
+    cursor.executemany("INSERT INTO option_groups (id, name) VALUES (?, ?)", rows["option_groups"])
+    cursor.executemany(
+        "INSERT INTO option_group_options (group_id, option_id, position) VALUES (?, ?, ?)",
+        rows["option_group_options"]
+    )
+    cursor.executemany(
+        "INSERT INTO menu_item_option_groups (menu_item_id, group_id, is_required, position) VALUES (?, ?, ?, ?)",
+        rows["menu_item_option_groups"]
+    )
+    option_ids = [row[0] for row in rows["options"]]
+    cursor.execute(
+        f"DELETE FROM options WHERE id NOT IN ({','.join('?' * len(option_ids))})",
+        option_ids
+    )
+
+def _json_option_groups(raw: Optional[str]) -> Dict[str, List[tuple]]:
+    try:
+        return {
+            group_name: [(opt['id'], opt['name'], opt.get('price_adjustment', 0)) for opt in options]
+            for group_name, options in json.loads(raw or "{}").items()
+        }
+    except (json.JSONDecodeError, KeyError, TypeError, AttributeError) as e:
+        logger.warning(f"옵션 JSON을 옮기지 못했습니다: {str(e)}")
+        return {}
+
+def _migration_option_tables(cursor):
+    # 메뉴별 JSON 옵션과 중복된 menu_options 행 대신
+    # 옵션 목록 + 옵션 그룹(이름과 옵션 구성) + 메뉴별 그룹 연결(필수 여부, 순서)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS options (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        price_adjustment INTEGER NOT NULL DEFAULT 0
+    )
+    """)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS option_groups (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL
+    )
+    """)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS option_group_options (
+        group_id INTEGER NOT NULL,
+        option_id INTEGER NOT NULL,
+        position INTEGER NOT NULL,
+        PRIMARY KEY (group_id, position),
+        UNIQUE (group_id, option_id),
+        FOREIGN KEY (group_id) REFERENCES option_groups (id) ON DELETE CASCADE,
+        FOREIGN KEY (option_id) REFERENCES options (id)
+    ) WITHOUT ROWID
+    """)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS menu_item_option_groups (
+        menu_item_id INTEGER NOT NULL,
+        group_id INTEGER NOT NULL,
+        is_required BOOLEAN NOT NULL,
+        position INTEGER NOT NULL,
+        PRIMARY KEY (menu_item_id, position),
+        FOREIGN KEY (menu_item_id) REFERENCES menu_items (id) ON DELETE CASCADE,
+        FOREIGN KEY (group_id) REFERENCES option_groups (id)
+    ) WITHOUT ROWID
+    """)
+    # 기본 키가 메뉴/그룹별 순서대로 정렬된 범위 스캔을 맡고, 아래 인덱스는 옵션/그룹 삭제 시 FK 확인용
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_option_group_options_option ON option_group_options (option_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_menu_item_option_groups_group ON menu_item_option_groups (group_id)")
+    _create_change_tracking(cursor, ("options", "option_groups", "option_group_options", "menu_item_option_groups"))
+    
+    columns = {row[1] for row in cursor.execute("PRAGMA table_info(menu_items)").fetchall()}
+    if {"required_options", "optional_options"} <= columns:
+        item_rows = cursor.execute("SELECT id, required_options, optional_options FROM menu_items").fetchall()
+        _write_option_rows(cursor, _option_rows(
+            (row[0], _json_option_groups(row[1]), _json_option_groups(row[2])) for row in item_rows
+        ))
+        for column in ("required_options", "optional_options"):
+            try:
+                # DROP COLUMN은 SQLite 3.35 이상, 그보다 오래된 경우 열은 남지만 더 이상 읽거나 쓰지 않음
+                cursor.execute(f"ALTER TABLE menu_items DROP COLUMN {column}")
+            except sqlite3.OperationalError as e:
+                logger.warning(f"menu_items.{column} 열을 삭제하지 못했습니다: {str(e)}")
+    cursor.execute("DROP TABLE IF EXISTS menu_options")
+
+# (버전, 설명, 적용 함수) - 새 스키마 변경은 버전을 올려 끝에 추가하고 기존 항목은 고치지 않음
+MIGRATIONS = [
+    (1, "기본 메뉴 스키마, 변경 카운터, 시드 상태", _migration_base_schema),
+    (2, "메뉴 별칭, FTS5 trigram 검색 색인", _migration_menu_search),
+    (3, "옵션 그룹/옵션 정규화 테이블", _migration_option_tables),
+]
+
+def get_schema_version() -> int:
+    db = get_connection_manager()
+    if not db.fetchone("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'schema_migrations'"):
+        return 0
+    row = db.fetchone("SELECT MAX(version) AS version FROM schema_migrations")
+    return row['version'] or 0
+
+def migrate_db() -> int:
+    conn = get_connection_manager().connection()
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version INTEGER PRIMARY KEY,
+        description TEXT NOT NULL,
+        applied_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+    """)
     
-    for category in MENU_DATA:
+    current_version = get_schema_version()
+    for version, description, apply in MIGRATIONS:
+        if version <= current_version:
+            continue
+        # DDL도 한 트랜잭션으로 묶어 중간에 실패하면 이전 버전 상태로 남김
+        # IMMEDIATE로 쓰기 잠금을 먼저 잡아 여러 워커가 동시에 시작해도 한 번만 적용
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("SELECT 1 FROM schema_migrations WHERE version = ?", (version,)).fetchone():
+                conn.rollback()
+                continue
+            apply(conn.cursor())
+            conn.execute(
+                "INSERT INTO schema_migrations (version, description) VALUES (?, ?)",
+                (version, description)
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            logger.error(f"DB 마이그레이션 {version} 실패: {description}")
+            raise
+        logger.info(f"DB 마이그레이션 {version} 적용: {description}")
+        current_version = version
+    
+    global _search_index_available
+    _search_index_available = None
+    return current_version
+
+def init_db():
+    DB_PATH.parent.mkdir(exist_ok=True)
+    version = migrate_db()
+    logger.info(f"DB 스키마 버전: {version}")
+
+def _seed_option_groups(option_groups) -> Dict[str, List[tuple]]:
+    return {
+        group_name: [(opt.id, opt.name, opt.price_adjustment) for opt in options]
+        for group_name, options in (option_groups or {}).items()
+    }
+
+def _seed_rows(menu_data) -> Dict[str, List[tuple]]:
+    categories, items, item_options, aliases = [], [], [], []
+    for category in menu_data:
+        categories.append((category.id, category.name, category.description))
+        for item in category.items:
+            items.append((
+                item.id, item.category_id, item.name, item.description,
+                item.base_price, item.image_url, item.is_available
+            ))
+            item_options.append((
+                item.id,
+                _seed_option_groups(getattr(item, 'required_options', None)),
+                _seed_option_groups(getattr(item, 'optional_options', None))
+            ))
+            aliases.extend((item.id, alias) for alias in dict.fromkeys(getattr(item, 'aliases', None) or []))
+    rows = {"categories": categories, "items": items, "aliases": aliases}
+    rows.update(_option_rows(item_options))
+    return rows
+
+def populate_db(menu_data=None, force: bool = False) -> bool:
+    rows = _seed_rows(MENU_DATA if menu_data is None else menu_data)
+    content_hash = hashlib.sha256(
+        json.dumps(rows, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+    
+    db = get_connection_manager()
+    seeded = db.fetchone("SELECT content_hash FROM seed_state WHERE name = 'menu'")
+    if not force and seeded and seeded['content_hash'] == content_hash:
+        logger.info("메뉴 시드 데이터 변경 없음, 시드 생략")
+        return False
+    
+    start = time.perf_counter()
+    with db.transaction() as conn:
+        cursor = conn.cursor()
+        cursor.executemany(
+            """
+            INSERT INTO categories (id, name, description) VALUES (?, ?, ?)
+            ON CONFLICT (id) DO UPDATE SET name = excluded.name, description = excluded.description
+            WHERE name IS NOT excluded.name OR description IS NOT excluded.description
+            """,
+            rows["categories"]
+        )
+        # is_available은 새 메뉴에만 시드 값을 쓰고, 기존 메뉴는 운영 중 바꾼 값을 유지
+        cursor.executemany(
+            """
+            INSERT INTO menu_items 
+            (id, category_id, name, description, base_price, image_url, is_available)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (id) DO UPDATE SET
+                category_id = excluded.category_id,
+                name = excluded.name,
+                description = excluded.description,
+                base_price = excluded.base_price,
+                image_url = excluded.image_url
+            WHERE category_id IS NOT excluded.category_id
+               OR name IS NOT excluded.name
+               OR description IS NOT excluded.description
+               OR base_price IS NOT excluded.base_price
+               OR image_url IS NOT excluded.image_url
+            """,
+            rows["items"]
+        )
+        
+        # 옵션 그룹/별칭 행에는 안정적인 키가 없으므로 시드가 바뀐 경우에만 통째로 다시 씀
+        _write_option_rows(cursor, rows)
+        cursor.execute("DELETE FROM menu_aliases")
+        cursor.executemany(
+            "INSERT INTO menu_aliases (menu_item_id, alias) VALUES (?, ?)",
+            rows["aliases"]
+        )
+        
+        item_ids = [row[0] for row in rows["items"]]
+        category_ids = [row[0] for row in rows["categories"]]
         cursor.execute(
-            "INSERT INTO categories (id, name, description) VALUES (?, ?, ?)",
-            (category.id, category.name, category.description)
+            f"DELETE FROM menu_items WHERE id NOT IN ({','.join('?' * len(item_ids))})",
+            item_ids
+        )
+        cursor.execute(
+            f"DELETE FROM categories WHERE id NOT IN ({','.join('?' * len(category_ids))})",
+            category_ids
         )
         
-        for item in category.items:
-            required_options_json = "{}"
-            optional_options_json = "{}"
-            
-            if hasattr(item, 'required_options') and item.required_options:
-                required_options_dict = {}
-                for key, options in item.required_options.items():
-                    required_options_dict[key] = [{"id": opt.id, "name": opt.name, "price_adjustment": opt.price_adjustment} for opt in options]
-                required_options_json = json.dumps(required_options_dict, ensure_ascii=False)
-            
-            if hasattr(item, 'optional_options') and item.optional_options:
-                optional_options_dict = {}
-                for key, options in item.optional_options.items():
-                    optional_options_dict[key] = [{"id": opt.id, "name": opt.name, "price_adjustment": opt.price_adjustment} for opt in options]
-                optional_options_json = json.dumps(optional_options_dict, ensure_ascii=False)
-            
-            cursor.execute(
-                """
-                INSERT INTO menu_items 
-                (id, category_id, name, description, base_price, image_url, is_available, required_options, optional_options)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (item.id, item.category_id, item.name, item.description,
-                 item.base_price, item.image_url, item.is_available, 
-                 required_options_json, optional_options_json)
-            )
-            
-            all_options = []
-            
-            if hasattr(item, 'required_options'):
-                for options_list in item.required_options.values():
-                    all_options.extend(options_list)
-            
-            if hasattr(item, 'optional_options'):
-                for options_list in item.optional_options.values():
-                    all_options.extend(options_list)
-            
-            if hasattr(item, 'options') and item.options:
-                all_options.extend(item.options)
-            
-            for option in all_options:
-                cursor.execute(
-                    """
-                    INSERT INTO menu_options 
-                    (menu_item_id, name, price_adjustment)
-                    VALUES (?, ?, ?)
-                    """,
-                    (item.id, option.name, option.price_adjustment)
-                )
+        cursor.execute(
+            """
+            INSERT INTO seed_state (name, content_hash, seeded_at) VALUES ('menu', ?, CURRENT_TIMESTAMP)
+            ON CONFLICT (name) DO UPDATE SET content_hash = excluded.content_hash, seeded_at = excluded.seeded_at
+            """,
+            (content_hash,)
+        )
+    logger.info(
+        f"메뉴 시드 완료: 카테고리 {len(rows['categories'])}개, 메뉴 {len(rows['items'])}개, "
+        f"옵션 {len(rows['options'])}개(그룹 {len(rows['option_groups'])}개), 별칭 {len(rows['aliases'])}개 ({(time.perf_counter() - start) * 1000:.1f}ms)"
+    )
+    return True
+
+OptionGroups = Dict[str, List[MenuOption]]
+
+def _load_option_groups(item_id: Optional[int] = None) -> Dict[int, Dict[str, OptionGroups]]:
+    # 메뉴별 {"required": {그룹명: [MenuOption]}, "optional": {...}}
+    # 그룹 정의는 메뉴 수와 관계없이 몇 개뿐이라 먼저 읽어 그룹마다 옵션 리스트를 한 번만 만들고,
+    # 메뉴-그룹 연결은 기본 키 순서대로 한 번 훑어 붙임
+    db = get_connection_manager()
+    item_filter = "WHERE menu_item_id = ?" if item_id is not None else ""
+    group_filter = f"WHERE g.id IN (SELECT group_id FROM menu_item_option_groups {item_filter})" if item_filter else ""
+    params = (item_id,) if item_id is not None else ()
+    group_rows = db.fetchall(
+        f"""
+        SELECT g.id AS group_id, g.name AS group_name,
+               o.id AS option_id, o.name AS option_name, o.price_adjustment
+        FROM option_groups g
+        LEFT JOIN option_group_options go ON go.group_id = g.id
+        LEFT JOIN options o ON o.id = go.option_id
+        {group_filter}
+        ORDER BY g.id, go.position
+        """,
+        params
+    )
+    link_rows = db.fetchall(
+        f"""
+        SELECT menu_item_id, group_id, is_required
+        FROM menu_item_option_groups
+        {item_filter}
+        ORDER BY menu_item_id, position
+        """,
+        params
+    )
     
-    conn.commit()
-    conn.close()
+    groups: Dict[int, tuple] = {}
+    for row in group_rows:
+        group_name, options = groups.setdefault(row['group_id'], (row['group_name'], []))
+        if row['option_id'] is not None:
+            options.append(MenuOption(id=row['option_id'], name=row['option_name'], price_adjustment=row['price_adjustment']))
+    
+    groups_by_item: Dict[int, Dict[str, OptionGroups]] = {}
+    for row in link_rows:
+        item_groups = groups_by_item.setdefault(row['menu_item_id'], {"required": {}, "optional": {}})
+        group_name, options = groups[row['group_id']]
+        item_groups["required" if row['is_required'] else "optional"][group_name] = options
+    return groups_by_item
+
+def _option_dicts(option_groups: OptionGroups) -> Dict[str, List[Dict[str, Any]]]:
+    return {
+        group_name: [{"id": opt.id, "name": opt.name, "price_adjustment": opt.price_adjustment} for opt in options]
+        for group_name, options in option_groups.items()
+    }
+
+def flatten_options(*option_groups: OptionGroups) -> List[MenuOption]:
+    # 필수 -> 선택 그룹 순서로 메뉴가 가진 옵션을 중복 없이 나열
+    options: Dict[int, MenuOption] = {}
+    for groups in option_groups:
+        for group in (groups or {}).values():
+            for option in group:
+                options.setdefault(option.id, option)
+    return list(options.values())
+
+EMPTY_OPTION_GROUPS: Dict[str, OptionGroups] = {"required": {}, "optional": {}}
 
 def get_menu_categories() -> List[MenuCategory]:
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row  # dict 형태
-    cursor = conn.cursor()
+    db = get_connection_manager()
     
-    categories = []
+    # 카테고리/메뉴/옵션 그룹/메뉴-그룹 연결을 각각 한 번에 읽어 메모리에서 묶음, 메뉴 수와 관계없이 쿼리 4번
+    category_rows = db.fetchall("SELECT id, name, description FROM categories ORDER BY id")
+    item_rows = db.fetchall(
+        """
+        SELECT id, category_id, name, description, base_price, image_url, is_available,
+               (SELECT group_concat(alias, char(10)) FROM menu_aliases WHERE menu_item_id = menu_items.id) AS aliases
+        FROM menu_items
+        ORDER BY category_id, id
+        """
+    )
+    groups_by_item = _load_option_groups()
+    
+    items_by_category: Dict[int, List[MenuItem]] = {}
+    for item_row in item_rows:
+        groups = groups_by_item.get(item_row['id'], EMPTY_OPTION_GROUPS)
+        items_by_category.setdefault(item_row['category_id'], []).append(MenuItem(
+            id=item_row['id'],
+            category_id=item_row['category_id'],
+            name=item_row['name'],
+            description=item_row['description'],
+            base_price=item_row['base_price'],
+            image_url=item_row['image_url'],
+            is_available=bool(item_row['is_available']),
+            required_options=groups["required"],
+            optional_options=groups["optional"],
+            aliases=item_row['aliases'].split("\n") if item_row['aliases'] else []
+        ))
     
-    cursor.execute("SELECT id, name, description FROM categories")
-    for category_row in cursor.fetchall():
-        cat_id = category_row['id']
-        items = []
-        
-        cursor.execute(
-            """
-            SELECT id, name, description, base_price, image_url, is_available, 
-                   required_options, optional_options
-            FROM menu_items
-            WHERE category_id = ?
-            """,
-            (cat_id,)
-        )
-        
-        for item_row in cursor.fetchall():
-            item_id = item_row['id']
-            
-            required_options = {}
-            optional_options = {}
-            
-            if item_row['required_options']:
-                try:
-                    required_options_data = json.loads(item_row['required_options'])
-                    for category_name, options_data in required_options_data.items():
-                        required_options[category_name] = [
-                            MenuOption(id=opt['id'], name=opt['name'], price_adjustment=opt['price_adjustment'])
-                            for opt in options_data
-                        ]
-                except (json.JSONDecodeError, KeyError) as e:
-                    print(f"Error parsing required options: {e}")
-            
-            if item_row['optional_options']:
-                try:
-                    optional_options_data = json.loads(item_row['optional_options'])
-                    for category_name, options_data in optional_options_data.items():
-                        optional_options[category_name] = [
-                            MenuOption(id=opt['id'], name=opt['name'], price_adjustment=opt['price_adjustment'])
-                            for opt in options_data
-                        ]
-                except (json.JSONDecodeError, KeyError) as e:
-                    print(f"Error parsing optional options: {e}")
-            
-            options = []
-            cursor.execute(
-                """
-                SELECT id, name, price_adjustment
-                FROM menu_options
-                WHERE menu_item_id = ?
-                """,
-                (item_id,)
-            )
-            for opt_row in cursor.fetchall():
-                options.append(MenuOption(
-                    id=opt_row['id'],
-                    name=opt_row['name'],
-                    price_adjustment=opt_row['price_adjustment']
-                ))
-            
-            menu_item = MenuItem(
-                id=item_row['id'],
-                category_id=cat_id,
-                name=item_row['name'],
-                description=item_row['description'],
-                base_price=item_row['base_price'],
-                image_url=item_row['image_url'],
-                is_available=bool(item_row['is_available']),
-                options=options
-            )
-            
-            menu_item.required_options = required_options
-            menu_item.optional_options = optional_options
-            
-            items.append(menu_item)
-        
-        categories.append(MenuCategory(
-            id=cat_id,
+    return [
+        MenuCategory(
+            id=category_row['id'],
             name=category_row['name'],
             description=category_row['description'],
-            items=items
-        ))
-    
-    conn.close()
-    return categories
+            items=items_by_category.get(category_row['id'], [])
+        )
+        for category_row in category_rows
+    ]
 
 def get_menu_item(item_id: int) -> Optional[MenuItem]:
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    
-    cursor.execute(
+    db = get_connection_manager()
+    item_row = db.fetchone(
         """
-        SELECT id, category_id, name, description, base_price, image_url, is_available,
-               required_options, optional_options
+        SELECT id, category_id, name, description, base_price, image_url, is_available
         FROM menu_items
         WHERE id = ?
         """,
         (item_id,)
     )
-    
-    item_row = cursor.fetchone()
     if not item_row:
-        conn.close()
         return None
     
-    required_options = {}
-    optional_options = {}
-    
-    if item_row['required_options']:
-        try:
-            required_options_data = json.loads(item_row['required_options'])
-            for category_name, options_data in required_options_data.items():
-                required_options[category_name] = [
-                    MenuOption(id=opt['id'], name=opt['name'], price_adjustment=opt['price_adjustment'])
-                    for opt in options_data
-                ]
-        except (json.JSONDecodeError, KeyError) as e:
-            print(f"Error parsing required options: {e}")
-    
-    if item_row['optional_options']:
-        try:
-            optional_options_data = json.loads(item_row['optional_options'])
-            for category_name, options_data in optional_options_data.items():
-                optional_options[category_name] = [
-                    MenuOption(id=opt['id'], name=opt['name'], price_adjustment=opt['price_adjustment'])
-                    for opt in options_data
-                ]
-        except (json.JSONDecodeError, KeyError) as e:
-            print(f"Error parsing optional options: {e}")
-    
-    cursor.execute(
-        """
-        SELECT id, name, price_adjustment
-        FROM menu_options
-        WHERE menu_item_id = ?
-        """,
-        (item_id,)
-    )
-    
-    options = [
-        MenuOption(id=opt_row['id'], name=opt_row['name'], price_adjustment=opt_row['price_adjustment'])
-        for opt_row in cursor.fetchall()
-    ]
-    
-    conn.close()
-    
-    menu_item = MenuItem(
+    groups = _load_option_groups(item_id).get(item_id, EMPTY_OPTION_GROUPS)
+    return MenuItem(
         id=item_row['id'],
         category_id=item_row['category_id'],
         name=item_row['name'],
@@ -285,81 +692,147 @@ def get_menu_item(item_id: int) -> Optional[MenuItem]:
         base_price=item_row['base_price'],
         image_url=item_row['image_url'],
         is_available=bool(item_row['is_available']),
-        options=options
+        required_options=groups["required"],
+        optional_options=groups["optional"]
     )
+
+class MenuSearchResult(TypedDict):
+    id: int
+    name: str
+    category: str
+    is_available: bool
+    matched: str  # name, alias, description
+    score: float
+
+
+_search_index_available: Optional[bool] = None
+
+def _has_search_index() -> bool:
+    global _search_index_available
+    if _search_index_available is None:
+        _search_index_available = get_connection_manager().fetchone(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'menu_search'"
+        ) is not None
+    return _search_index_available
+
+def _compact_text(text: Optional[str]) -> str:
+    return "".join((text or "").lower().split())
+
+def _match_tier(query: str, name: str, aliases: List[str]):
+    # 정확히 일치 > 이름 접두 > 이름 포함 > 별칭 포함 > 설명 순, 같은 단계에서는 FTS 점수와 이름 길이로 정렬
+    compact_name = _compact_text(name)
+    compact_aliases = [_compact_text(alias) for alias in aliases if alias]
+    if compact_name == query:
+        return 0, "name"
+    if query in compact_aliases:
+        return 1, "alias"
+    if compact_name.startswith(query):
+        return 2, "name"
+    if query in compact_name:
+        return 3, "name"
+    if any(query in alias for alias in compact_aliases):
+        return 4, "alias"
+    return 5, "description"
+
+def _escape_like(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def search_menu(query: str, limit: int = 5, include_description: bool = True) -> List[MenuSearchResult]:
+    query = " ".join((query or "").split())
+    compact_query = _compact_text(query)
+    if not compact_query:
+        return []
+    
+    db = get_connection_manager()
+    candidate_limit = max(limit * 5, 20)
+    # 띄어 쓴 검색어('라 떼')는 원문이 3글자 이상이어도 공백을 뺀 길이로 판단, trigram 분기에서는 원문과 붙인 형태를 함께 찾음
+    if len(compact_query) >= 3 and _has_search_index():
+        phrases = list(dict.fromkeys([query.lower(), compact_query]))
+        # 3글자 이상은 trigram 색인으로 부분 문자열 후보를 찾고 bm25(이름 > 별칭 > 설명 가중치)로 정렬
+        expression = " OR ".join('"' + phrase.replace('"', '""') + '"' for phrase in phrases)
+        if not include_description:
+            expression = f"{{name aliases}} : ({expression})"
+        rows = db.fetchall(
+            """
+            SELECT m.id, m.name, m.description, m.is_available, c.name AS category, s.aliases, s.rank
+            FROM (
+                SELECT rowid, aliases, bm25(menu_search, 10.0, 5.0, 1.0) AS rank
+                FROM menu_search
+                WHERE menu_search MATCH ?
+                ORDER BY rank
+                LIMIT ?
+            ) s
+            JOIN menu_items m ON m.id = s.rowid
+            LEFT JOIN categories c ON c.id = m.category_id
+            """,
+            (expression, candidate_limit)
+        )
+    else:
+        # trigram은 3글자 미만을 찾지 못하므로 공백을 뺀 길이가 짧은 검색어(예: '라떼', '아 아')는 LIKE로 찾음
+        pattern = f"%{_escape_like(query.lower())}%"
+        compact_pattern = f"%{_escape_like(compact_query)}%"
+        # 별칭은 메뉴별 EXISTS 대신 별칭 테이블을 한 번만 훑어 합치고, 정확히 일치한 후보를 먼저 남김
+        description_filter = "OR m.description LIKE :pattern ESCAPE '\\'" if include_description else ""
+        rows = db.fetchall(
+            f"""
+            WITH hits(id, weight) AS (
+                SELECT m.id, CASE WHEN lower(replace(m.name, ' ', '')) = :compact THEN 0 ELSE 2 END
+                FROM menu_items m
+                WHERE m.name LIKE :pattern ESCAPE '\\'
+                   OR replace(m.name, ' ', '') LIKE :compact_pattern ESCAPE '\\'
+                   {description_filter}
+                UNION ALL
+                SELECT a.menu_item_id, CASE WHEN lower(replace(a.alias, ' ', '')) = :compact THEN 1 ELSE 3 END
+                FROM menu_aliases a
+                WHERE replace(a.alias, ' ', '') LIKE :compact_pattern ESCAPE '\\'
+            )
+            SELECT m.id, m.name, m.description, m.is_available, c.name AS category,
+                   (SELECT group_concat(alias, char(10)) FROM menu_aliases a WHERE a.menu_item_id = m.id) AS aliases,
+                   0.0 AS rank
+            FROM (SELECT id, min(weight) AS weight FROM hits GROUP BY id) h
+            JOIN menu_items m ON m.id = h.id
+            LEFT JOIN categories c ON c.id = m.category_id
+            ORDER BY h.weight, length(m.name), m.id
+            LIMIT :limit
+            """,
+            {"pattern": pattern, "compact_pattern": compact_pattern, "compact": compact_query, "limit": candidate_limit}
+        )
     
-    menu_item.required_options = required_options
-    menu_item.optional_options = optional_options
-    
-    return menu_item
+    ranked = []
+    for row in rows:
+        tier, matched = _match_tier(compact_query, row['name'], (row['aliases'] or "").split("\n"))
+        if tier == 5 and not include_description:
+            continue
+        ranked.append(((tier, row['rank'], len(row['name']), row['id']), MenuSearchResult(
+            id=row['id'],
+            name=row['name'],
+            category=row['category'] or "기타",
+            is_available=bool(row['is_available']),
+            matched=matched,
+            score=round(-row['rank'], 6) if row['rank'] else 0.0
+        )))
+    ranked.sort(key=lambda entry: entry[0])
+    return [result for _, result in ranked[:limit]]
 
 def get_menu_by_name(menu_name: str) -> Optional[Dict[str, Any]]:
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
+    matches = search_menu(menu_name, limit=1, include_description=False)
+    if not matches:
+        return None
     
-    cursor.execute(
+    db = get_connection_manager()
+    item_row = db.fetchone(
         """
-        SELECT id, category_id, name, description, base_price, image_url, is_available,
-               required_options, optional_options
-        FROM menu_items
-        WHERE name LIKE ?
+        SELECT m.id, m.name, m.description, m.base_price, m.image_url, m.is_available, c.name AS category
+        FROM menu_items m
+        LEFT JOIN categories c ON c.id = m.category_id
+        WHERE m.id = ?
         """,
-        (f"%{menu_name}%",)
+        (matches[0]["id"],)
     )
-    
-    item_row = cursor.fetchone()
     if not item_row:
-        conn.close()
         return None
     
-    cursor.execute(
-        """
-        SELECT name
-        FROM categories
-        WHERE id = ?
-        """,
-        (item_row['category_id'],)
-    )
-    
-    cat_result = cursor.fetchone()
-    category_name = cat_result['name'] if cat_result else "기타"
-    
-    cursor.execute(
-        """
-        SELECT id, name, price_adjustment
-        FROM menu_options
-        WHERE menu_item_id = ?
-        """,
-        (item_row['id'],)
-    )
-    
-    options = [
-        {
-            "id": opt_row['id'],
-            "name": opt_row['name'],
-            "price_adjustment": opt_row['price_adjustment']
-        }
-        for opt_row in cursor.fetchall()
-    ]
-    
-    required_options = {}
-    optional_options = {}
-    
-    if item_row['required_options'] and item_row['required_options'] != '{}':
-        try:
-            required_options = json.loads(item_row['required_options'])
-        except json.JSONDecodeError:
-            print(f"Error parsing required options JSON: {item_row['required_options']}")
-    
-    if item_row['optional_options'] and item_row['optional_options'] != '{}':
-        try:
-            optional_options = json.loads(item_row['optional_options'])
-        except json.JSONDecodeError:
-            print(f"Error parsing optional options JSON: {item_row['optional_options']}")
-    
-    conn.close()
-    
+    groups = _load_option_groups(item_row['id']).get(item_row['id'], EMPTY_OPTION_GROUPS)
     return {
         "id": item_row['id'],
         "name": item_row['name'],
@@ -367,17 +840,18 @@ def get_menu_by_name(menu_name: str) -> Optional[Dict[str, Any]]:
         "base_price": item_row['base_price'],
         "image_url": item_row['image_url'],
         "is_available": bool(item_row['is_available']),
-        "category": category_name,
-        "options": options,
-        "required_options": required_options,
-        "optional_options": optional_options
+        "category": item_row['category'] or "기타",
+        "options": [
+            {"id": opt.id, "name": opt.name, "price_adjustment": opt.price_adjustment}
+            for opt in flatten_options(groups["required"], groups["optional"])
+        ],
+        "required_options": _option_dicts(groups["required"]),
+        "optional_options": _option_dicts(groups["optional"])
     }
 
 def get_menu_by_id(item_id: int) -> Optional[Dict[str, Any]]:
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute(
+    db = get_connection_manager()
+    result = db.fetchone(
         """
         SELECT id, category_id, name, description, base_price, image_url, is_available
         FROM menu_items
@@ -385,15 +859,12 @@ def get_menu_by_id(item_id: int) -> Optional[Dict[str, Any]]:
         """,
         (item_id,)
     )
-    
-    result = cursor.fetchone()
     if not result:
-        conn.close()
         return None
     
     item_id, cat_id, name, desc, base_price, image_url, is_available = result
     
-    cursor.execute(
+    cat_result = db.fetchone(
         """
         SELECT name
         FROM categories
@@ -401,26 +872,14 @@ def get_menu_by_id(item_id: int) -> Optional[Dict[str, Any]]:
         """,
         (cat_id,)
     )
-    
-    cat_result = cursor.fetchone()
     category_name = cat_result[0] if cat_result else "기타"
     
-    cursor.execute(
-        """
-        SELECT id, name, price_adjustment
-        FROM menu_options
-        WHERE menu_item_id = ?
-        """,
-        (item_id,)
-    )
-    
+    groups = _load_option_groups(item_id).get(item_id, EMPTY_OPTION_GROUPS)
     options = [
-        {"name": opt_name, "price_adjustment": price_adj}
-        for opt_id, opt_name, price_adj in cursor.fetchall()
+        {"name": opt.name, "price_adjustment": opt.price_adjustment}
+        for opt in flatten_options(groups["required"], groups["optional"])
     ]
     
-    conn.close()
-    
     return {
         "id": item_id,
         "name": name,
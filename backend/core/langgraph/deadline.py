@@ -0,0 +1,23 @@
+from typing import Dict, Any, Optional
+import os
+import time
+
+# 요청 하나가 키오스크를 붙잡을 수 있는 전체 시간 (STT + 규칙 + LLM)
+REQUEST_BUDGET_SECONDS = float(os.getenv("REQUEST_BUDGET_SECONDS", 20))
+# LLM 호출을 시작하려면 최소한 이만큼은 남아 있어야 함
+LLM_MIN_BUDGET_SECONDS = float(os.getenv("LLM_MIN_BUDGET_SECONDS", 3))
+
+def create_deadline(budget_seconds: Optional[float] = None) -> float:
+    if budget_seconds is None:
+        budget_seconds = REQUEST_BUDGET_SECONDS
+    return time.monotonic() + budget_seconds
+
+def remaining_time(state: Dict[str, Any]) -> Optional[float]:
+    deadline = state.get("deadline")
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+def has_budget(state: Dict[str, Any], required_seconds: float) -> bool:
+    remaining = remaining_time(state)
+    return remaining is None or remaining >= required_seconds
@@ -0,0 +1,16 @@
+from typing import Dict, Any
+import logging
+
+logger = logging.getLogger("workflow_events")
+
+def emit_event(state: Dict[str, Any], event: str, data: Dict[str, Any]):
+    sink = state.get("event_sink")
+    if sink is None:
+        return
+    try:
+        sink(event, data)
+    except Exception as e:
+        logger.warning(f"이벤트 전송 실패 ({event}): {str(e)}")
+
+def has_event_sink(state: Dict[str, Any]) -> bool:
+    return state.get("event_sink") is not None
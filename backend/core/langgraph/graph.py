@@ -1,21 +1,82 @@
 from typing import Dict, Any
+import asyncio
+import logging
 from langgraph.graph import Graph, START, END
 from .state import WorkflowState
+from .deadline import remaining_time, LLM_MIN_BUDGET_SECONDS
+from .events import emit_event
+from .speculation import get_speculation_manager
 
 
 from .nodes.stt_node import process_audio
 from .nodes.llm_node import analyze_order
-from .nodes.rule_based_node import process_dialogue, should_use_llm
+from .nodes.rule_based_node import process_dialogue, should_use_llm, degraded_response, degraded_dialogue
 from .nodes.intent_classifier_node import classify_intent
 
+logger = logging.getLogger("graph")
+
+
+# Whisper, SQLite, SentenceTransformer 모두 블로킹 호출이므로 이벤트 루프 밖에서 실행
+async def process_audio_async(state: WorkflowState) -> WorkflowState:
+    return await asyncio.to_thread(process_audio, state)
+
+async def classify_intent_async(state: WorkflowState) -> Dict[str, Any]:
+    return await asyncio.to_thread(classify_intent, state)
+
+async def process_dialogue_async(state: WorkflowState) -> Dict[str, Any]:
+    # 의도 신뢰도가 애매하면 규칙 기반 처리와 동시에 LLM 호출을 미리 시작 (LLM_SPECULATIVE=1)
+    speculation_manager = get_speculation_manager()
+    speculation = speculation_manager.maybe_start(state, analyze_order)
+    try:
+        result = await asyncio.to_thread(process_dialogue, state)
+    except BaseException:
+        speculation_manager.cancel(speculation)
+        raise
+    if speculation is not None:
+        if (result.get("rule_based_result") or {}).get("success", False):
+            speculation_manager.cancel(speculation)
+        else:
+            result["speculation"] = speculation
+    return result
+
+async def degraded_dialogue_async(state: WorkflowState) -> Dict[str, Any]:
+    get_speculation_manager().cancel(state.pop("speculation", None))
+    return await asyncio.to_thread(degraded_dialogue, state)
+
+async def analyze_order_async(state: WorkflowState) -> Dict[str, Any]:
+    remaining = remaining_time(state)
+    speculation = state.pop("speculation", None)
+    if speculation is not None:
+        try:
+            result = await get_speculation_manager().collect(speculation, state, remaining)
+        except asyncio.TimeoutError:
+            logger.warning("선행 LLM 호출 시간 초과, 규칙 기반 응답으로 대체")
+            return degraded_response(state, "timeout")
+        if result is not None:
+            emit_event(state, "partial_order", {"order": result.get("analysis"), "source": "speculative"})
+            return result
+        remaining = remaining_time(state)
+    
+    if remaining is not None and remaining < LLM_MIN_BUDGET_SECONDS:
+        logger.warning(f"남은 시간 부족({remaining:.2f}초), LLM 호출 생략")
+        return degraded_response(state, "deadline")
+    
+    # 타임아웃 후에도 스레드는 계속 돌 수 있으므로 사본을 넘겨 상태 경합을 막음
+    try:
+        return await asyncio.wait_for(asyncio.to_thread(analyze_order, dict(state)), timeout=remaining)
+    except asyncio.TimeoutError:
+        logger.warning("LLM 노드 시간 초과, 규칙 기반 응답으로 대체")
+        return degraded_response(state, "timeout")
+
 
 def create_order_analysis_workflow() -> Graph:
     workflow = Graph()
     
-    workflow.add_node("process_audio", process_audio)       
-    workflow.add_node("classify_intent", classify_intent)   
-    workflow.add_node("rule_based_dialogue", process_dialogue) 
-    workflow.add_node("analyze_order", analyze_order)       
+    workflow.add_node("process_audio", process_audio_async)       
+    workflow.add_node("classify_intent", classify_intent_async)   
+    workflow.add_node("rule_based_dialogue", process_dialogue_async) 
+    workflow.add_node("analyze_order", analyze_order_async)       
+    workflow.add_node("degraded_dialogue", degraded_dialogue_async)
     
     workflow.add_edge(START, "process_audio")
     workflow.add_edge("process_audio", "classify_intent")
@@ -26,9 +87,11 @@ def create_order_analysis_workflow() -> Graph:
         should_use_llm,
         {
             "analyze_order": "analyze_order",  
+            "degraded_dialogue": "degraded_dialogue",
             "END": END  
         }
     )
     workflow.add_edge("analyze_order", END)
+    workflow.add_edge("degraded_dialogue", END)
     
     return workflow.compile()
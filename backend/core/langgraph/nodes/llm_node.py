@@ -1,28 +1,84 @@
 from typing import Dict, Any, List
 import os
-import json
 import logging
-import re
-from langchain.chat_models import ChatOpenAI
 from langchain.schema import HumanMessage, SystemMessage, AIMessage
 from ..state import WorkflowState
-from ..tools.menu_tools import get_all_menus, get_menu_info, get_menu_options
+from ..events import emit_event, has_event_sink
+from ..deadline import remaining_time, has_budget, LLM_MIN_BUDGET_SECONDS
+from .rule_based_node import degraded_response
+from ..tools.option_index import get_option_index
+from ..tools.pricing import get_pricing_engine
+from ..tools.response_cache import get_response_cache
+from ..tools.history_manager import get_history_manager
+from ..tools.menu_context import get_menu_context_builder
+from ..tools.llm_backends import LLMBackendError, get_llm_router
+from ..tools.structured_output import (
+    IncrementalJSONParser,
+    build_response_format,
+    build_repair_message,
+    extract_json,
+    validate_analysis
+)
 
 logger = logging.getLogger("llm_node")
 
+# json_schema 응답 형식 사용 여부 (백엔드별 지원 여부는 llm_backends에서 따로 설정)
+STRUCTURED_OUTPUT_ENABLED = os.getenv("LLM_STRUCTURED_OUTPUT", "1") != "0"
+MAX_REPAIR_ATTEMPTS = 1
+
+def _response_format(fields: List[str] = None):
+    if not STRUCTURED_OUTPUT_ENABLED:
+        return None
+    return build_response_format(fields)
+
+def _stream_llm_response(router, messages, state: WorkflowState) -> str:
+    chunks = []
+    parser = IncrementalJSONParser()
+    last_partial = None
+    for token in router.stream(messages, response_format=_response_format(), timeout=remaining_time(state)):
+        if token:
+            chunks.append(token)
+            emit_event(state, "llm_token", {"token": token})
+            partial = parser.feed(token)
+            if partial is not None and partial != last_partial:
+                last_partial = partial
+                emit_event(state, "partial_order", {"order": partial, "source": "stream"})
+    return "".join(chunks)
+
+def _parse_and_repair(router, messages, response_content: str, state: WorkflowState) -> Dict[str, Any]:
+    raw = extract_json(response_content)
+    analysis, invalid_fields = validate_analysis(raw)
+    
+    attempts = 0
+    while invalid_fields and attempts < MAX_REPAIR_ATTEMPTS and has_budget(state, LLM_MIN_BUDGET_SECONDS):
+        attempts += 1
+        logger.warning(f"LLM 응답 필드 오류, 해당 필드만 재요청: {invalid_fields}")
+        repair_messages = messages + [
+            AIMessage(content=response_content),
+            HumanMessage(content=build_repair_message(invalid_fields, raw))
+        ]
+        try:
+            repaired = extract_json(router.invoke(
+                repair_messages,
+                response_format=_response_format(invalid_fields),
+                timeout=remaining_time(state)
+            ))
+        except LLMBackendError as e:
+            logger.warning(f"필드 재요청 실패: {str(e)}")
+            break
+        if not isinstance(repaired, dict):
+            continue
+        raw = {**(raw if isinstance(raw, dict) else {}), **{f: repaired[f] for f in invalid_fields if f in repaired}}
+        analysis, invalid_fields = validate_analysis(raw)
+    
+    if invalid_fields:
+        logger.warning(f"복구하지 못한 필드는 기본값 사용: {invalid_fields}")
+    return analysis
+
 def analyze_order(state: WorkflowState) -> Dict[str, Any]:
     try:
-        # API 키 -> env 파일에서 긁어와야함
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            logger.error("OPENAI_API_KEY env var 설정 X")
-            raise ValueError("OPENAI_API_KEY env var 설정 X")
-            
-        llm = ChatOpenAI(
-            model="gpt-4o",
-            temperature=0.0,
-            openai_api_key=api_key
-        )
+        # 설정(LLM_BACKENDS)에 따라 OpenAI, 로컬 OpenAI 호환 서버, 기록 재생 백엔드 중에서 선택
+        router = get_llm_router()
         
         text_input = state.get('text', '')
         logger.info(f"LLM 분석 시작: 텍스트='{text_input}'")
@@ -30,36 +86,13 @@ def analyze_order(state: WorkflowState) -> Dict[str, Any]:
         # 명확화 항목 해결 여부 플래그 초기화 (항상 이 플래그를 포함하도록)
         state["pending_clarifications_resolved"] = False
         
-        all_menus = get_all_menus()
-        if all_menus.get("status") != "success":
-            logger.warning("전체 메뉴 조회 실패")
-            menu_info = "메뉴 정보를 가져오지 못했습니다."
-        else:
-            menu_info = "메뉴 정보:\n"
-            for category in all_menus.get("categories", []):
-                menu_info += f"\n## {category.name}\n"
-                for item in category.items:
-                    menu_info += f"- {item.name}: {item.base_price}원\n"
-                    
-                    if hasattr(item, 'required_options') and item.required_options:
-                        menu_info += "  필수 옵션:\n"
-                        for option_category, options in item.required_options.items():
-                            menu_info += f"    {option_category}: "
-                            option_texts = []
-                            for opt in options:
-                                price_text = f"({'+' if opt.price_adjustment > 0 else ''}{opt.price_adjustment}원)" if opt.price_adjustment != 0 else ""
-                                option_texts.append(f"{opt.name}{price_text}")
-                            menu_info += ", ".join(option_texts) + "\n"
-                    
-                    if hasattr(item, 'optional_options') and item.optional_options:
-                        menu_info += "  선택 옵션:\n"
-                        for option_category, options in item.optional_options.items():
-                            menu_info += f"    {option_category}: "
-                            option_texts = []
-                            for opt in options:
-                                price_text = f"({'+' if opt.price_adjustment > 0 else ''}{opt.price_adjustment}원)" if opt.price_adjustment != 0 else ""
-                                option_texts.append(f"{opt.name}{price_text}")
-                            menu_info += ", ".join(option_texts) + "\n"
+        conversation_history = state.get("conversation_history", [])
+        pending_clarifications = state.get("pending_clarifications", [])
+        current_order = state.get("current_order")
+        
+        # 전체 메뉴 대신 발화/현재 주문과 관련된 메뉴만 포함 (못 찾으면 전체 메뉴)
+        menu_context = get_menu_context_builder().build(text_input, current_order, pending_clarifications)
+        menu_info = menu_context["menu_text"]
         
         system_prompt = f"""당신은 카페 주문을 돕는 AI 어시스턴트이다.
         사용자의 음성 주문을 분석하고, 주문을 정확하게 처리하기 위해 필요한 정보를 수집해야 한다.
@@ -118,19 +151,15 @@ def analyze_order(state: WorkflowState) -> Dict[str, Any]:
         
         messages = [SystemMessage(content=system_prompt)]
         
-        # 이전 대화 기록 추가
-        conversation_history = state.get("conversation_history", [])
-        pending_clarifications = state.get("pending_clarifications", [])
+        # 최근 대화 일부와 주문 상태 요약만 프롬프트에 포함
+        history_context = get_history_manager().build(conversation_history, current_order)
+        state["prompt_stats"] = {
+            "history": history_context["stats"],
+            "menu": menu_context["stats"]
+        }
         
-        # 대화 기록이 있으면 메시지에 추가
-        if conversation_history:
-            conversation_summary = "이전 대화:\n"
-            for conv in conversation_history:
-                role = conv.get("role", "")
-                content = conv.get("content", "")
-                conversation_summary += f"{role}: {content}\n"
-            
-            messages.append(HumanMessage(content=f"대화 기록: {conversation_summary}"))
+        if history_context["history_text"]:
+            messages.append(HumanMessage(content=f"대화 기록: {history_context['history_text']}"))
         
         # 보류 중인 명확화 항목이 있으면 추가
         if pending_clarifications:
@@ -140,42 +169,42 @@ def analyze_order(state: WorkflowState) -> Dict[str, Any]:
             
             messages.append(HumanMessage(content=f"명확화 필요 항목: {clarification_summary}"))
         
-        # 현재 주문 상태 추가 (있는 경우만..)
-        current_order = state.get("current_order")
-        if current_order:
-            order_summary = "현재 주문 상태:\n"
-            for item in current_order.get("items", []):
-                item_name = item.get("name", "")
-                quantity = item.get("quantity", 1)
-                options = ", ".join(item.get("options", []))
-                missing_options = item.get("missing_required_options", [])
-                if missing_options:
-                    missing_str = f" (누락된 필수 옵션: {', '.join(missing_options)})"
-                else:
-                    missing_str = ""
-                order_summary += f"- {item_name} x {quantity} (옵션: {options}){missing_str}\n"
-            
-            messages.append(HumanMessage(content=f"현재 주문: {order_summary}"))
+        if history_context["order_summary"]:
+            messages.append(HumanMessage(content=history_context["order_summary"]))
         
         # 현재 사용자 입력 추가
         messages.append(HumanMessage(content=f"현재 사용자 입력: {text_input}"))
         
-        logger.info("OpenAI API 호출 중...")
-        response = llm.invoke(messages)
-        logger.info("OpenAI API 응답 수신 완료")
+        response_cache = get_response_cache()
+        # 메뉴를 불러오지 못하면 지문이 빈 문자열, 지문을 덮어쓰지 않고 메뉴 없이 만든 응답은 캐시에서 읽지도 저장하지도 않음
+        menu_loaded = bool(menu_context["fingerprint"])
+        if menu_loaded:
+            response_cache.sync_menu(menu_context["fingerprint"])
+            cached_analysis, cache_status = response_cache.get(text_input, state)
+        else:
+            cached_analysis, cache_status = None, "skip"
         
         try:
-            logger.info(f"LLM 응답 분석 중: {response.content}")
-            
-            response_content = response.content.strip()
-            if response_content.startswith('{') and response_content.endswith('}'):
-                analysis = json.loads(response_content)
+            if cached_analysis is not None:
+                logger.info(f"LLM 응답 캐시 사용 ({cache_status}), OpenAI API 호출 생략")
+                analysis = cached_analysis
             else:
-                json_match = re.search(r'({.*})', response_content, re.DOTALL)
-                if json_match:
-                    analysis = json.loads(json_match.group(1))
+                logger.info("LLM 호출 중...")
+                if has_event_sink(state):
+                    response_content = _stream_llm_response(router, messages, state)
                 else:
-                    raise ValueError("LLM 응답에서 JSON 형식을 찾을 수 없습니다.")
+                    response_content = router.invoke(messages, response_format=_response_format(), timeout=remaining_time(state))
+                logger.info("LLM 응답 수신 완료")
+                
+                logger.info(f"LLM 응답 분석 중: {response_content}")
+                analysis = _parse_and_repair(router, messages, response_content, state)
+                if menu_loaded:
+                    response_cache.put(text_input, state, analysis)
+            
+            emit_event(state, "partial_order", {
+                "order": analysis,
+                "source": "cache" if cached_analysis is not None else "llm"
+            })
             
             is_order_related = analysis.get("is_order_related", True)
             
@@ -212,24 +241,9 @@ def analyze_order(state: WorkflowState) -> Dict[str, Any]:
                 
                 return state
             
-            for item in analysis.get("items", []):
-                if "name" in item:
-                    menu_name = item["name"]
-                    menu_options_result = get_menu_options(menu_name)
-                    
-                    if menu_options_result.get("status") == "success":
-                        required_options = menu_options_result.get("required_options", {})
-                        
-                        missing_options = []
-                        selected_options = set(item.get("options", []))
-                        
-                        for option_category, options in required_options.items():
-                            category_options = [opt["name"] for opt in options]
-                            if not any(opt in selected_options for opt in category_options):
-                                missing_options.append(option_category)
-                        
-                        item["missing_required_options"] = missing_options
-                        logger.info(f"메뉴 '{menu_name}'의 누락된 필수 옵션: {missing_options}")
+            # 모든 항목의 누락된 필수 옵션을 메모리 인덱스에서 한 번에 확인
+            get_option_index().resolve_missing_options(analysis.get("items", []))
+            get_pricing_engine().price_order(analysis)
             
             state["analysis"] = analysis
             
@@ -281,6 +295,10 @@ def analyze_order(state: WorkflowState) -> Dict[str, Any]:
             
             logger.info("주문 분석 완료")
                 
+        except LLMBackendError as e:
+            # 모든 백엔드가 실패했거나 회로 차단기가 열린 경우 일반 오류 대신 규칙 기반 질문으로 대체
+            logger.warning(f"LLM 호출 불가: {str(e)}")
+            return degraded_response(state, "llm_unavailable")
         except Exception as e:
             logger.error(f"응답 파싱 오류: {str(e)}", exc_info=True)
             state["response"] = {
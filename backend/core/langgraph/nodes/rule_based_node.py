@@ -3,9 +3,13 @@ import re
 import logging
 import json
 from ..state import WorkflowState
-from ..tools.menu_tools import get_all_menus, get_menu_info, get_menu_options
+from ..events import emit_event
+from ...menu_snapshot import get_menu_snapshot
 from ..tools.vector_store import VectorStore
 from ..tools.intent_classifier import IntentClassifier
+from ..tools.option_index import get_option_index
+from ..tools.pricing import get_pricing_engine
+from ..tools.circuit_breaker import get_llm_circuit_breaker
 
 logger = logging.getLogger("rule_based_node")
 
@@ -25,20 +29,12 @@ class RuleBasedDialogueSystem:
         self.intent_classifier = IntentClassifier()
         
     def _load_menu_data(self) -> List[Dict[str, Any]]:
-        menu_result = get_all_menus()
-        if menu_result["status"] != "success":
-            logger.warning("메뉴 데이터 로드 실패")
+        # 턴마다 만들어지므로 DB 대신 메뉴 스냅샷의 목록을 그대로 사용 (읽기 전용)
+        try:
+            return get_menu_snapshot().rows
+        except Exception as e:
+            logger.warning(f"메뉴 데이터 로드 실패: {str(e)}")
             return []
-            
-        menu_data = []
-        for category in menu_result.get("categories", []):
-            for item in category.items:
-                menu_data.append({
-                    "name": item.name,
-                    "base_price": item.base_price,
-                    "category": category.name
-                })
-        return menu_data
         
     def _load_patterns(self) -> Dict[str, List[str]]:
         return {
@@ -321,8 +317,9 @@ class RuleBasedDialogueSystem:
         return None
         
     def _verify_menu(self, menu_name: str, quantity: int, text: str) -> Optional[Dict[str, Any]]:
-        menu_info = get_menu_info(menu_name)
-        if menu_info["status"] != "success":
+        option_index = get_option_index()
+        entry = option_index.lookup(menu_name)
+        if entry is None:
             logger.info(f"메뉴 '{menu_name}' 정확히 일치하지 않음, 유사 매칭 시도")
             best_match = None
             best_score = 0.0
@@ -334,12 +331,12 @@ class RuleBasedDialogueSystem:
                     best_match = menu["name"]
             
             if best_match and best_score >= 0.5:
-                menu_info = get_menu_info(best_match)
-                if menu_info["status"] == "success":
+                entry = option_index.lookup(best_match)
+                if entry is not None:
                     menu_name = best_match
                     logger.info(f"유사 메뉴 발견: {menu_name} (유사도: {best_score:.4f})")
                         
-            if menu_info["status"] != "success":
+            if entry is None:
                 return None
                 
         options = self._extract_options(text)
@@ -531,27 +528,25 @@ class RuleBasedDialogueSystem:
         quantity = order_result["quantity"]
         options = order_result["options"]
         
-        menu_info = get_menu_info(menu_name)
-        if menu_info["status"] != "success":
+        entry = get_option_index().lookup(menu_name)
+        if entry is None:
             return {"should_use_llm": True}
-            
-        menu = menu_info["menu"]
         
-        missing_options = self._check_missing_options(menu, options)
+        missing_options = entry.missing_required_options(options)
         
         new_item = {
             "name": menu_name,
             "quantity": quantity,
             "options": options,
             "missing_required_options": missing_options,
-            "price": menu["base_price"]
+            "price": entry.base_price
         }
         current_order = state.get("current_order", {})
         items = current_order.get("items", []) if current_order else []
         
         updated_items = items.copy()  
         updated_items.append(new_item)
-        total_price = sum(item["price"] * item["quantity"] for item in updated_items)
+        total_price = get_pricing_engine().price_items(updated_items)
         
         if missing_options:
             clarification_items = self._generate_clarification_items(menu_name, missing_options)
@@ -611,10 +606,9 @@ class RuleBasedDialogueSystem:
                     if option not in item["options"]:
                         item["options"].append(option)
                 
-                menu_info = get_menu_info(menu_name)
-                if menu_info["status"] == "success":
-                    menu = menu_info["menu"]
-                    item["missing_required_options"] = self._check_missing_options(menu, item["options"])
+                missing_options = get_option_index().missing_required_options(menu_name, item["options"])
+                if missing_options is not None:
+                    item["missing_required_options"] = missing_options
                 
                 updated = True
                 break
@@ -640,7 +634,7 @@ class RuleBasedDialogueSystem:
             return {
                 "is_order_related": True,
                 "items": items,
-                "total_price": sum(item["price"] * item["quantity"] for item in items),
+                "total_price": get_pricing_engine().price_items(items),
                 "special_requests": current_order.get("special_requests", "") if current_order else "",
                 "clarification_items": clarification_items[:1]  
             }
@@ -654,22 +648,11 @@ class RuleBasedDialogueSystem:
             return {
                 "is_order_related": True,
                 "items": items,
-                "total_price": sum(item["price"] * item["quantity"] for item in items),
+                "total_price": get_pricing_engine().price_items(items),
                 "special_requests": current_order.get("special_requests", "") if current_order else "",
                 "clarification_items": [additional_order_text]
             }
             
-    def _check_missing_options(self, menu: Dict[str, Any], selected_options: List[str]) -> List[str]:
-        missing_options = []
-        required_options = menu.get("required_options", {})
-        
-        for option_category, options in required_options.items():
-            category_options = [opt["name"] for opt in options]
-            if not any(opt in selected_options for opt in category_options):
-                missing_options.append(option_category)
-                
-        return missing_options
-        
     def _generate_clarification_items(self, menu_name: str, missing_options: List[str]) -> List[str]:
         clarification_items = []
         for option_category in missing_options:
@@ -689,6 +672,16 @@ class RuleBasedDialogueSystem:
         return clarification_items
         
 def process_dialogue(state: WorkflowState) -> Dict[str, Any]:
+    state = _process_dialogue(state)
+    rule_based_result = state.get("rule_based_result") or {}
+    emit_event(state, "rule_result", {
+        "success": rule_based_result.get("success", False),
+        "analysis": state.get("analysis") if rule_based_result.get("success", False) else None,
+        "response": state.get("response") if rule_based_result.get("success", False) else None
+    })
+    return state
+
+def _process_dialogue(state: WorkflowState) -> Dict[str, Any]:
     try:
         dialogue_system = RuleBasedDialogueSystem()
         text_input = state.get('text', '')
@@ -1052,5 +1045,70 @@ def process_dialogue(state: WorkflowState) -> Dict[str, Any]:
 def should_use_llm(state: WorkflowState) -> str:
     rule_based_result = state.get("rule_based_result", {})
     if not rule_based_result.get("success", False):
+        if get_llm_circuit_breaker().is_open():
+            logger.warning("LLM 회로 차단기 열림: 규칙 기반 대체 응답으로 분기")
+            return "degraded_dialogue"
         return "analyze_order"
     return "END"
+
+def degraded_dialogue(state: WorkflowState) -> Dict[str, Any]:
+    return degraded_response(state, "circuit_open")
+
+def degraded_response(state: WorkflowState, reason: str) -> Dict[str, Any]:
+    # LLM을 쓸 수 없을 때 규칙 기반으로 만들 수 있는 최선의 응답
+    logger.warning(f"LLM 없이 규칙 기반 응답으로 대체: 사유={reason}")
+    state["degraded_reason"] = reason
+    state["pending_clarifications_resolved"] = False
+    
+    current_order = state.get("current_order") or {}
+    pending_clarifications = state.get("pending_clarifications", [])
+    state["analysis"] = current_order or {
+        "items": [],
+        "total_price": 0,
+        "special_requests": "",
+        "clarification_items": []
+    }
+    
+    if pending_clarifications:
+        clarification = pending_clarifications[0]
+        state["response"] = {
+            "message": f"죄송합니다, 잘 알아듣지 못했어요. {clarification}",
+            "needs_clarification": True,
+            "clarification_items": [clarification],
+            "is_casual_conversation": False,
+            # 일상 대화가 아니지만 세션의 주문/명확화 항목과 위 안내 문구를 그대로 유지하도록 표시
+            "keep_pending": True,
+            "should_continue_ordering": True
+        }
+        return state
+    
+    clarification_items = []
+    try:
+        dialogue_system = RuleBasedDialogueSystem()
+        for item in current_order.get("items", []):
+            if item.get("missing_required_options", []):
+                clarification_items = dialogue_system._generate_clarification_items(
+                    item["name"], item["missing_required_options"]
+                )
+                break
+    except Exception as e:
+        logger.error(f"대체 명확화 질문 생성 중 오류: {str(e)}")
+    
+    if clarification_items:
+        state["response"] = {
+            "message": clarification_items[0],
+            "needs_clarification": True,
+            "clarification_items": clarification_items[:1],
+            "is_casual_conversation": False,
+            "should_continue_ordering": True
+        }
+    else:
+        state["response"] = {
+            "message": "죄송합니다, 잘 알아듣지 못했어요. 주문하실 메뉴를 다시 한 번 말씀해 주시겠어요?",
+            "needs_clarification": False,
+            "clarification_items": [],
+            "is_casual_conversation": False,
+            "keep_pending": True,
+            "should_continue_ordering": True
+        }
+    return state
@@ -6,6 +6,7 @@ import logging
 import time
 from pathlib import Path
 from ..state import WorkflowState
+from ..events import emit_event
 
 logger = logging.getLogger("stt_node")
 
@@ -66,6 +67,7 @@ def process_audio(state: WorkflowState) -> WorkflowState:
         state["text"] = transcribed_text
         
         logger.info(f"STT 처리 완료 ({processing_time:.2f}초): '{transcribed_text}'")
+        emit_event(state, "transcript", {"text": transcribed_text, "processing_time": round(processing_time, 3)})
         
         return state
         
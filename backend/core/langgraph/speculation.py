@@ -0,0 +1,165 @@
+from typing import Dict, Any, Optional, Callable
+import asyncio
+import copy
+import logging
+import os
+import threading
+import time
+from .deadline import has_budget, LLM_MIN_BUDGET_SECONDS
+from .tools.circuit_breaker import get_llm_circuit_breaker
+
+logger = logging.getLogger("speculation")
+
+# LLM 노드가 결과로 채우는 필드, 선행 호출 결과를 실제 상태에 합칠 때 사용
+SPECULATIVE_RESULT_KEYS = ("analysis", "response", "pending_clarifications_resolved", "prompt_stats", "degraded_reason")
+
+
+class Speculation:
+    __slots__ = ("task", "started_at", "finished_at", "cancelled")
+
+    def __init__(self):
+        self.task: Optional[asyncio.Task] = None
+        self.started_at = time.monotonic()
+        self.finished_at: Optional[float] = None
+        self.cancelled = False
+
+
+class SpeculationManager:
+    # 의도 신뢰도가 애매한 경우 규칙 기반 처리와 동시에 LLM 호출을 미리 시작
+    def __init__(
+        self,
+        enabled: bool = False,
+        min_confidence: float = 0.4,
+        max_confidence: float = 0.75,
+        max_in_flight: int = 4
+    ):
+        self.enabled = enabled
+        self.min_confidence = min_confidence
+        self.max_confidence = max_confidence
+        self.max_in_flight = max_in_flight
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self.stats = {
+            "started": 0,
+            "used": 0,
+            "cancelled": 0,
+            "failed": 0,
+            "skipped_budget": 0,
+            "saved_seconds": 0.0,
+            "wasted_seconds": 0.0
+        }
+
+    def _in_gray_zone(self, state: Dict[str, Any]) -> bool:
+        classification = state.get("intent_classification") or {}
+        confidence = classification.get("confidence")
+        if confidence is None:
+            return False
+        return self.min_confidence <= confidence <= self.max_confidence
+
+    def should_speculate(self, state: Dict[str, Any]) -> bool:
+        if not self.enabled or not state.get("text") or not self._in_gray_zone(state):
+            return False
+        return not get_llm_circuit_breaker().is_open() and has_budget(state, LLM_MIN_BUDGET_SECONDS)
+
+    def _run(self, analyze: Callable, snapshot: Dict[str, Any], speculation: Speculation) -> Optional[Dict[str, Any]]:
+        try:
+            # 스레드가 시작되기 전에 취소됐다면 LLM을 호출하지 않음
+            if speculation.cancelled:
+                return None
+            return analyze(snapshot)
+        finally:
+            with self._lock:
+                speculation.finished_at = time.monotonic()
+                self._in_flight -= 1
+                # 취소된 뒤에도 스레드는 끝까지 돌기 때문에 낭비된 LLM 시간을 따로 집계
+                if speculation.cancelled:
+                    self.stats["wasted_seconds"] += speculation.finished_at - speculation.started_at
+
+    def maybe_start(self, state: Dict[str, Any], analyze: Callable) -> Optional[Speculation]:
+        if not self.should_speculate(state):
+            return None
+        with self._lock:
+            # 동시에 떠 있는 선행 호출 수로 추가 토큰 비용의 상한을 둠
+            if self._in_flight >= self.max_in_flight:
+                self.stats["skipped_budget"] += 1
+                return None
+            self._in_flight += 1
+            self.stats["started"] += 1
+        # 토큰 스트리밍은 규칙 기반 결과가 실패로 확정된 뒤에만 보내야 하므로 이벤트 싱크는 넘기지 않음
+        snapshot = copy.deepcopy({key: value for key, value in state.items() if key not in ("event_sink", "speculation")})
+        speculation = Speculation()
+        speculation.task = asyncio.create_task(asyncio.to_thread(self._run, analyze, snapshot, speculation))
+        # 취소 후 아무도 결과를 기다리지 않을 수 있으므로 예외를 여기서 소비
+        speculation.task.add_done_callback(lambda task: task.cancelled() or task.exception())
+        confidence = (state.get("intent_classification") or {}).get("confidence", 0.0)
+        logger.info(f"선행 LLM 호출 시작 (의도 신뢰도 {confidence:.2f})")
+        return speculation
+
+    def cancel(self, speculation: Optional[Speculation]):
+        if speculation is None or speculation.cancelled:
+            return
+        # 블로킹 HTTP 호출은 중단할 수 없으므로 작업은 끝까지 두고 결과만 버림
+        with self._lock:
+            speculation.cancelled = True
+            self.stats["cancelled"] += 1
+            if speculation.finished_at is not None:
+                self.stats["wasted_seconds"] += speculation.finished_at - speculation.started_at
+        logger.info("선행 LLM 호출 취소")
+
+    async def collect(self, speculation: Speculation, state: Dict[str, Any], timeout: Optional[float]) -> Optional[Dict[str, Any]]:
+        needed_at = time.monotonic()
+        try:
+            result = await asyncio.wait_for(asyncio.shield(speculation.task), timeout=timeout)
+        except asyncio.TimeoutError:
+            self.cancel(speculation)
+            raise
+        except Exception as e:
+            logger.warning(f"선행 LLM 호출 실패: {str(e)}")
+            with self._lock:
+                self.stats["failed"] += 1
+            return None
+        if result is None:
+            return None
+
+        # 규칙 기반 처리가 끝나기 전에 이미 진행된 LLM 시간만큼 응답이 빨라짐
+        saved = min(needed_at, speculation.finished_at or needed_at) - speculation.started_at
+        with self._lock:
+            self.stats["used"] += 1
+            self.stats["saved_seconds"] += saved
+        for key in SPECULATIVE_RESULT_KEYS:
+            if key in result:
+                state[key] = result[key]
+        logger.info(f"선행 LLM 결과 사용 (규칙 처리와 {saved:.2f}초 병렬 실행)")
+        return state
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            in_flight = self._in_flight
+        stats["saved_seconds"] = round(stats["saved_seconds"], 3)
+        stats["wasted_seconds"] = round(stats["wasted_seconds"], 3)
+        return {
+            "enabled": self.enabled,
+            "in_flight": in_flight,
+            "config": {
+                "min_confidence": self.min_confidence,
+                "max_confidence": self.max_confidence,
+                "max_in_flight": self.max_in_flight
+            },
+            **stats
+        }
+
+
+_speculation_manager: Optional[SpeculationManager] = None
+
+
+def get_speculation_manager() -> SpeculationManager:
+    global _speculation_manager
+    if _speculation_manager is None:
+        _speculation_manager = SpeculationManager(
+            enabled=os.getenv("LLM_SPECULATIVE", "0") == "1",
+            min_confidence=float(os.getenv("LLM_SPECULATIVE_MIN_CONFIDENCE", 0.4)),
+            max_confidence=float(os.getenv("LLM_SPECULATIVE_MAX_CONFIDENCE", 0.75)),
+            max_in_flight=int(os.getenv("LLM_SPECULATIVE_MAX_IN_FLIGHT", 4))
+        )
+    return _speculation_manager
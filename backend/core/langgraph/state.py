@@ -1,4 +1,4 @@
-from typing import Dict, Any, TypedDict, List, Optional
+from typing import Dict, Any, TypedDict, List, Optional, Callable
 from dataclasses import dataclass
 
 class OrderItem(TypedDict):
@@ -12,6 +12,17 @@ class OrderAnalysis(TypedDict):
     total_price: int
     special_requests: str
 
+class LLMOrderItem(OrderItem):
+    missing_required_options: List[str]
+
+class LLMOrderAnalysis(TypedDict):
+    is_order_related: bool
+    greeting_response: str
+    items: List[LLMOrderItem]
+    total_price: int
+    special_requests: str
+    clarification_items: List[str]
+
 class ResponseInfo(TypedDict):
     message: str
     needs_clarification: bool
@@ -31,4 +42,9 @@ class WorkflowState(TypedDict):
     current_order: Optional[Dict[str, Any]]
     rule_based_result: Optional[RuleBasedResult]
     intent_classification: Optional[Dict[str, Any]]
-    pending_clarifications_resolved: Optional[bool] 
\ No newline at end of file
+    pending_clarifications_resolved: Optional[bool]
+    event_sink: Optional[Callable[[str, Dict[str, Any]], None]]
+    deadline: Optional[float]
+    degraded_reason: Optional[str]
+    prompt_stats: Optional[Dict[str, Any]]
+    speculation: Optional[Any] 
\ No newline at end of file
@@ -0,0 +1,173 @@
+from typing import Dict, Any, Optional
+from collections import deque
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger("circuit_breaker")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    # 최근 호출의 오류율/지연 비율이 기준을 넘으면 차단(open), 일정 시간 후 시험 호출(half_open)로 복구 확인
+    def __init__(
+        self,
+        name: str,
+        window_size: int = 20,
+        min_calls: int = 5,
+        failure_rate_threshold: float = 0.5,
+        slow_call_seconds: float = 8.0,
+        slow_rate_threshold: float = 0.8,
+        open_seconds: float = 30.0,
+        half_open_max_calls: int = 1
+    ):
+        self.name = name
+        self.window_size = window_size
+        self.min_calls = min_calls
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_rate_threshold = slow_rate_threshold
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self.state = CLOSED
+        self._calls: deque = deque(maxlen=window_size)
+        self._opened_at = 0.0
+        self._half_open_in_flight = 0
+        self._lock = threading.Lock()
+        self.stats = {"trips": 0, "rejected": 0, "successes": 0, "failures": 0, "slow_calls": 0}
+
+    def _refresh_locked(self, now: float):
+        if self.state == OPEN and now - self._opened_at >= self.open_seconds:
+            self.state = HALF_OPEN
+            self._half_open_in_flight = 0
+            logger.info(f"회로 차단기 '{self.name}' 반개방: 시험 호출 허용")
+
+    def is_open(self) -> bool:
+        # 라우팅 판단용, 시험 호출 슬롯은 소비하지 않음
+        with self._lock:
+            self._refresh_locked(time.monotonic())
+            return self.state == OPEN
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            self._refresh_locked(time.monotonic())
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and self._half_open_in_flight < self.half_open_max_calls:
+                self._half_open_in_flight += 1
+                return True
+            self.stats["rejected"] += 1
+            return False
+
+    def _trip_locked(self, now: float, reason: str):
+        self.state = OPEN
+        self._opened_at = now
+        self._half_open_in_flight = 0
+        self.stats["trips"] += 1
+        logger.warning(f"회로 차단기 '{self.name}' 차단: {reason}, {self.open_seconds}초 후 재시도")
+
+    def _rates_locked(self):
+        total = len(self._calls)
+        if total == 0:
+            return 0.0, 0.0
+        failures = sum(1 for ok, _ in self._calls if not ok)
+        slow = sum(1 for _, is_slow in self._calls if is_slow)
+        return failures / total, slow / total
+
+    def _record_locked(self, ok: bool, latency: Optional[float]):
+        now = time.monotonic()
+        is_slow = latency is not None and latency >= self.slow_call_seconds
+        self.stats["successes" if ok else "failures"] += 1
+        if is_slow:
+            self.stats["slow_calls"] += 1
+
+        if self.state == HALF_OPEN:
+            self._half_open_in_flight = max(0, self._half_open_in_flight - 1)
+            if ok and not is_slow:
+                self.state = CLOSED
+                self._calls.clear()
+                logger.info(f"회로 차단기 '{self.name}' 복구: 시험 호출 성공")
+            else:
+                self._trip_locked(now, "시험 호출 실패")
+            return
+        if self.state == OPEN:
+            return
+
+        self._calls.append((ok, is_slow))
+        if len(self._calls) < self.min_calls:
+            return
+        failure_rate, slow_rate = self._rates_locked()
+        if failure_rate >= self.failure_rate_threshold:
+            self._trip_locked(now, f"오류율 {failure_rate:.0%}")
+        elif slow_rate >= self.slow_rate_threshold:
+            self._trip_locked(now, f"지연 호출 비율 {slow_rate:.0%}")
+
+    def record_success(self, latency: Optional[float] = None):
+        with self._lock:
+            self._record_locked(True, latency)
+
+    def record_failure(self, latency: Optional[float] = None):
+        with self._lock:
+            self._record_locked(False, latency)
+
+    def release(self):
+        # 결과 없이 중단된 시험 호출의 슬롯만 반환
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._half_open_in_flight = max(0, self._half_open_in_flight - 1)
+
+    def reset(self):
+        with self._lock:
+            self.state = CLOSED
+            self._calls.clear()
+            self._half_open_in_flight = 0
+            logger.info(f"회로 차단기 '{self.name}' 수동 초기화")
+
+    def get_state(self) -> Dict[str, Any]:
+        with self._lock:
+            now = time.monotonic()
+            self._refresh_locked(now)
+            failure_rate, slow_rate = self._rates_locked()
+            retry_in = max(0.0, self.open_seconds - (now - self._opened_at)) if self.state == OPEN else 0.0
+            return {
+                "name": self.name,
+                "state": self.state,
+                "window_calls": len(self._calls),
+                "failure_rate": round(failure_rate, 3),
+                "slow_rate": round(slow_rate, 3),
+                "retry_in_seconds": round(retry_in, 1),
+                "config": {
+                    "window_size": self.window_size,
+                    "min_calls": self.min_calls,
+                    "failure_rate_threshold": self.failure_rate_threshold,
+                    "slow_call_seconds": self.slow_call_seconds,
+                    "slow_rate_threshold": self.slow_rate_threshold,
+                    "open_seconds": self.open_seconds
+                },
+                **self.stats
+            }
+
+
+_llm_circuit_breaker: Optional[CircuitBreaker] = None
+_llm_circuit_breaker_lock = threading.Lock()
+
+
+def get_llm_circuit_breaker() -> CircuitBreaker:
+    global _llm_circuit_breaker
+    if _llm_circuit_breaker is None:
+        with _llm_circuit_breaker_lock:
+            if _llm_circuit_breaker is None:
+                _llm_circuit_breaker = CircuitBreaker(
+                    "llm",
+                    window_size=int(os.getenv("LLM_CB_WINDOW_SIZE", 20)),
+                    min_calls=int(os.getenv("LLM_CB_MIN_CALLS", 5)),
+                    failure_rate_threshold=float(os.getenv("LLM_CB_FAILURE_RATE", 0.5)),
+                    slow_call_seconds=float(os.getenv("LLM_CB_SLOW_CALL_SECONDS", 8)),
+                    slow_rate_threshold=float(os.getenv("LLM_CB_SLOW_RATE", 0.8)),
+                    open_seconds=float(os.getenv("LLM_CB_OPEN_SECONDS", 30))
+                )
+    return _llm_circuit_breaker
@@ -0,0 +1,195 @@
+from typing import Dict, Any, List, Optional, Callable
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger("embedding_cache")
+
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+
+MANIFEST_FILE = "manifest.json"
+VECTORS_FILE = "vectors.npy"
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _model_slug(model_id: str) -> str:
+    return re.sub(r"[^\w.-]+", "_", model_id).strip("_")
+
+
+def _atomic_write(path: Path, write: Callable):
+    # 읽는 쪽이 반쯤 쓰인 파일을 mmap하지 않도록 임시 파일에 쓴 뒤 교체
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+class TemplateEmbeddingCache:
+    # 템플릿 임베딩과 인덱스를 모델별 디렉터리에 저장, 내용 해시가 같으면 인코딩 없이 mmap으로 로드
+    def __init__(self, cache_dir, model_id: str):
+        self.model_id = model_id
+        self.directory = Path(cache_dir) / _model_slug(model_id)
+        self.stats: Dict[str, Any] = {}
+
+    def content_hash(self, texts: List[str]) -> str:
+        digest = hashlib.sha256(self.model_id.encode("utf-8"))
+        for text in texts:
+            digest.update(text_hash(text).encode("ascii"))
+        return digest.hexdigest()
+
+    def _read_manifest(self) -> Optional[Dict[str, Any]]:
+        path = self.directory / MANIFEST_FILE
+        if not path.exists():
+            return None
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"임베딩 캐시 매니페스트 읽기 실패: {str(e)}")
+            return None
+        if manifest.get("model_id") != self.model_id:
+            return None
+        return manifest
+
+    def _load_vectors(self, manifest: Dict[str, Any]) -> Optional[np.ndarray]:
+        path = self.directory / VECTORS_FILE
+        if not path.exists():
+            return None
+        try:
+            vectors = np.load(path, mmap_mode="r")
+        except (OSError, ValueError) as e:
+            logger.warning(f"임베딩 캐시 로드 실패: {str(e)}")
+            return None
+        if vectors.ndim != 2 or vectors.shape[0] != len(manifest.get("text_hashes", [])):
+            return None
+        return vectors
+
+    def _load_matching(self, texts: List[str]) -> Optional[np.ndarray]:
+        manifest = self._read_manifest()
+        if manifest is None or manifest.get("content_hash") != self.content_hash(texts):
+            return None
+        return self._load_vectors(manifest)
+
+    def load(self, texts: List[str]) -> Optional[np.ndarray]:
+        vectors = self._load_matching(texts)
+        if vectors is not None:
+            self.stats = {"cache_hit": True, "encoded": 0, "reused": len(texts)}
+            logger.info(f"템플릿 임베딩 캐시 사용: {len(texts)}개, 인코딩 생략")
+        return vectors
+
+    def build(self, texts: List[str], encode: Callable[[List[str]], Any]) -> np.ndarray:
+        start = time.time()
+        hashes = [text_hash(text) for text in texts]
+
+        # 이전 캐시에 같은 문장이 있으면 그 행을 재사용하고 바뀐 템플릿만 인코딩
+        previous: Dict[str, np.ndarray] = {}
+        manifest = self._read_manifest()
+        if manifest is not None:
+            old_vectors = self._load_vectors(manifest)
+            if old_vectors is not None:
+                for row, old_hash in enumerate(manifest["text_hashes"]):
+                    previous[old_hash] = old_vectors[row]
+
+        missing = [i for i, h in enumerate(hashes) if h not in previous]
+        encoded = {}
+        if missing:
+            new_vectors = np.asarray(encode([texts[i] for i in missing]), dtype="float32")
+            encoded = {i: new_vectors[row] for row, i in enumerate(missing)}
+
+        dimension = next(iter(encoded.values())).shape[0] if encoded else (
+            next(iter(previous.values())).shape[0] if previous else 0
+        )
+        vectors = np.empty((len(texts), dimension), dtype="float32")
+        for i, h in enumerate(hashes):
+            vectors[i] = encoded[i] if i in encoded else previous[h]
+
+        self._save(texts, hashes, vectors)
+        self.stats = {
+            "cache_hit": False,
+            "encoded": len(missing),
+            "reused": len(texts) - len(missing),
+            "seconds": round(time.time() - start, 3)
+        }
+        logger.info(
+            f"템플릿 임베딩 갱신: {len(missing)}개 인코딩, {len(texts) - len(missing)}개 재사용 "
+            f"({self.stats['seconds']}초)"
+        )
+        loaded = self._load_matching(texts)
+        return loaded if loaded is not None else vectors
+
+    def _save(self, texts: List[str], hashes: List[str], vectors: np.ndarray):
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+            def write_vectors(path: Path):
+                with path.open("wb") as f:
+                    np.save(f, np.ascontiguousarray(vectors, dtype="float32"))
+
+            def write_manifest(path: Path):
+                with path.open("w", encoding="utf-8") as f:
+                    json.dump({
+                        "model_id": self.model_id,
+                        "content_hash": self.content_hash(texts),
+                        "dimension": int(vectors.shape[1]) if vectors.ndim == 2 else 0,
+                        "text_hashes": hashes
+                    }, f, ensure_ascii=False, indent=2)
+
+            _atomic_write(self.directory / VECTORS_FILE, write_vectors)
+            _atomic_write(self.directory / MANIFEST_FILE, write_manifest)
+        except OSError as e:
+            logger.warning(f"임베딩 캐시 저장 실패: {str(e)}")
+
+    def index_key(self, texts: List[str], rows: List[int]) -> str:
+        # 인덱스의 위치는 rows 순서의 템플릿을 가리키므로, 문장이 같아도 타입 배정(rows)이 바뀌면 다른 키
+        digest = hashlib.sha256(self.content_hash(texts).encode("ascii"))
+        digest.update(",".join(str(row) for row in sorted(rows)).encode("ascii"))
+        return digest.hexdigest()
+
+    def _index_path(self, name: str, key: str) -> Path:
+        return self.directory / f"index_{name}_{key[:16]}.faiss"
+
+    def load_index(self, name: str, texts: List[str], rows: List[int]):
+        if not FAISS_AVAILABLE:
+            return None
+        path = self._index_path(name, self.index_key(texts, rows))
+        if not path.exists():
+            return None
+        try:
+            return faiss.read_index(str(path), faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+        except Exception:
+            try:
+                return faiss.read_index(str(path))
+            except Exception as e:
+                logger.warning(f"인덱스 로드 실패({path.name}): {str(e)}")
+                return None
+
+    def save_index(self, name: str, texts: List[str], rows: List[int], index):
+        if not FAISS_AVAILABLE:
+            return
+        path = self._index_path(name, self.index_key(texts, rows))
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            _atomic_write(path, lambda tmp_path: faiss.write_index(index, str(tmp_path)))
+            # 이전 키로 저장된 같은 이름의 인덱스만 정리 ("order"가 "order_complete"를 지우지 않도록 정확히 일치)
+            pattern = re.compile(rf"index_{re.escape(name)}_[0-9a-f]{{16}}\.faiss")
+            for old_path in self.directory.glob(f"index_{name}_*.faiss"):
+                if old_path != path and pattern.fullmatch(old_path.name):
+                    old_path.unlink()
+        except Exception as e:
+            logger.warning(f"인덱스 저장 실패({path.name}): {str(e)}")
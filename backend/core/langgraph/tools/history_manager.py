@@ -0,0 +1,138 @@
+from typing import Dict, Any, List, Optional
+import logging
+import os
+
+logger = logging.getLogger("history_manager")
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("o200k_base")
+except Exception:
+    _ENCODING = None
+
+ROLE_LABELS = {
+    "user": "사용자",
+    "assistant": "직원"
+}
+
+
+def estimate_tokens(text: str) -> int:
+    if not text:
+        return 0
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text))
+    # tiktoken이 없으면 한국어 기준 대략 2글자당 1토큰으로 추정
+    return max(1, len(text) // 2)
+
+
+def format_full_history(conversation_history: List[Dict[str, str]]) -> str:
+    conversation_summary = "이전 대화:\n"
+    for conv in conversation_history:
+        role = conv.get("role", "")
+        content = conv.get("content", "")
+        conversation_summary += f"{role}: {content}\n"
+    return f"대화 기록: {conversation_summary}"
+
+
+def format_full_order(current_order: Optional[Dict[str, Any]]) -> str:
+    if not current_order:
+        return ""
+    order_summary = "현재 주문 상태:\n"
+    for item in current_order.get("items", []):
+        item_name = item.get("name", "")
+        quantity = item.get("quantity", 1)
+        options = ", ".join(item.get("options", []))
+        missing_options = item.get("missing_required_options", [])
+        if missing_options:
+            missing_str = f" (누락된 필수 옵션: {', '.join(missing_options)})"
+        else:
+            missing_str = ""
+        order_summary += f"- {item_name} x {quantity} (옵션: {options}){missing_str}\n"
+    return f"현재 주문: {order_summary}"
+
+
+class ConversationHistoryManager:
+    def __init__(self, max_turns: int = 6, token_budget: int = 400, max_turn_chars: int = 200):
+        self.max_turns = max_turns
+        self.token_budget = token_budget
+        self.max_turn_chars = max_turn_chars
+
+    def _format_turn(self, conv: Dict[str, str]) -> str:
+        role = ROLE_LABELS.get(conv.get("role", ""), conv.get("role", ""))
+        content = (conv.get("content", "") or "").strip()
+        if len(content) > self.max_turn_chars:
+            content = content[:self.max_turn_chars] + "…"
+        return f"{role}: {content}"
+
+    def summarize_order(self, current_order: Optional[Dict[str, Any]]) -> str:
+        if not current_order or not current_order.get("items"):
+            return ""
+        parts = []
+        for item in current_order.get("items", []):
+            text = f"{item.get('name', '')}x{item.get('quantity', 1)}"
+            options = item.get("options", [])
+            if options:
+                text += f"[{','.join(options)}]"
+            missing_options = item.get("missing_required_options", [])
+            if missing_options:
+                text += f"(누락:{','.join(missing_options)})"
+            parts.append(text)
+        summary = "현재 주문: " + "; ".join(parts)
+        if current_order.get("total_price"):
+            summary += f" / 총 {current_order['total_price']}원"
+        if current_order.get("special_requests"):
+            summary += f" / 요청: {current_order['special_requests']}"
+        return summary
+
+    def build(
+        self,
+        conversation_history: List[Dict[str, str]],
+        current_order: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        conversation_history = conversation_history or []
+        order_summary = self.summarize_order(current_order)
+
+        window = [self._format_turn(conv) for conv in conversation_history[-self.max_turns:]]
+        budget = self.token_budget - estimate_tokens(order_summary)
+        while len(window) > 1 and estimate_tokens("\n".join(window)) > budget:
+            window.pop(0)
+
+        dropped_turns = len(conversation_history) - len(window)
+        history_text = ""
+        if window:
+            header = f"최근 대화 (이전 {dropped_turns}개 발화 생략):\n" if dropped_turns else "최근 대화:\n"
+            history_text = header + "\n".join(window)
+
+        full_tokens = estimate_tokens(format_full_history(conversation_history) if conversation_history else "")
+        full_tokens += estimate_tokens(format_full_order(current_order))
+        used_tokens = estimate_tokens(history_text) + estimate_tokens(order_summary)
+
+        stats = {
+            "total_turns": len(conversation_history),
+            "kept_turns": len(window),
+            "full_tokens": full_tokens,
+            "used_tokens": used_tokens,
+            "saved_tokens": max(0, full_tokens - used_tokens)
+        }
+        logger.info(
+            f"대화 기록 압축: {stats['kept_turns']}/{stats['total_turns']}개 발화 유지, "
+            f"{stats['full_tokens']} -> {stats['used_tokens']} 토큰 ({stats['saved_tokens']} 토큰 절약)"
+        )
+        return {
+            "history_text": history_text,
+            "order_summary": order_summary,
+            "stats": stats
+        }
+
+
+_history_manager: Optional[ConversationHistoryManager] = None
+
+
+def get_history_manager() -> ConversationHistoryManager:
+    global _history_manager
+    if _history_manager is None:
+        _history_manager = ConversationHistoryManager(
+            max_turns=int(os.getenv("LLM_HISTORY_MAX_TURNS", 6)),
+            token_budget=int(os.getenv("LLM_HISTORY_TOKEN_BUDGET", 400))
+        )
+    return _history_manager
@@ -5,11 +5,11 @@ import os
 from pathlib import Path
 import json
 import pickle
+import numpy as np
 
 logger = logging.getLogger("intent_classifier")
 
 try:
-    import numpy as np
     from sklearn.feature_extraction.text import TfidfVectorizer
     from sklearn.svm import SVC
     import joblib
@@ -18,6 +18,14 @@ except ImportError:
     logger.warning("scikit-learn 패키지를 찾을 수 없습니다. 규칙 기반 분류기만 사용합니다.")
     SKLEARN_AVAILABLE = False
 
+# tfidf(기본): 기존 TF-IDF + SVM 분류기 / embedding: 명시적으로 선택한 경우에만 임베딩 헤드 사용
+# 학습된 헤드 파일(ML/embedding_intent_training.py로 생성)은 저장소에 포함하지 않으며,
+# intent_classifier_benchmark로 TF-IDF보다 정확도/지연이 나은지 확인한 뒤 켜야 함
+INTENT_CLASSIFIER_BACKEND = os.getenv("INTENT_CLASSIFIER", "tfidf")
+EMBEDDING_HEAD_PATH = Path(__file__).parent.parent / 'data' / 'intent_embedding_head.npz'
+# 임베딩 헤드 사용 시 발화 임베딩과 메뉴 이름 임베딩의 코사인 유사도가 이 값 이상이면 메뉴가 언급된 것으로 봄
+MENU_EMBEDDING_THRESHOLD = float(os.getenv("INTENT_MENU_EMBEDDING_THRESHOLD", 0.6))
+
 INTENT_CLASSES = {
     "주문": "order",  
     "옵션_선택": "option_selection",  
@@ -29,10 +37,43 @@ INTENT_CLASSES = {
     "확인_요청": "confirmation_request"  
 }
 
+class EmbeddingIntentHead:
+    # 문장 임베딩 위의 선형 분류 헤드, 템플릿 검색과 같은 임베딩을 쓰므로 턴마다 forward pass는 한 번
+    def __init__(self, weights, bias, labels: List[str], model_id: str):
+        self.weights = np.asarray(weights, dtype='float32')
+        self.bias = np.asarray(bias, dtype='float32')
+        self.labels = list(labels)
+        self.model_id = model_id
+
+    @classmethod
+    def load(cls, path) -> Optional["EmbeddingIntentHead"]:
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                return cls(data["weights"], data["bias"], [str(label) for label in data["labels"]], str(data["model_id"]))
+        except Exception as e:
+            logger.error(f"임베딩 의도 분류 헤드 로드 중 오류 발생: {str(e)}")
+            return None
+
+    def predict_vector(self, vector) -> Dict[str, Any]:
+        logits = self.weights @ vector + self.bias
+        probabilities = np.exp(logits - logits.max())
+        probabilities /= probabilities.sum()
+        best = int(probabilities.argmax())
+        return {
+            "intent": self.labels[best],
+            "confidence": float(probabilities[best])
+        }
+
+
 class IntentClassifier:
-    def __init__(self, model_path: Optional[str] = None):
+    def __init__(self, model_path: Optional[str] = None, embedding_head_path: Optional[str] = None):
         self.vectorizer = None
         self.classifier = None
+        self.embedding_head = None
+        # (메뉴 스냅샷 버전, 메뉴 이름, 정규화된 이름 임베딩 행렬), 메뉴가 바뀔 때만 다시 인코딩
+        self._menu_embeddings: Optional[Tuple[int, List[str], np.ndarray]] = None
         self.intents = ["주문", "옵션_선택", "인사", "작별", "일상_대화"]
         self.rule_patterns = self._load_rule_patterns()
         
@@ -53,6 +94,9 @@ class IntentClassifier:
             else:
                 logger.info("기존 모델 파일을 찾을 수 없습니다. 규칙 기반 분류기만 사용합니다.")
         
+        if INTENT_CLASSIFIER_BACKEND == "embedding":
+            self._load_embedding_head(embedding_head_path or EMBEDDING_HEAD_PATH)
+        
     def _load_rule_patterns(self) -> Dict[str, List[str]]:
         return {
             "인사": [
@@ -220,11 +264,28 @@ class IntentClassifier:
             self.vectorizer = None
             self.classifier = None
     
+    def _load_embedding_head(self, head_path):
+        from .vector_store import embedding_model_id, SENTENCE_TRANSFORMERS_AVAILABLE
+        head = EmbeddingIntentHead.load(head_path) if SENTENCE_TRANSFORMERS_AVAILABLE else None
+        if head is None:
+            logger.warning("임베딩 의도 분류 헤드를 사용할 수 없습니다. TF-IDF 분류기를 사용합니다.")
+            return
+        # 다른 임베딩 모델로 학습한 헤드는 벡터 공간이 달라 쓸 수 없음
+        if head.model_id != embedding_model_id():
+            logger.warning(f"임베딩 의도 분류 헤드의 모델({head.model_id})이 현재 임베딩 모델과 달라 사용하지 않습니다.")
+            return
+        self.embedding_head = head
+        logger.info(f"임베딩 기반 의도 분류 헤드 로드 완료 (의도 {len(head.labels)}개)")
+    
     def predict(self, text: str) -> Dict[str, Any]:
-        rule_result = self._rule_based_predict(text)
+        # 임베딩 헤드를 쓰면 발화 임베딩을 한 번만 만들어 메뉴 언급 확인과 의도 분류에 함께 사용
+        vector = self._utterance_vector(text) if self.embedding_head is not None else None
+        rule_result = self._rule_based_predict(text, vector)
         
         ml_result = None
-        if SKLEARN_AVAILABLE and self.vectorizer and self.classifier:
+        if vector is not None:
+            ml_result = self.embedding_head.predict_vector(vector)
+        if ml_result is None and SKLEARN_AVAILABLE and self.vectorizer and self.classifier:
             ml_result = self._ml_based_predict(text)
             
         if ml_result is None:
@@ -238,7 +299,7 @@ class IntentClassifier:
             
         return rule_result
     
-    def _rule_based_predict(self, text: str) -> Dict[str, Any]:
+    def _rule_based_predict(self, text: str, vector=None) -> Dict[str, Any]:
         max_confidence = 0.0
         max_intent = "일상_대화"  
         
@@ -254,16 +315,9 @@ class IntentClassifier:
                         max_confidence = confidence
                         max_intent = intent
         
-        if max_intent == "주문" or max_intent == "일상_대화":
-            from .menu_tools import get_menu_info
-            words = re.findall(r'\w+', text)
-            for word in words:
-                if len(word) >= 2:  
-                    menu_info = get_menu_info(word)
-                    if menu_info.get("status") == "success":
-                        max_intent = "주문"
-                        max_confidence = max(max_confidence, 0.85)
-                        break
+        if (max_intent == "주문" or max_intent == "일상_대화") and self._mentions_menu(text, vector):
+            max_intent = "주문"
+            max_confidence = max(max_confidence, 0.85)
         return {
             "intent": max_intent,
             "confidence": max_confidence
@@ -285,3 +339,46 @@ class IntentClassifier:
         except Exception as e:
             logger.error(f"기계학습 예측 중 오류 발생: {str(e)}")
             return None
+    
+    def _utterance_vector(self, text: str):
+        try:
+            from .vector_store import get_embedding_service
+            # 원문 그대로 인코딩해 EmbeddingService에 메모, 같은 턴의 템플릿 검색과 응답 캐시 조회가 이 벡터를 재사용
+            return get_embedding_service().encode_one(text, normalize=True)
+        except Exception as e:
+            logger.error(f"임베딩 기반 예측 중 오류 발생: {str(e)}")
+            return None
+    
+    def _mentions_menu(self, text: str, vector=None) -> bool:
+        if vector is not None:
+            match = self._match_menu_embedding(vector)
+            if match is not None:
+                # 메뉴 이름이 그대로 들어 있으면 임베딩 점수와 관계없이 메뉴 언급으로 봄
+                return match[1] >= MENU_EMBEDDING_THRESHOLD or any(name in text for name in self._menu_embeddings[1])
+        # 임베딩이 없으면 단어마다 메뉴 스냅샷/검색 색인에서 찾음
+        from .menu_tools import get_menu_info
+        for word in re.findall(r'\w+', text):
+            if len(word) >= 2 and get_menu_info(word).get("status") == "success":
+                return True
+        return False
+    
+    def _match_menu_embedding(self, vector) -> Optional[Tuple[str, float]]:
+        # 발화 임베딩과 가장 가까운 메뉴 이름과 코사인 유사도
+        try:
+            from ...menu_snapshot import get_menu_snapshot
+            from .vector_store import get_embedding_service
+            snapshot = get_menu_snapshot()
+            cached = self._menu_embeddings
+            if cached is None or cached[0] != snapshot.version:
+                names = [menu["name"] for menu in snapshot.items]
+                cached = (snapshot.version, names, get_embedding_service().encode(names, normalize=True))
+                self._menu_embeddings = cached
+            _, names, matrix = cached
+            if not names:
+                return None
+            scores = matrix @ vector
+            best = int(scores.argmax())
+            return names[best], float(scores[best])
+        except Exception as e:
+            logger.error(f"임베딩 기반 메뉴 매칭 중 오류 발생: {str(e)}")
+            return None
@@ -0,0 +1,370 @@
+from typing import Dict, Any, List, Optional, Iterator
+from abc import ABC, abstractmethod
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from .response_cache import normalize_text
+from .circuit_breaker import CircuitBreaker, get_llm_circuit_breaker
+
+logger = logging.getLogger("llm_backends")
+
+
+class LLMBackendError(Exception):
+    pass
+
+
+class CircuitOpenError(LLMBackendError):
+    pass
+
+
+def _last_user_input(messages) -> str:
+    for message in reversed(messages):
+        if getattr(message, "type", "") == "human":
+            return message.content
+    return ""
+
+
+class LLMBackend(ABC):
+    name = "base"
+
+    def __init__(self, name: str, timeout: float, supports_structured_output: bool = True):
+        self.name = name
+        self.timeout = timeout
+        self.supports_structured_output = supports_structured_output
+
+    @abstractmethod
+    def invoke(self, messages, response_format: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None) -> str:
+        pass
+
+    def stream(self, messages, response_format: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None) -> Iterator[str]:
+        yield self.invoke(messages, response_format=response_format, timeout=timeout)
+
+
+class OpenAICompatibleBackend(LLMBackend):
+    # OpenAI API와 로컬 OpenAI 호환 서버(vLLM, llama.cpp server 등)를 같은 방식으로 호출
+    def __init__(
+        self,
+        name: str,
+        model: str,
+        api_key: str,
+        base_url: Optional[str] = None,
+        timeout: float = 15.0,
+        supports_structured_output: bool = True
+    ):
+        super().__init__(name, timeout, supports_structured_output)
+        from langchain.chat_models import ChatOpenAI
+
+        llm_kwargs = {
+            "model": model,
+            "temperature": 0.0,
+            "openai_api_key": api_key,
+            "request_timeout": timeout,
+            "max_retries": 0
+        }
+        if base_url:
+            llm_kwargs["openai_api_base"] = base_url
+        self.model = model
+        self.llm = ChatOpenAI(**llm_kwargs)
+
+    def _bound(self, response_format: Optional[Dict[str, Any]], timeout: Optional[float]):
+        kwargs = {"timeout": min(self.timeout, timeout) if timeout is not None else self.timeout}
+        if response_format and self.supports_structured_output:
+            kwargs["response_format"] = response_format
+        return self.llm.bind(**kwargs)
+
+    def invoke(self, messages, response_format=None, timeout=None) -> str:
+        return self._bound(response_format, timeout).invoke(messages).content
+
+    def stream(self, messages, response_format=None, timeout=None) -> Iterator[str]:
+        for chunk in self._bound(response_format, timeout).stream(messages):
+            if chunk.content:
+                yield chunk.content
+
+
+class RecordedBackend(LLMBackend):
+    # 테스트와 부하 측정용: 기록된 응답을 입력 문장으로 찾아 재생
+    def __init__(self, path: str, latency_scale: float = 0.0, default_response: Optional[str] = None):
+        super().__init__("recorded", timeout=60.0, supports_structured_output=True)
+        self.path = Path(path)
+        self.latency_scale = latency_scale
+        self.default_response = default_response
+        self.records: Dict[str, Dict[str, Any]] = {}
+        if self.path.exists():
+            with self.path.open("r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    record = json.loads(line)
+                    self.records[normalize_text(record["input"])] = record
+        logger.info(f"기록된 LLM 응답 {len(self.records)}개 로드: {self.path}")
+
+    def _lookup(self, messages) -> Dict[str, Any]:
+        record = self.records.get(normalize_text(_last_user_input(messages)))
+        if record is None:
+            if self.default_response is None:
+                raise LLMBackendError("기록된 응답이 없는 입력입니다.")
+            record = {"response": self.default_response, "latency_ms": 0}
+        return record
+
+    def _response_text(self, record: Dict[str, Any]) -> str:
+        response = record["response"]
+        return response if isinstance(response, str) else json.dumps(response, ensure_ascii=False)
+
+    def invoke(self, messages, response_format=None, timeout=None) -> str:
+        record = self._lookup(messages)
+        delay = record.get("latency_ms", 0) / 1000 * self.latency_scale
+        if timeout is not None and delay > timeout:
+            time.sleep(timeout)
+            raise TimeoutError("기록된 응답 지연이 제한 시간을 초과했습니다.")
+        time.sleep(delay)
+        return self._response_text(record)
+
+    def stream(self, messages, response_format=None, timeout=None) -> Iterator[str]:
+        record = self._lookup(messages)
+        text = self._response_text(record)
+        chunk_size = 8
+        chunks = [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)] or [""]
+        delay = record.get("latency_ms", 0) / 1000 * self.latency_scale / len(chunks)
+        for chunk in chunks:
+            time.sleep(delay)
+            yield chunk
+
+
+class BackendStats:
+    def __init__(self, alpha: float = 0.3):
+        self.alpha = alpha
+        self.latency_ewma: Optional[float] = None
+        self.calls = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.last_failure_at = 0.0
+
+    def record_success(self, latency: float):
+        self.calls += 1
+        self.consecutive_failures = 0
+        if self.latency_ewma is None:
+            self.latency_ewma = latency
+        else:
+            self.latency_ewma = self.alpha * latency + (1 - self.alpha) * self.latency_ewma
+
+    def record_failure(self):
+        self.calls += 1
+        self.failures += 1
+        self.consecutive_failures += 1
+        self.last_failure_at = time.monotonic()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "latency_ewma_ms": round(self.latency_ewma * 1000, 1) if self.latency_ewma is not None else None,
+            "calls": self.calls,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures
+        }
+
+
+class LLMRouter:
+    def __init__(
+        self,
+        backends: List[LLMBackend],
+        failure_cooldown: float = 30.0,
+        record_path: Optional[str] = None,
+        breaker: Optional[CircuitBreaker] = None
+    ):
+        if not backends:
+            raise ValueError("LLM 백엔드가 하나 이상 필요합니다.")
+        self.backends = backends
+        self.breaker = breaker
+        self.failure_cooldown = failure_cooldown
+        self.record_path = Path(record_path) if record_path else None
+        self.stats: Dict[str, BackendStats] = {backend.name: BackendStats() for backend in backends}
+        self._lock = threading.Lock()
+
+    def _ordered_backends(self) -> List[LLMBackend]:
+        now = time.monotonic()
+
+        def sort_key(item):
+            position, backend = item
+            stats = self.stats[backend.name]
+            cooling_down = stats.consecutive_failures > 0 and now - stats.last_failure_at < self.failure_cooldown
+            # 측정값이 없는 백엔드는 설정 순서대로 먼저 시도해 지연 시간을 수집
+            latency = stats.latency_ewma if stats.latency_ewma is not None else -1.0
+            return (cooling_down, latency, position)
+
+        return [backend for _, backend in sorted(enumerate(self.backends), key=sort_key)]
+
+    def _record(self, messages, response: str, latency: float):
+        if self.record_path is None:
+            return
+        record = {"input": _last_user_input(messages), "response": response, "latency_ms": round(latency * 1000)}
+        with self._lock:
+            with self.record_path.open("a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def _effective_timeout(self, backend: LLMBackend, deadline: Optional[float]) -> Optional[float]:
+        if deadline is None:
+            return backend.timeout
+        return max(0.0, min(backend.timeout, deadline - time.monotonic()))
+
+    def _check_breaker(self):
+        if self.breaker is not None and not self.breaker.allow_request():
+            raise CircuitOpenError("LLM 회로 차단기가 열려 있어 호출을 생략합니다.")
+
+    def invoke(self, messages, response_format: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None) -> str:
+        self._check_breaker()
+        start = time.monotonic()
+        try:
+            content = self._invoke_backends(messages, response_format, timeout)
+        except Exception:
+            if self.breaker is not None:
+                self.breaker.record_failure(time.monotonic() - start)
+            raise
+        if self.breaker is not None:
+            self.breaker.record_success(time.monotonic() - start)
+        return content
+
+    def stream(self, messages, response_format: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None) -> Iterator[str]:
+        self._check_breaker()
+        start = time.monotonic()
+        recorded = False
+        try:
+            for chunk in self._stream_backends(messages, response_format, timeout):
+                yield chunk
+            recorded = True
+            if self.breaker is not None:
+                self.breaker.record_success(time.monotonic() - start)
+        except GeneratorExit:
+            raise
+        except Exception:
+            recorded = True
+            if self.breaker is not None:
+                self.breaker.record_failure(time.monotonic() - start)
+            raise
+        finally:
+            # 호출 측이 스트림을 중간에 버린 경우 결과로 세지 않음
+            if not recorded and self.breaker is not None:
+                self.breaker.release()
+
+    def _invoke_backends(self, messages, response_format: Optional[Dict[str, Any]], timeout: Optional[float]) -> str:
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        last_error: Optional[Exception] = None
+        for backend in self._ordered_backends():
+            backend_timeout = self._effective_timeout(backend, deadline)
+            if backend_timeout is not None and backend_timeout <= 0:
+                break
+            start = time.monotonic()
+            try:
+                content = backend.invoke(messages, response_format=response_format, timeout=backend_timeout)
+            except Exception as e:
+                self.stats[backend.name].record_failure()
+                logger.warning(f"LLM 백엔드 '{backend.name}' 호출 실패: {str(e)}")
+                last_error = e
+                continue
+            latency = time.monotonic() - start
+            self.stats[backend.name].record_success(latency)
+            logger.info(f"LLM 백엔드 '{backend.name}' 응답 ({latency:.2f}초)")
+            self._record(messages, content, latency)
+            return content
+        raise LLMBackendError(f"사용 가능한 LLM 백엔드가 없습니다: {last_error}")
+
+    def _stream_backends(self, messages, response_format: Optional[Dict[str, Any]], timeout: Optional[float]) -> Iterator[str]:
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        last_error: Optional[Exception] = None
+        for backend in self._ordered_backends():
+            backend_timeout = self._effective_timeout(backend, deadline)
+            if backend_timeout is not None and backend_timeout <= 0:
+                break
+            start = time.monotonic()
+            chunks = []
+            try:
+                for chunk in backend.stream(messages, response_format=response_format, timeout=backend_timeout):
+                    chunks.append(chunk)
+                    yield chunk
+            except Exception as e:
+                self.stats[backend.name].record_failure()
+                logger.warning(f"LLM 백엔드 '{backend.name}' 스트리밍 실패: {str(e)}")
+                last_error = e
+                # 이미 일부를 내보냈다면 다른 백엔드로 이어 붙일 수 없음, 호출 측이 기본 응답으로 처리하도록 LLMBackendError로 알림
+                if chunks:
+                    raise LLMBackendError(f"LLM 백엔드 '{backend.name}' 스트리밍 중단: {e}") from e
+                continue
+            latency = time.monotonic() - start
+            self.stats[backend.name].record_success(latency)
+            self._record(messages, "".join(chunks), latency)
+            return
+        raise LLMBackendError(f"사용 가능한 LLM 백엔드가 없습니다: {last_error}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            backend.name: {
+                **self.stats[backend.name].to_dict(),
+                "timeout": backend.timeout,
+                "supports_structured_output": backend.supports_structured_output
+            }
+            for backend in self.backends
+        }
+
+
+def _env_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).lower() not in ("0", "false", "no")
+
+
+def create_backend(name: str) -> LLMBackend:
+    if name == "openai":
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            logger.error("OPENAI_API_KEY env var 설정 X")
+            raise ValueError("OPENAI_API_KEY env var 설정 X")
+        return OpenAICompatibleBackend(
+            name="openai",
+            model=os.getenv("OPENAI_MODEL", "gpt-4o"),
+            api_key=api_key,
+            timeout=float(os.getenv("OPENAI_TIMEOUT", 15)),
+            supports_structured_output=_env_flag("OPENAI_STRUCTURED_OUTPUT", "1")
+        )
+    if name == "local":
+        base_url = os.getenv("LOCAL_LLM_BASE_URL")
+        if not base_url:
+            raise ValueError("LOCAL_LLM_BASE_URL env var 설정 X")
+        return OpenAICompatibleBackend(
+            name="local",
+            model=os.getenv("LOCAL_LLM_MODEL", "local-model"),
+            api_key=os.getenv("LOCAL_LLM_API_KEY", "not-needed"),
+            base_url=base_url,
+            timeout=float(os.getenv("LOCAL_LLM_TIMEOUT", 5)),
+            supports_structured_output=_env_flag("LOCAL_LLM_STRUCTURED_OUTPUT", "1")
+        )
+    if name == "recorded":
+        return RecordedBackend(
+            path=os.getenv("LLM_RECORDED_PATH", "data/llm_recordings.jsonl"),
+            latency_scale=float(os.getenv("LLM_RECORDED_LATENCY_SCALE", 0)),
+            default_response=os.getenv("LLM_RECORDED_DEFAULT_RESPONSE")
+        )
+    raise ValueError(f"알 수 없는 LLM 백엔드: {name}")
+
+
+def configured_backend_names() -> List[str]:
+    return [name.strip() for name in os.getenv("LLM_BACKENDS", "openai").split(",") if name.strip()]
+
+
+_llm_router: Optional[LLMRouter] = None
+_llm_router_lock = threading.Lock()
+
+
+def get_llm_router() -> LLMRouter:
+    global _llm_router
+    if _llm_router is None:
+        with _llm_router_lock:
+            if _llm_router is None:
+                backends = [create_backend(name) for name in configured_backend_names()]
+                _llm_router = LLMRouter(
+                    backends,
+                    failure_cooldown=float(os.getenv("LLM_FAILURE_COOLDOWN", 30)),
+                    record_path=os.getenv("LLM_RECORD_PATH"),
+                    breaker=get_llm_circuit_breaker()
+                )
+                logger.info(f"LLM 백엔드 구성: {[backend.name for backend in backends]}")
+    return _llm_router
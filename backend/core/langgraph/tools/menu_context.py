@@ -0,0 +1,224 @@
+from typing import Dict, Any, List, Optional, Set
+import hashlib
+import logging
+import os
+import threading
+from .option_index import MenuOptionEntry, get_option_index
+from .history_manager import estimate_tokens
+from .response_cache import normalize_text
+
+logger = logging.getLogger("menu_context")
+
+MENU_UNAVAILABLE_TEXT = "메뉴 정보를 가져오지 못했습니다."
+
+
+def _compact(text: str) -> str:
+    return "".join(normalize_text(text).split())
+
+
+def _ngrams(text: str) -> Set[str]:
+    # 한국어 메뉴명은 띄어쓰기가 일정하지 않아 공백을 제거한 글자 bigram으로 비교
+    if len(text) < 2:
+        return {text} if text else set()
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def _format_option_group(option_category: str, options: Dict[str, int]) -> str:
+    option_texts = []
+    for name, adjustment in options.items():
+        price_text = f"({'+' if adjustment > 0 else ''}{adjustment}원)" if adjustment != 0 else ""
+        option_texts.append(f"{name}{price_text}")
+    return f"    {option_category}: " + ", ".join(option_texts) + "\n"
+
+
+def format_menu_entry(entry: MenuOptionEntry) -> str:
+    text = f"- {entry.name}: {entry.base_price}원\n"
+    if entry.required_options:
+        text += "  필수 옵션:\n"
+        for option_category, options in entry.required_options.items():
+            text += _format_option_group(option_category, options)
+    if entry.optional_options:
+        text += "  선택 옵션:\n"
+        for option_category, options in entry.optional_options.items():
+            text += _format_option_group(option_category, options)
+    return text
+
+
+def format_menu(entries: List[MenuOptionEntry]) -> str:
+    menu_info = "메뉴 정보:\n"
+    current_category = None
+    for entry in entries:
+        if entry.category != current_category:
+            current_category = entry.category
+            menu_info += f"\n## {current_category}\n"
+        menu_info += format_menu_entry(entry)
+    return menu_info
+
+
+class MenuContextIndex:
+    # 발화와 현재 주문에 관련된 메뉴만 골라 프롬프트에 넣기 위한 어휘 색인
+    def __init__(self, option_index, max_items: int = 15, min_score: float = 0.5):
+        self.option_index = option_index
+        self.max_items = max_items
+        self.min_score = min_score
+        self.entries: List[MenuOptionEntry] = list(option_index.entries.values())
+        self._positions: Dict[str, int] = {entry.name: i for i, entry in enumerate(self.entries)}
+        self._compact_names: Dict[str, str] = {entry.name: _compact(entry.name) for entry in self.entries}
+        self._name_ngrams: Dict[str, Set[str]] = {
+            name: _ngrams(compact) for name, compact in self._compact_names.items()
+        }
+        self._postings: Dict[str, Set[str]] = {}
+        for name, grams in self._name_ngrams.items():
+            for gram in grams:
+                self._postings.setdefault(gram, set()).add(name)
+        self._categories: Dict[str, List[str]] = {}
+        for entry in self.entries:
+            self._categories.setdefault(_compact(entry.category), []).append(entry.name)
+
+        self.full_text = format_menu(self.entries)
+        self.full_tokens = estimate_tokens(self.full_text)
+        self.fingerprint = hashlib.sha256(self.full_text.encode("utf-8")).hexdigest()
+        logger.info(f"메뉴 컨텍스트 색인 생성 완료: {len(self.entries)}개 메뉴, 전체 {self.full_tokens} 토큰")
+
+    def _score(self, query: str) -> Dict[str, float]:
+        compact_query = _compact(query)
+        words = [word for word in normalize_text(query).split() if len(word) >= 2]
+        query_grams = _ngrams(compact_query)
+
+        matched: Dict[str, int] = {}
+        for gram in query_grams:
+            for name in self._postings.get(gram, ()):
+                matched[name] = matched.get(name, 0) + 1
+
+        scores = {}
+        for name, count in matched.items():
+            score = count / len(self._name_ngrams[name])
+            # "라떼"처럼 메뉴명 일부만 말한 경우도 후보로 포함
+            if any(word in self._compact_names[name] for word in words):
+                score += 1.0
+            if score >= self.min_score:
+                scores[name] = score
+
+        # "커피 뭐 있어요?"처럼 카테고리를 말하면 해당 카테고리 메뉴를 모두 후보로 포함
+        for category, names in self._categories.items():
+            if category and (category in words or (len(category) >= 2 and category in compact_query)):
+                for name in names:
+                    scores[name] = max(scores.get(name, 0.0), self.min_score)
+        return scores
+
+    def select(
+        self,
+        text: str,
+        current_order: Optional[Dict[str, Any]] = None,
+        pending_clarifications: Optional[List[str]] = None
+    ) -> List[MenuOptionEntry]:
+        # 현재 주문에 있는 메뉴는 옵션 확인에 필요하므로 항상 포함
+        pinned = []
+        for item in (current_order or {}).get("items", []):
+            entry = self.option_index.lookup(item.get("name", ""))
+            if entry is not None and entry.name not in pinned:
+                pinned.append(entry.name)
+
+        scores = self._score(" ".join([text or ""] + list(pending_clarifications or [])))
+        ranked = sorted(
+            (name for name in scores if name not in pinned),
+            key=lambda name: (-scores[name], self._positions[name])
+        )
+        # 명확화 질문에 답하는 중이면 현재 주문 메뉴만으로 충분, 그 외에는 일치하는 메뉴가 있어야 함
+        if not scores and not (pinned and pending_clarifications):
+            return []
+        selected = pinned + ranked[:max(0, self.max_items - len(pinned))]
+        return [self.entries[position] for position in sorted(self._positions[name] for name in selected)]
+
+    def build(
+        self,
+        text: str,
+        current_order: Optional[Dict[str, Any]] = None,
+        pending_clarifications: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        selected = self.select(text, current_order, pending_clarifications)
+        # 발화에서 메뉴를 찾지 못하면 전체 메뉴를 그대로 사용 (누락 없는 대체 경로)
+        fallback = not selected or len(selected) >= len(self.entries)
+        if fallback:
+            menu_text = self.full_text
+        else:
+            menu_text = format_menu(selected)
+            menu_text += (
+                f"\n(발화와 관련된 메뉴 {len(selected)}개만 표시, 전체 {len(self.entries)}개. "
+                "목록에 없는 메뉴를 말하면 메뉴명을 다시 확인하라.)\n"
+            )
+
+        used_tokens = estimate_tokens(menu_text)
+        stats = {
+            "total_items": len(self.entries),
+            "included_items": len(self.entries) if fallback else len(selected),
+            "fallback": fallback,
+            "full_tokens": self.full_tokens,
+            "used_tokens": used_tokens,
+            "saved_tokens": max(0, self.full_tokens - used_tokens)
+        }
+        logger.info(
+            f"메뉴 컨텍스트: {stats['included_items']}/{stats['total_items']}개 메뉴"
+            f"{' (전체 메뉴 사용)' if fallback else ''}, "
+            f"{stats['full_tokens']} -> {stats['used_tokens']} 토큰"
+        )
+        return {"menu_text": menu_text, "fingerprint": self.fingerprint, "stats": stats}
+
+
+class MenuContextBuilder:
+    def __init__(self, option_index_provider=get_option_index, scoped: bool = True, max_items: int = 15, min_score: float = 0.5):
+        self._option_index_provider = option_index_provider
+        self.scoped = scoped
+        self.max_items = max_items
+        self.min_score = min_score
+        self._index: Optional[MenuContextIndex] = None
+        self._lock = threading.Lock()
+
+    def _current_index(self) -> MenuContextIndex:
+        option_index = self._option_index_provider()
+        index = self._index
+        if index is None or index.option_index is not option_index:
+            # 메뉴가 바뀌면 옵션 인덱스 객체도 새로 만들어지므로 색인을 다시 만듦
+            with self._lock:
+                if self._index is None or self._index.option_index is not option_index:
+                    self._index = MenuContextIndex(option_index, self.max_items, self.min_score)
+                index = self._index
+        return index
+
+    def build(
+        self,
+        text: str,
+        current_order: Optional[Dict[str, Any]] = None,
+        pending_clarifications: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        try:
+            index = self._current_index()
+        except Exception as e:
+            logger.warning(f"메뉴 컨텍스트 생성 실패: {str(e)}")
+            return {"menu_text": MENU_UNAVAILABLE_TEXT, "fingerprint": "", "stats": {}}
+
+        if not self.scoped:
+            stats = {
+                "total_items": len(index.entries),
+                "included_items": len(index.entries),
+                "fallback": True,
+                "full_tokens": index.full_tokens,
+                "used_tokens": index.full_tokens,
+                "saved_tokens": 0
+            }
+            return {"menu_text": index.full_text, "fingerprint": index.fingerprint, "stats": stats}
+        return index.build(text, current_order, pending_clarifications)
+
+
+_menu_context_builder: Optional[MenuContextBuilder] = None
+
+
+def get_menu_context_builder() -> MenuContextBuilder:
+    global _menu_context_builder
+    if _menu_context_builder is None:
+        _menu_context_builder = MenuContextBuilder(
+            scoped=os.getenv("LLM_MENU_CONTEXT", "scoped") != "full",
+            max_items=int(os.getenv("LLM_MENU_CONTEXT_MAX_ITEMS", 15)),
+            min_score=float(os.getenv("LLM_MENU_CONTEXT_MIN_SCORE", 0.5))
+        )
+    return _menu_context_builder
@@ -1,6 +1,6 @@
 from typing import Dict, List, Any, Optional
 import logging
-from ...db import get_menu_categories, get_menu_by_id, get_menu_by_name
+from ...menu_snapshot import get_menu_snapshot
 
 logger = logging.getLogger("menu_tools")
 
@@ -11,24 +11,11 @@ def get_menu_info(menu_name: str = None) -> Dict[str, Any]:
         if not menu_name:
             return {"status": "error", "message": "메뉴 이름이 필요합니다."}
         
-        menu = get_menu_by_name(menu_name)
+        # 스냅샷에서 이름/별칭 정확히 일치를 먼저 찾고, 없으면 검색 색인 순위로 부분 일치를 찾음
+        menu = get_menu_snapshot().find(menu_name)
         
         if not menu:
-            all_menus = []
-            categories = get_menu_categories()
-            for category in categories:
-                all_menus.extend(category["items"])
-            
-            matched_menus = []
-            for item in all_menus:
-                if menu_name.lower() in item["name"].lower():
-                    matched_menus.append(item)
-            
-            if matched_menus:
-                menu = min(matched_menus, key=lambda x: len(x["name"]))
-                logger.info(f"부분 일치 메뉴 발견: {menu['name']}")
-            else:
-                return {"status": "error", "message": f"'{menu_name}' 메뉴를 찾을 수 없습니다."}
+            return {"status": "error", "message": f"'{menu_name}' 메뉴를 찾을 수 없습니다."}
         
         logger.info(f"메뉴 정보 조회 결과: {menu}")
         return {"status": "success", "menu": menu}
@@ -41,7 +28,7 @@ def get_all_menus() -> Dict[str, Any]:
     try:
         logger.info("전체 메뉴 목록 조회")
         
-        categories = get_menu_categories()
+        categories = get_menu_snapshot().categories
         logger.info(f"메뉴 카테고리 {len(categories)}개 조회 완료")
         
         return {"status": "success", "categories": categories}
@@ -0,0 +1,138 @@
+from typing import Dict, Any, List, Optional
+import logging
+import threading
+from ...menu_snapshot import get_menu_snapshot, get_menu_snapshot_store
+
+logger = logging.getLogger("option_index")
+
+
+class MenuOptionEntry:
+    __slots__ = ("id", "name", "category", "base_price", "required_options", "optional_options", "_option_prices")
+
+    def __init__(self, item, category_name: str):
+        self.id = item.id
+        self.name = item.name
+        self.category = category_name
+        self.base_price = item.base_price
+        # 옵션 카테고리 -> {옵션명: 가격 조정}
+        self.required_options: Dict[str, Dict[str, int]] = {
+            option_category: {opt.name: opt.price_adjustment for opt in options}
+            for option_category, options in (item.required_options or {}).items()
+        }
+        self.optional_options: Dict[str, Dict[str, int]] = {
+            option_category: {opt.name: opt.price_adjustment for opt in options}
+            for option_category, options in (item.optional_options or {}).items()
+        }
+        self._option_prices: Dict[str, int] = {}
+        for groups in (self.required_options, self.optional_options):
+            for options in groups.values():
+                self._option_prices.update(options)
+
+    def missing_required_options(self, selected_options: List[str]) -> List[str]:
+        selected = set(selected_options or [])
+        return [
+            option_category
+            for option_category, options in self.required_options.items()
+            if selected.isdisjoint(options)
+        ]
+
+    def option_price(self, option_name: str) -> Optional[int]:
+        return self._option_prices.get(option_name)
+
+    def to_menu_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "category": self.category,
+            "base_price": self.base_price,
+            "required_options": {
+                option_category: [{"name": name, "price_adjustment": adj} for name, adj in options.items()]
+                for option_category, options in self.required_options.items()
+            },
+            "optional_options": {
+                option_category: [{"name": name, "price_adjustment": adj} for name, adj in options.items()]
+                for option_category, options in self.optional_options.items()
+            }
+        }
+
+
+def _compact(name: str) -> str:
+    return "".join(name.lower().split())
+
+
+class MenuOptionIndex:
+    def __init__(self, categories):
+        self.entries: Dict[str, MenuOptionEntry] = {}
+        self._compact_names: Dict[str, str] = {}
+        for category in categories:
+            for item in category.items:
+                entry = MenuOptionEntry(item, category.name)
+                self.entries[entry.name] = entry
+                self._compact_names[_compact(entry.name)] = entry.name
+        logger.info(f"메뉴 옵션 인덱스 생성 완료: {len(self.entries)}개 메뉴")
+
+    @classmethod
+    def from_db(cls) -> "MenuOptionIndex":
+        return cls(get_menu_snapshot().categories)
+
+    def lookup(self, menu_name: str) -> Optional[MenuOptionEntry]:
+        if not menu_name:
+            return None
+        entry = self.entries.get(menu_name)
+        if entry is not None:
+            return entry
+
+        query = _compact(menu_name)
+        if not query:
+            return None
+        exact = self._compact_names.get(query)
+        if exact is not None:
+            return self.entries[exact]
+
+        # 부분 일치는 가장 짧은 이름을 우선해 항상 같은 결과를 돌려줌
+        matches = [name for compact, name in self._compact_names.items() if query in compact]
+        if matches:
+            return self.entries[min(matches, key=lambda name: (len(name), name))]
+        return None
+
+    def missing_required_options(self, menu_name: str, selected_options: List[str]) -> Optional[List[str]]:
+        entry = self.lookup(menu_name)
+        if entry is None:
+            return None
+        return entry.missing_required_options(selected_options)
+
+    def resolve_missing_options(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        for item in items:
+            if "name" not in item:
+                continue
+            entry = self.lookup(item["name"])
+            if entry is None:
+                continue
+            item["missing_required_options"] = entry.missing_required_options(item.get("options", []))
+            logger.info(f"메뉴 '{item['name']}'의 누락된 필수 옵션: {item['missing_required_options']}")
+        return items
+
+
+_option_index: Optional[MenuOptionIndex] = None
+_option_index_lock = threading.Lock()
+
+
+def get_option_index() -> MenuOptionIndex:
+    global _option_index
+    index = _option_index
+    if index is None:
+        with _option_index_lock:
+            if _option_index is None:
+                _option_index = MenuOptionIndex.from_db()
+            index = _option_index
+    return index
+
+
+def invalidate_option_index():
+    global _option_index
+    with _option_index_lock:
+        _option_index = None
+
+
+# 메뉴 스냅샷이 바뀌면 옵션 인덱스를 버림, 메뉴 컨텍스트 색인은 새 옵션 인덱스 객체를 보고 다시 만들어짐
+get_menu_snapshot_store().add_listener(lambda snapshot: invalidate_option_index())
@@ -0,0 +1,94 @@
+from typing import Dict, Any, List, Optional, Tuple
+import logging
+import threading
+from .option_index import get_option_index
+
+logger = logging.getLogger("pricing")
+
+
+class PricingEngine:
+    # 메뉴 기본가 + 옵션 가격 조정으로 가격을 계산, LLM이 준 가격은 신뢰하지 않음
+    def __init__(self, option_index_provider=get_option_index, max_cache_size: int = 4096):
+        self._option_index_provider = option_index_provider
+        self._max_cache_size = max_cache_size
+        self._unit_prices: Dict[Tuple[str, Tuple[str, ...]], Tuple[Optional[int], Tuple[str, ...]]] = {}
+        self._option_index = None
+        self._lock = threading.Lock()
+
+    def _current_index(self):
+        option_index = self._option_index_provider()
+        if option_index is not self._option_index:
+            # 메뉴가 바뀌면 인덱스 객체도 새로 만들어지므로 단가 캐시를 비움
+            with self._lock:
+                self._unit_prices.clear()
+                self._option_index = option_index
+        return option_index
+
+    def quote(self, menu_name: str, options: List[str]) -> Tuple[Optional[int], Tuple[str, ...]]:
+        # (단가, 가격표에 없는 옵션), 메뉴를 모르면 단가는 None
+        option_index = self._current_index()
+        # 같은 옵션을 여러 번 고른 경우(샷 추가 2번)도 그대로 더하도록 중복을 없애지 않고 정렬만 함
+        key = (menu_name, tuple(sorted(options or [])))
+        cached = self._unit_prices.get(key)
+        if cached is not None:
+            return cached
+
+        entry = option_index.lookup(menu_name)
+        if entry is None:
+            quote = (None, ())
+        else:
+            adjustments = [entry.option_price(option) for option in key[1]]
+            quote = (
+                entry.base_price + sum(adjustment for adjustment in adjustments if adjustment is not None),
+                tuple(dict.fromkeys(option for option, adjustment in zip(key[1], adjustments) if adjustment is None))
+            )
+
+        with self._lock:
+            if len(self._unit_prices) >= self._max_cache_size:
+                self._unit_prices.clear()
+            self._unit_prices[key] = quote
+        return quote
+
+    def price_item(self, item: Dict[str, Any], issues: Optional[List[str]] = None) -> int:
+        # 한 줄의 금액, 메뉴/옵션을 가격표에서 찾지 못하면 issues에 확인 질문을 추가
+        menu_name = item.get("name", "")
+        unit, unknown_options = self.quote(menu_name, item.get("options", []))
+        if unit is None:
+            # LLM이 준 가격을 그대로 두지 않고 0으로 두어 확인 전까지 결제 금액에 넣지 않음
+            logger.warning(f"메뉴판에 없는 메뉴 '{menu_name}', 가격 0으로 처리")
+            item["price"] = 0
+            if issues is not None:
+                issues.append(f"'{menu_name}' 메뉴는 없습니다. 어떤 메뉴로 주문하시겠어요?")
+            return 0
+        item["price"] = unit
+        if unknown_options:
+            logger.warning(f"메뉴 '{menu_name}'에 없는 옵션은 가격에서 제외: {list(unknown_options)}")
+            if issues is not None:
+                issues.append(f"{menu_name}에는 {', '.join(unknown_options)} 옵션이 없습니다. 다른 옵션으로 드릴까요?")
+        quantity = item.get("quantity", 1) or 1
+        return unit * quantity
+
+    def price_items(self, items: List[Dict[str, Any]], issues: Optional[List[str]] = None) -> int:
+        # 주문이 바뀔 때마다 전체를 다시 합산, 줄마다 단가 캐시를 쓰므로 항목 수만큼의 dict 조회
+        return sum(self.price_item(item, issues) for item in items)
+
+    def price_order(self, order: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        if not order:
+            return order
+        issues: List[str] = []
+        order["total_price"] = self.price_items(order.get("items", []), issues)
+        if issues:
+            # 가격을 확정할 수 없는 항목은 명확화 질문으로 되물음, 첫 번째 항목만 묻기 때문에 LLM 질문보다 앞에 둠
+            existing = list(order.get("clarification_items", []) or [])
+            order["clarification_items"] = list(dict.fromkeys(issues)) + [item for item in existing if item not in issues]
+        return order
+
+
+_pricing_engine: Optional[PricingEngine] = None
+
+
+def get_pricing_engine() -> PricingEngine:
+    global _pricing_engine
+    if _pricing_engine is None:
+        _pricing_engine = PricingEngine()
+    return _pricing_engine
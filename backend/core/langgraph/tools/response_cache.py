@@ -0,0 +1,209 @@
+from typing import Dict, Any, List, Optional, Tuple
+from collections import OrderedDict
+import copy
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+
+logger = logging.getLogger("response_cache")
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+def normalize_text(text: str) -> str:
+    text = (text or "").strip().lower()
+    text = re.sub(r"[^\w\s]", " ", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def canonical_hash(value: Any) -> str:
+    payload = json.dumps(value, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _order_signature(current_order: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # 가격/명확화 문구처럼 LLM 판단에 영향을 주지 않는 필드는 키에서 제외
+    if not current_order:
+        return []
+    signature = []
+    for item in current_order.get("items", []):
+        signature.append({
+            "name": item.get("name", ""),
+            "quantity": item.get("quantity", 1),
+            "options": sorted(item.get("options", [])),
+            "missing_required_options": sorted(item.get("missing_required_options", []))
+        })
+    return signature
+
+
+class CacheEntry:
+    __slots__ = ("normalized_text", "context_key", "value", "embedding", "created_at", "hits")
+
+    def __init__(self, normalized_text: str, context_key: str, value: Dict[str, Any], embedding=None):
+        self.normalized_text = normalized_text
+        self.context_key = context_key
+        self.value = value
+        self.embedding = embedding
+        self.created_at = time.time()
+        self.hits = 0
+
+
+class LLMResponseCache:
+    def __init__(
+        self,
+        max_size: int = 256,
+        ttl_seconds: float = 600.0,
+        similarity_threshold: float = 0.92,
+        encoder=None
+    ):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self._encoder = encoder
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._menu_fingerprint: Optional[str] = None
+        self.stats = {"exact_hits": 0, "semantic_hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    def context_key(self, state: Dict[str, Any]) -> str:
+        return canonical_hash({
+            "order": _order_signature(state.get("current_order")),
+            "pending_clarifications": list(state.get("pending_clarifications", []) or [])
+        })
+
+    def sync_menu(self, menu_fingerprint: str):
+        with self._lock:
+            if self._menu_fingerprint is not None and self._menu_fingerprint != menu_fingerprint:
+                logger.info("메뉴 변경 감지: LLM 응답 캐시 초기화")
+                self._clear_locked()
+            self._menu_fingerprint = menu_fingerprint
+
+    def invalidate(self):
+        with self._lock:
+            self._clear_locked()
+
+    def _clear_locked(self):
+        if self._entries:
+            self.stats["invalidations"] += 1
+        self._entries.clear()
+
+    def _encode(self, text: str):
+        if not NUMPY_AVAILABLE:
+            return None
+        encoder = self._encoder
+        if encoder is None:
+            # 템플릿 검색/의도 분류와 같은 임베딩 서비스에 같은 원문을 넘겨 한 턴에 forward pass 한 번
+            # (normalize_text로 구두점을 지운 문장은 메모 키가 달라 다시 인코딩하게 됨)
+            from .vector_store import get_embedding_service
+            encoder = get_embedding_service()
+            if encoder.model is None:
+                return None
+        try:
+            vector = np.asarray(encoder.encode([text])[0], dtype="float32")
+            norm = np.linalg.norm(vector)
+            return vector / norm if norm > 0 else vector
+        except Exception as e:
+            logger.warning(f"캐시 임베딩 생성 실패: {str(e)}")
+            return None
+
+    def _is_expired(self, entry: CacheEntry, now: float) -> bool:
+        return now - entry.created_at > self.ttl_seconds
+
+    def _evict_expired_locked(self, now: float):
+        expired = [key for key, entry in self._entries.items() if self._is_expired(entry, now)]
+        for key in expired:
+            del self._entries[key]
+            self.stats["evictions"] += 1
+
+    def get(self, text: str, state: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], str]:
+        normalized = normalize_text(text)
+        if not normalized:
+            return None, "skip"
+
+        context_key = self.context_key(state)
+        key = canonical_hash([normalized, context_key])
+        now = time.time()
+
+        with self._lock:
+            self._evict_expired_locked(now)
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                entry.hits += 1
+                self.stats["exact_hits"] += 1
+                return copy.deepcopy(entry.value), "exact"
+
+            # 유사 발화 적중은 주문과 무관한 응답(인사/잡담)만, '아메리카노 두 잔'과 '아메리카노 세 잔'처럼
+            # 임베딩은 가깝지만 수량/메뉴/옵션이 다른 주문 발화는 정확히 같은 발화일 때만 캐시 사용
+            candidates = [
+                (k, e) for k, e in self._entries.items()
+                if e.context_key == context_key and e.embedding is not None
+            ]
+
+        if candidates:
+            query_vector = self._encode(text)
+            if query_vector is not None:
+                best_key, best_entry, best_score = None, None, -1.0
+                for k, e in candidates:
+                    score = float(np.dot(query_vector, e.embedding))
+                    if score > best_score:
+                        best_key, best_entry, best_score = k, e, score
+
+                if best_entry is not None and best_score >= self.similarity_threshold:
+                    with self._lock:
+                        if best_key in self._entries:
+                            self._entries.move_to_end(best_key)
+                            best_entry.hits += 1
+                            self.stats["semantic_hits"] += 1
+                            logger.info(f"유사 발화 캐시 적중: '{best_entry.normalized_text}' (유사도: {best_score:.4f})")
+                            return copy.deepcopy(best_entry.value), "semantic"
+
+        with self._lock:
+            self.stats["misses"] += 1
+        return None, "miss"
+
+    def put(self, text: str, state: Dict[str, Any], value: Dict[str, Any]):
+        normalized = normalize_text(text)
+        if not normalized:
+            return
+
+        context_key = self.context_key(state)
+        key = canonical_hash([normalized, context_key])
+        # 주문 관련 응답은 정확 일치로만 찾으므로 임베딩을 만들지 않음
+        embedding = None if value.get("is_order_related", True) else self._encode(text)
+
+        with self._lock:
+            self._entries[key] = CacheEntry(normalized, context_key, copy.deepcopy(value), embedding)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self.stats, "size": len(self._entries)}
+
+
+_response_cache: Optional[LLMResponseCache] = None
+
+
+def get_response_cache() -> LLMResponseCache:
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = LLMResponseCache(
+            max_size=int(os.getenv("LLM_CACHE_MAX_SIZE", 256)),
+            ttl_seconds=float(os.getenv("LLM_CACHE_TTL_SECONDS", 600)),
+            similarity_threshold=float(os.getenv("LLM_CACHE_SIMILARITY_THRESHOLD", 0.92))
+        )
+        from ...menu_snapshot import get_menu_snapshot_store
+        # 메뉴 컨텍스트 지문 비교(sync_menu)를 기다리지 않고 메뉴가 바뀌는 즉시 캐시를 비움
+        get_menu_snapshot_store().add_listener(lambda snapshot: _response_cache.invalidate())
+    return _response_cache
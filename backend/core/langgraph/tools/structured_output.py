@@ -0,0 +1,320 @@
+from typing import Dict, Any, List, Optional, Tuple, get_type_hints, get_origin, get_args
+import copy
+import json
+import math
+import logging
+import re
+from ..state import LLMOrderAnalysis
+
+logger = logging.getLogger("structured_output")
+
+_PRIMITIVE_SCHEMAS = {
+    str: {"type": "string"},
+    int: {"type": "integer"},
+    bool: {"type": "boolean"},
+    float: {"type": "number"}
+}
+
+
+def typed_dict_to_json_schema(typed_dict) -> Dict[str, Any]:
+    properties = {}
+    for field_name, field_type in get_type_hints(typed_dict).items():
+        properties[field_name] = _type_to_schema(field_type)
+    # OpenAI strict 모드는 모든 필드가 required이고 추가 필드가 없어야 함
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties.keys()),
+        "additionalProperties": False
+    }
+
+
+def _type_to_schema(field_type) -> Dict[str, Any]:
+    if field_type in _PRIMITIVE_SCHEMAS:
+        return dict(_PRIMITIVE_SCHEMAS[field_type])
+    if get_origin(field_type) in (list, List):
+        return {"type": "array", "items": _type_to_schema(get_args(field_type)[0])}
+    if isinstance(field_type, type) and hasattr(field_type, "__annotations__"):
+        return typed_dict_to_json_schema(field_type)
+    raise TypeError(f"JSON 스키마로 변환할 수 없는 타입: {field_type}")
+
+
+ORDER_ANALYSIS_SCHEMA = typed_dict_to_json_schema(LLMOrderAnalysis)
+
+
+def build_response_format(fields: Optional[List[str]] = None) -> Dict[str, Any]:
+    schema = ORDER_ANALYSIS_SCHEMA
+    name = "order_analysis"
+    if fields:
+        schema = {
+            "type": "object",
+            "properties": {field: ORDER_ANALYSIS_SCHEMA["properties"][field] for field in fields},
+            "required": list(fields),
+            "additionalProperties": False
+        }
+        name = "order_analysis_repair"
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": name, "strict": True, "schema": schema}
+    }
+
+
+class IncrementalJSONParser:
+    # 스트리밍 중인 JSON 조각을 받아, 지금까지 완성된 부분만으로 닫힌 객체를 만들어 줌
+    def __init__(self):
+        self.buffer = ""
+        self._scanned = 0
+        self._started = False
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._string_is_key = False
+        self._last_significant = ""
+        self._safe_index = -1
+        self._safe_stack: Tuple[str, ...] = ()
+        self._done = False
+
+    def feed(self, chunk: str) -> Optional[Dict[str, Any]]:
+        self.buffer += chunk
+        self._scan()
+        return self.partial()
+
+    def _mark_safe(self, index: int):
+        self._safe_index = index
+        self._safe_stack = tuple(self._stack)
+
+    def _scan(self):
+        buffer = self.buffer
+        for i in range(self._scanned, len(buffer)):
+            ch = buffer[i]
+            if self._done:
+                break
+            if not self._started:
+                if ch == "{":
+                    self._started = True
+                    self._start_index = i
+                    self._stack.append("{")
+                    self._last_significant = "{"
+                    self._mark_safe(i + 1)
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    self._last_significant = '"'
+                    if not self._string_is_key:
+                        self._mark_safe(i + 1)
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                self._string_is_key = self._stack[-1] == "{" and self._last_significant in ("{", ",")
+            elif ch in "{[":
+                self._stack.append(ch)
+                self._last_significant = ch
+                self._mark_safe(i + 1)
+            elif ch in "}]":
+                if self._stack:
+                    self._stack.pop()
+                self._last_significant = ch
+                self._mark_safe(i + 1)
+                if not self._stack:
+                    self._done = True
+            elif ch == ",":
+                self._mark_safe(i)
+                self._last_significant = ch
+            elif not ch.isspace():
+                self._last_significant = ch
+        self._scanned = len(buffer)
+
+    @staticmethod
+    def _closers(stack) -> str:
+        return "".join("}" if opener == "{" else "]" for opener in reversed(stack))
+
+    def partial(self) -> Optional[Dict[str, Any]]:
+        if not self._started:
+            return None
+        start = self._start_index
+
+        # 값 문자열을 읽는 중이면 지금까지의 내용으로 문자열을 닫아 봄 (TTS 선행 재생용)
+        if self._in_string and not self._string_is_key:
+            text = self.buffer[start:self._scanned]
+            text = re.sub(r"\\(u[0-9a-fA-F]{0,3})?$", "", text)
+            try:
+                return json.loads(text + '"' + self._closers(self._stack))
+            except json.JSONDecodeError:
+                pass
+
+        if self._safe_index < 0:
+            return None
+        text = self.buffer[start:self._safe_index].rstrip()
+        if text.endswith(","):
+            text = text[:-1]
+        try:
+            return json.loads(text + self._closers(self._safe_stack))
+        except json.JSONDecodeError:
+            return None
+
+    @property
+    def complete(self) -> bool:
+        return self._done
+
+
+def extract_json(text: str) -> Optional[Dict[str, Any]]:
+    text = (text or "").strip()
+    if text.startswith("{") and text.endswith("}"):
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            pass
+    # 탐욕적 정규식 대신 괄호 짝을 맞춰 첫 번째 JSON 객체만 추출, 잘린 응답도 복구
+    parser = IncrementalJSONParser()
+    return parser.feed(text)
+
+
+def _coerce_int(value: Any) -> Optional[int]:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else None
+    if isinstance(value, str):
+        # 천 단위 구분자와 단위(원/잔/개/컵)만 지우고 소수점은 남김, '2.5'나 '두 잔'은 None으로 재요청 대상
+        text = re.sub(r"[\s,]|원$|잔$|개$|컵$", "", value.strip())
+        try:
+            number = float(text)
+        except ValueError:
+            return None
+        if math.isfinite(number) and number.is_integer():
+            return int(number)
+    return None
+
+
+def _coerce_bool(value: Any) -> Optional[bool]:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        lowered = value.strip().lower()
+        if lowered in ("true", "yes", "1"):
+            return True
+        if lowered in ("false", "no", "0"):
+            return False
+    if isinstance(value, int):
+        return bool(value)
+    return None
+
+
+def _coerce_str_list(value: Any) -> Optional[List[str]]:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value] if value.strip() else []
+    if isinstance(value, list):
+        return [str(v) for v in value if v is not None and str(v).strip()]
+    return None
+
+
+def _repair_item(item: Any) -> Tuple[Optional[Dict[str, Any]], List[str]]:
+    # 복구한 항목과 값을 해석하지 못한 필드 목록, 기본값은 키가 없을 때만 쓰고 해석 실패('두 잔', '1-2')는 재요청 대상
+    if not isinstance(item, dict):
+        return None, ["item"]
+    name = item.get("name")
+    if not isinstance(name, str) or not name.strip():
+        return None, ["name"]
+    failed = []
+    quantity = _coerce_int(item.get("quantity", 1))
+    if quantity is None or quantity <= 0:
+        failed.append("quantity")
+    options = _coerce_str_list(item.get("options", []))
+    if options is None:
+        failed.append("options")
+    missing = _coerce_str_list(item.get("missing_required_options", []))
+    if missing is None:
+        failed.append("missing_required_options")
+    price = _coerce_int(item.get("price", 0))
+    if price is None or price < 0:
+        failed.append("price")
+    # 재요청으로도 복구하지 못하면 아래 기본값으로 진행 (가격은 이후 PricingEngine이 메뉴 DB로 다시 계산)
+    return {
+        **item,
+        "name": name.strip(),
+        "quantity": quantity if "quantity" not in failed else 1,
+        "options": options if options is not None else [],
+        "missing_required_options": missing if missing is not None else [],
+        "price": price if "price" not in failed else 0
+    }, failed
+
+
+def validate_analysis(raw: Any) -> Tuple[Dict[str, Any], List[str]]:
+    if not isinstance(raw, dict):
+        return default_analysis(), list(ORDER_ANALYSIS_SCHEMA["properties"].keys())
+
+    analysis = copy.deepcopy(raw)
+    invalid_fields = []
+
+    is_order_related = _coerce_bool(raw.get("is_order_related", True))
+    if is_order_related is None:
+        invalid_fields.append("is_order_related")
+        is_order_related = True
+    analysis["is_order_related"] = is_order_related
+
+    greeting_response = raw.get("greeting_response", "")
+    analysis["greeting_response"] = greeting_response if isinstance(greeting_response, str) else str(greeting_response or "")
+
+    items = raw.get("items", [])
+    if isinstance(items, dict):
+        items = [items]
+    if not isinstance(items, list):
+        invalid_fields.append("items")
+        items = []
+    repaired_items = []
+    for index, item in enumerate(items):
+        repaired, failed = _repair_item(item)
+        if failed:
+            logger.warning(f"주문 항목 {index} 필드 해석 실패: {failed} (값: {item})")
+            invalid_fields.append("items")
+        if repaired is not None:
+            repaired_items.append(repaired)
+    analysis["items"] = repaired_items
+
+    total_price = _coerce_int(raw.get("total_price", 0))
+    if total_price is None:
+        total_price = sum(item["price"] * item["quantity"] for item in analysis["items"])
+    analysis["total_price"] = total_price
+
+    special_requests = raw.get("special_requests", "")
+    analysis["special_requests"] = special_requests if isinstance(special_requests, str) else ""
+
+    clarification_items = _coerce_str_list(raw.get("clarification_items", []))
+    if clarification_items is None:
+        invalid_fields.append("clarification_items")
+        clarification_items = []
+    analysis["clarification_items"] = clarification_items
+
+    return analysis, sorted(set(invalid_fields))
+
+
+def default_analysis() -> Dict[str, Any]:
+    return {
+        "is_order_related": True,
+        "greeting_response": "",
+        "items": [],
+        "total_price": 0,
+        "special_requests": "",
+        "clarification_items": []
+    }
+
+
+def build_repair_message(invalid_fields: List[str], raw: Any) -> str:
+    previous = {field: raw.get(field) for field in invalid_fields} if isinstance(raw, dict) else raw
+    return (
+        "직전 응답의 다음 필드가 형식에 맞지 않는다: "
+        f"{', '.join(invalid_fields)}\n"
+        f"직전 값: {json.dumps(previous, ensure_ascii=False, default=str)}\n"
+        "위 필드만 포함한 JSON 객체로 다시 응답하라."
+    )
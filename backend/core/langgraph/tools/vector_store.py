@@ -1,12 +1,25 @@
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
+from collections import OrderedDict
+from concurrent.futures import Future
 import numpy as np
 import json
 import logging
 import os
+import queue
+import random
+import threading
+import time
 from pathlib import Path
+from .embedding_cache import TemplateEmbeddingCache
 
 logger = logging.getLogger("vector_store")
 
+EMBEDDING_MODEL_NAME = os.getenv("EMBEDDING_MODEL", "sentence-transformers/paraphrase-multilingual-mpnet-base-v2")
+# torch(기본), onnx, openvino / onnx에서 int8 양자화 모델을 쓰려면 EMBEDDING_MODEL_FILE=onnx/model_qint8_avx2.onnx 등으로 지정
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+EMBEDDING_MODEL_FILE = os.getenv("EMBEDDING_MODEL_FILE")
+EMBEDDING_CACHE_DIR = os.getenv("EMBEDDING_CACHE_DIR", "data/embeddings")
+
 try:
     from sentence_transformers import SentenceTransformer
     SENTENCE_TRANSFORMERS_AVAILABLE = True
@@ -18,14 +31,175 @@ try:
     import faiss
     FAISS_AVAILABLE = True
 except ImportError:
-    logger.warning("faiss-cpu 패키지를 찾을 수 없습니다. 일부 기능이 제한됩니다.")
+    logger.warning("faiss-cpu 패키지를 찾을 수 없습니다. NumPy 검색 백엔드를 사용합니다.")
     FAISS_AVAILABLE = False
 
+# auto: faiss가 있으면 faiss, 없으면 NumPy / faiss, numpy: 강제 지정
+VECTOR_INDEX_BACKEND = os.getenv("VECTOR_INDEX_BACKEND", "auto")
+# 템플릿 응답으로 바로 답할 최소 코사인 유사도
+# 변경 전 점수 1/(1+L2²) >= 0.8은 정규화하지 않은 벡터의 L2² <= 0.25, 노름 r인 두 벡터라면 cos >= 1 - 0.125/r²
+# 노름이 1이어도 0.875 이상, 실제 mpnet 임베딩은 노름이 1보다 커서 사실상 거의 같은 문장만 통과했으므로 0.95로 맞춤
+SIMILAR_RESPONSE_THRESHOLD = float(os.getenv("SIMILAR_RESPONSE_THRESHOLD", 0.95))
+
+def _l2_normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.ascontiguousarray(vectors, dtype='float32')
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1.0)
+
+
+def embedding_model_id(
+    model_name: str = EMBEDDING_MODEL_NAME,
+    backend: str = EMBEDDING_BACKEND,
+    model_file: Optional[str] = EMBEDDING_MODEL_FILE
+) -> str:
+    # 같은 모델이라도 백엔드/양자화가 다르면 벡터가 달라지므로 템플릿 임베딩 캐시 키에 포함
+    parts = [model_name]
+    if backend != "torch":
+        parts.append(backend)
+    if model_file:
+        parts.append(model_file)
+    return ":".join(parts)
+
+
+def load_embedding_model(
+    model_name: str = EMBEDDING_MODEL_NAME,
+    backend: str = EMBEDDING_BACKEND,
+    model_file: Optional[str] = EMBEDDING_MODEL_FILE
+):
+    kwargs: Dict[str, Any] = {}
+    if backend != "torch":
+        kwargs["backend"] = backend
+        if model_file:
+            kwargs["model_kwargs"] = {"file_name": model_file}
+    return SentenceTransformer(model_name, **kwargs)
+
+
+class NumpyInnerProductIndex:
+    # faiss.IndexFlatIP와 같은 add/search 인터페이스의 브루트포스 내적 검색
+    def __init__(self, dimension: int):
+        self.d = dimension
+        self._matrix = np.empty((0, dimension), dtype='float32')
+
+    @property
+    def ntotal(self) -> int:
+        return self._matrix.shape[0]
+
+    def add(self, vectors: np.ndarray):
+        vectors = np.asarray(vectors, dtype='float32').reshape(-1, self.d)
+        self._matrix = np.ascontiguousarray(np.vstack([self._matrix, vectors]))
+
+    def search(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        queries = np.asarray(queries, dtype='float32').reshape(-1, self.d)
+        n = self.ntotal
+        k_eff = min(k, n)
+        scores = np.full((queries.shape[0], k), -np.inf, dtype='float32')
+        indices = np.full((queries.shape[0], k), -1, dtype='int64')
+        if k_eff == 0:
+            return scores, indices
+
+        if queries.shape[0] == 1:
+            similarities = (self._matrix @ queries[0])[np.newaxis, :]
+        else:
+            similarities = queries @ self._matrix.T
+        if k_eff < n:
+            # 전체 정렬 대신 상위 k개만 골라낸 뒤 그 안에서 정렬
+            top = np.argpartition(-similarities, k_eff - 1, axis=1)[:, :k_eff]
+        else:
+            top = np.broadcast_to(np.arange(n), (queries.shape[0], n))
+        top_scores = np.take_along_axis(similarities, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        scores[:, :k_eff] = np.take_along_axis(top_scores, order, axis=1)
+        indices[:, :k_eff] = np.take_along_axis(top, order, axis=1)
+        return scores, indices
+
+
+def use_faiss_backend() -> bool:
+    if VECTOR_INDEX_BACKEND == "numpy":
+        return False
+    if VECTOR_INDEX_BACKEND == "faiss" and not FAISS_AVAILABLE:
+        logger.warning("VECTOR_INDEX_BACKEND=faiss 이지만 faiss가 없어 NumPy 백엔드를 사용합니다.")
+    return FAISS_AVAILABLE
+
+
+def create_inner_product_index(dimension: int):
+    if use_faiss_backend():
+        return faiss.IndexFlatIP(dimension)
+    return NumpyInnerProductIndex(dimension)
+
+
+def _index_name(response_type: Optional[str]) -> str:
+    if response_type is None:
+        return "ip_all"
+    return "ip_" + "".join(ch if ch.isalnum() or ch == "_" else "_" for ch in response_type)
+
+
+class TemplateIndex:
+    # 응답 템플릿과 타입별 내적(코사인) 인덱스를 묶은 스냅샷, 만든 뒤에는 변경하지 않음
+    def __init__(self, responses: List[Dict[str, Any]]):
+        self.responses = responses
+        self.type_buckets: Dict[str, List[Dict[str, Any]]] = {}
+        self.type_rows: Dict[Optional[str], List[int]] = {None: list(range(len(responses)))}
+        for row, response in enumerate(responses):
+            response_type = response.get("type")
+            self.type_buckets.setdefault(response_type, []).append(response)
+            self.type_rows.setdefault(response_type, []).append(row)
+        self.indexes: Dict[Optional[str], Any] = {}
+        self.build_stats: Dict[str, Any] = {}
+
+    @property
+    def searchable(self) -> bool:
+        return bool(self.indexes)
+
+    def build_indexes(self, cache: TemplateEmbeddingCache, encode):
+        texts = [response["text"] for response in self.responses]
+        use_faiss = use_faiss_backend()
+        indexes = {}
+        if use_faiss:
+            indexes = {
+                response_type: cache.load_index(_index_name(response_type), texts, rows)
+                for response_type, rows in self.type_rows.items()
+            }
+            if all(index is not None for index in indexes.values()):
+                self.indexes = indexes
+                self.build_stats = {"cache_hit": True, "encoded": 0, "reused": len(texts)}
+                logger.info("저장된 응답 템플릿 인덱스 로드 완료 (인코딩 생략)")
+                return
+
+        vectors = cache.load(texts)
+        if vectors is None:
+            vectors = cache.build(texts, encode)
+        # 정규화한 벡터의 내적 = 코사인 유사도
+        self.build_stats = dict(cache.stats)
+        normalized = _l2_normalize(vectors)
+        for response_type, rows in self.type_rows.items():
+            index = create_inner_product_index(normalized.shape[1])
+            index.add(np.ascontiguousarray(normalized[rows]))
+            if use_faiss:
+                cache.save_index(_index_name(response_type), texts, rows, index)
+            indexes[response_type] = index
+        self.indexes = indexes
+        logger.info(
+            f"응답 템플릿 타입별 인덱스 {len(indexes)}개 생성 완료 "
+            f"(백엔드: {'faiss' if use_faiss else 'numpy'})"
+        )
+
+    def search(self, query_vector: np.ndarray, response_type: Optional[str] = None, top_k: int = 3) -> List[Tuple[Dict[str, Any], float]]:
+        index = self.indexes.get(response_type)
+        rows = self.type_rows.get(response_type)
+        if index is None or not rows:
+            return []
+        scores, positions = index.search(query_vector.reshape(1, -1).astype('float32'), min(top_k, len(rows)))
+        return [
+            (self.responses[rows[position]], float(score))
+            for score, position in zip(scores[0], positions[0])
+            if 0 <= position < len(rows)
+        ]
+
+
 class VectorStore:
     _instance = None
     _initialized = False
     _model = None
-    _index = None
     
     def __new__(cls, response_templates_path=None):
         if cls._instance is None:
@@ -36,13 +210,16 @@ class VectorStore:
         if VectorStore._initialized:
             return
             
-        self.responses = []
+        self.template_index = TemplateIndex([])
+        self._reload_lock = threading.Lock()
+        self._watcher: Optional[threading.Thread] = None
 
-        if VectorStore._model is None and SENTENCE_TRANSFORMERS_AVAILABLE and FAISS_AVAILABLE:
+        if VectorStore._model is None and SENTENCE_TRANSFORMERS_AVAILABLE:
             self._load_model()
             
         if response_templates_path is None:
             response_templates_path = Path(__file__).parent.parent / 'data' / 'response_templates.json'
+        self.templates_path = Path(response_templates_path)
         
         if os.path.exists(response_templates_path):
             self._load_responses(response_templates_path)
@@ -54,8 +231,8 @@ class VectorStore:
     @classmethod
     def _load_model(cls):
         try:
-            logger.info("SentenceTransformer 모델 로드 시작...")
-            cls._model = SentenceTransformer('sentence-transformers/paraphrase-multilingual-mpnet-base-v2')
+            logger.info(f"SentenceTransformer 모델 로드 시작: {embedding_model_id()}")
+            cls._model = load_embedding_model()
             logger.info("SentenceTransformer 모델 로드 완료")
         except Exception as e:
             logger.error(f"SentenceTransformer 모델 로드 중 오류 발생: {str(e)}")
@@ -65,75 +242,121 @@ class VectorStore:
     def model(self):
         return VectorStore._model
     
-    @property    
-    def index(self):
-        return VectorStore._index
-    
-    @index.setter
-    def index(self, value):
-        VectorStore._index = value
+    @property
+    def responses(self) -> List[Dict[str, Any]]:
+        return self.template_index.responses
+            
+    def _build_template_index(self, templates_path) -> TemplateIndex:
+        with open(templates_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+            templates = data.get("templates", [])
+            
+        template_index = TemplateIndex(templates)
+        logger.info(f"응답 템플릿 {len(templates)}개 로드 완료")
+        
+        if SENTENCE_TRANSFORMERS_AVAILABLE and self.model and templates:
+            # 템플릿 내용과 모델이 같으면 저장된 임베딩/인덱스를 그대로 로드, 바뀐 템플릿만 인코딩
+            cache = TemplateEmbeddingCache(EMBEDDING_CACHE_DIR, embedding_model_id())
+            template_index.build_indexes(cache, self.model.encode)
+        return template_index
             
     def _load_responses(self, templates_path):
         try:
-            with open(templates_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                templates = data.get("templates", [])
-                
-            self.responses = templates
-            logger.info(f"응답 템플릿 {len(templates)}개 로드 완료")
-            
-            if SENTENCE_TRANSFORMERS_AVAILABLE and FAISS_AVAILABLE and self.model:
-                texts = [template["text"] for template in templates]
-                vectors = self.model.encode(texts)
-                
-                dimension = vectors.shape[1]
-                self.index = faiss.IndexFlatL2(dimension)
-                self.index.add(vectors.astype('float32'))
-                logger.info("응답 템플릿 벡터화 및 인덱스 생성 완료")
-                
+            self.template_index = self._build_template_index(templates_path)
         except Exception as e:
             logger.error(f"응답 템플릿 로드 중 오류 발생: {str(e)}")
-            self.responses = []
+            self.template_index = TemplateIndex([])
+    
+    def reload_templates(self, templates_path=None) -> Dict[str, Any]:
+        # 새 스냅샷을 따로 만든 뒤 참조만 교체하므로 검색 중인 요청은 이전 스냅샷을 끝까지 사용
+        with self._reload_lock:
+            start = time.time()
+            templates_path = Path(templates_path) if templates_path else self.templates_path
+            previous = {response["text"]: response for response in self.template_index.responses}
+            template_index = self._build_template_index(templates_path)
+            current = {response["text"]: response for response in template_index.responses}
+            
+            self.template_index = template_index
+            self.templates_path = templates_path
             
-    def find_similar_response(self, query: str, response_type: str = None, threshold: float = 0.8) -> Optional[Dict[str, Any]]:
+            stats = {
+                "templates": len(template_index.responses),
+                "added": len(current.keys() - previous.keys()),
+                "removed": len(previous.keys() - current.keys()),
+                "changed": sum(1 for text in current.keys() & previous.keys() if current[text] != previous[text]),
+                "encoded": template_index.build_stats.get("encoded", 0),
+                "reused": template_index.build_stats.get("reused", 0),
+                "seconds": round(time.time() - start, 3)
+            }
+            logger.info(
+                f"응답 템플릿 재로드: 추가 {stats['added']}, 삭제 {stats['removed']}, 변경 {stats['changed']}, "
+                f"인코딩 {stats['encoded']}개 ({stats['seconds']}초)"
+            )
+            return stats
+    
+    def start_template_watcher(self, interval: float = 2.0):
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+        
+        def watch():
+            last_mtime = self.templates_path.stat().st_mtime if self.templates_path.exists() else None
+            while True:
+                time.sleep(interval)
+                try:
+                    mtime = self.templates_path.stat().st_mtime if self.templates_path.exists() else None
+                    if mtime is not None and mtime != last_mtime:
+                        last_mtime = mtime
+                        self.reload_templates()
+                except Exception as e:
+                    # 편집 중인 파일이 잠시 깨진 JSON일 수 있으므로 이전 스냅샷을 유지하고 다음 변경을 기다림
+                    logger.error(f"응답 템플릿 자동 재로드 실패: {str(e)}")
+        
+        self._watcher = threading.Thread(target=watch, name="template-watcher", daemon=True)
+        self._watcher.start()
+        logger.info(f"응답 템플릿 파일 감시 시작: {self.templates_path} ({interval}초 간격)")
+    
+    def find_similar_responses(
+        self,
+        query: str,
+        response_type: str = None,
+        top_k: int = 3,
+        threshold: float = 0.0
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        template_index = self.template_index
+        if not template_index.searchable or not self.model:
+            return []
+        try:
+            query_vector = get_embedding_service().encode_one(query, normalize=True)
+        except Exception as e:
+            logger.error(f"쿼리 임베딩 생성 중 오류 발생: {str(e)}")
+            return []
+        return [
+            (response, score)
+            for response, score in template_index.search(query_vector, response_type, top_k)
+            if score >= threshold
+        ]
+            
+    def find_similar_response(self, query: str, response_type: str = None, threshold: float = SIMILAR_RESPONSE_THRESHOLD) -> Optional[Dict[str, Any]]:
         if not self.responses:
             return None
-            
-        if SENTENCE_TRANSFORMERS_AVAILABLE and FAISS_AVAILABLE and self.model and self.index:
-            try:
-                query_vector = self.model.encode([query])[0].astype('float32')
-                distances, indices = self.index.search(query_vector.reshape(1, -1), 3)  
-                filtered_results = []
-                for i, idx in enumerate(indices[0]):
-                    if idx < len(self.responses):
-                        response = self.responses[idx]
-                        if response_type is None or response.get("type") == response_type:
-                            score = 1 / (1 + distances[0][i])  
-                            if score >= threshold:
-                                filtered_results.append((response, score))
-                
-                if filtered_results:
-                    filtered_results.sort(key=lambda x: x[1], reverse=True)
-                    response, score = filtered_results[0]
-                    logger.info(f"유사 응답 찾음: '{response['text']}' (점수: {score:.4f})")
-                    return response
-                    
-            except Exception as e:
-                logger.error(f"벡터 검색 중 오류 발생: {str(e)}")
+        
+        # 요청한 타입의 인덱스에서만 찾으므로 다른 타입이 상위를 차지해도 누락되지 않음, 점수는 코사인 유사도
+        results = self.find_similar_responses(query, response_type, top_k=1, threshold=threshold)
+        if results:
+            response, score = results[0]
+            logger.info(f"유사 응답 찾음: '{response['text']}' (점수: {score:.4f})")
+            return response
         
         if response_type:
-            type_matches = [r for r in self.responses if r.get("type") == response_type]
-            if type_matches:
-                import random
-                response = random.choice(type_matches)
+            response = self.get_response_by_type(response_type)
+            if response:
                 logger.info(f"타입 기반 응답 찾음: '{response['text']}'")
                 return response
         return None
         
     def get_response_by_type(self, response_type: str) -> Optional[Dict[str, Any]]:
-        type_matches = [r for r in self.responses if r.get("type") == response_type]
+        type_matches = self.template_index.type_buckets.get(response_type)
         if type_matches:
-            import random
             return random.choice(type_matches)
         return None
         
@@ -151,3 +374,158 @@ class VectorStore:
                 return template.replace("아메리카노", menu_name)
             return f"{menu_name}을 레귤러 사이즈로 드릴까요, 라지 사이즈로 드릴까요?"
         return ""
+
+
+def _normalize_query(text: str) -> str:
+    return " ".join((text or "").split())
+
+
+class EmbeddingService:
+    # 정규화한 문장 단위 LRU 메모 + 동시 요청을 한 번의 forward pass로 묶는 마이크로 배치 인코더
+    def __init__(
+        self,
+        model_provider,
+        cache_size: int = 1024,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        timeout: float = 10.0
+    ):
+        self._model_provider = model_provider
+        # 배치 결과를 기다리는 최대 시간, asyncio.to_thread 안의 호출은 요청 마감 시간으로 취소되지 않으므로 직접 제한
+        self.timeout = timeout
+        self.cache_size = cache_size
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._queue: "queue.Queue" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "batches": 0, "batched_texts": 0, "encode_seconds": 0.0}
+
+    @property
+    def model(self):
+        return self._model_provider()
+
+    def _cache_get(self, key: str) -> Optional[np.ndarray]:
+        with self._cache_lock:
+            vector = self._cache.get(key)
+            if vector is not None:
+                self._cache.move_to_end(key)
+                self.stats["hits"] += 1
+            return vector
+
+    def _cache_put(self, key: str, vector: np.ndarray):
+        with self._cache_lock:
+            self._cache[key] = vector
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run_worker, name="embedding-batcher", daemon=True)
+                self._worker.start()
+
+    def _run_worker(self):
+        while True:
+            batch = [self._queue.get()]
+            count = len(batch[0][0])
+            deadline = time.monotonic() + self.max_wait
+            # 짧게 기다리며 동시에 들어온 요청을 모아 한 번에 인코딩
+            while count < self.max_batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                batch.append(item)
+                count += len(item[0])
+            try:
+                self._encode_batch(batch)
+            except Exception as e:
+                # 어떤 오류든 배처 스레드는 계속 살아 있어야 하고, 아직 끝나지 않은 요청은 오류로 끝냄
+                logger.error(f"임베딩 배치 처리 중 오류: {str(e)}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _encode_batch(self, batch):
+        texts = list(dict.fromkeys(text for texts, _ in batch for text in texts))
+        try:
+            model = self.model
+            if model is None:
+                raise RuntimeError("임베딩 모델이 로드되지 않았습니다.")
+            start = time.time()
+            vectors = np.asarray(model.encode(texts), dtype='float32')
+            if len(vectors) != len(texts):
+                raise RuntimeError(f"임베딩 개수가 입력과 다릅니다: 입력 {len(texts)}개, 결과 {len(vectors)}개")
+            with self._cache_lock:
+                self.stats["batches"] += 1
+                self.stats["batched_texts"] += len(texts)
+                self.stats["encode_seconds"] += time.time() - start
+            encoded = dict(zip(texts, vectors))
+            for text, vector in encoded.items():
+                self._cache_put(text, vector)
+            for requested, future in batch:
+                future.set_result([encoded[text] for text in requested])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+    def encode(self, texts: List[str], normalize: bool = False) -> np.ndarray:
+        keys = [_normalize_query(text) for text in texts]
+        results: List[Optional[np.ndarray]] = [self._cache_get(key) for key in keys]
+        missing = list(dict.fromkeys(key for key, vector in zip(keys, results) if vector is None))
+        if missing:
+            with self._cache_lock:
+                self.stats["misses"] += len(missing)
+            self._ensure_worker()
+            future: Future = Future()
+            self._queue.put((missing, future))
+            encoded = dict(zip(missing, future.result(timeout=self.timeout)))
+            results = [vector if vector is not None else encoded[key] for key, vector in zip(keys, results)]
+
+        vectors = np.vstack(results).astype('float32') if results else np.empty((0, 0), dtype='float32')
+        if normalize and len(vectors):
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors = vectors / np.where(norms > 0, norms, 1.0)
+        return vectors
+
+    def encode_one(self, text: str, normalize: bool = False) -> np.ndarray:
+        return self.encode([text], normalize=normalize)[0]
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._cache_lock:
+            stats = dict(self.stats)
+            stats["cache_size"] = len(self._cache)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        stats["avg_batch_size"] = round(stats["batched_texts"] / stats["batches"], 2) if stats["batches"] else 0.0
+        stats["encode_seconds"] = round(stats["encode_seconds"], 3)
+        return stats
+
+
+_embedding_service: Optional[EmbeddingService] = None
+_embedding_service_lock = threading.Lock()
+
+
+def get_embedding_service() -> EmbeddingService:
+    global _embedding_service
+    if _embedding_service is None:
+        with _embedding_service_lock:
+            if _embedding_service is None:
+                _embedding_service = EmbeddingService(
+                    lambda: VectorStore().model,
+                    cache_size=int(os.getenv("EMBEDDING_CACHE_SIZE", 1024)),
+                    max_batch_size=int(os.getenv("EMBEDDING_MAX_BATCH_SIZE", 32)),
+                    max_wait_ms=float(os.getenv("EMBEDDING_MAX_WAIT_MS", 5)),
+                    timeout=float(os.getenv("EMBEDDING_TIMEOUT_SECONDS", 10))
+                )
+    return _embedding_service
@@ -0,0 +1,183 @@
+from typing import Dict, Any, List, Optional, Callable
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from .db import get_menu_categories, get_menu_data_version, search_menu, flatten_options
+from .models.menu import MenuCategory
+
+logger = logging.getLogger("menu_snapshot")
+
+
+def _compact(text: str) -> str:
+    return "".join((text or "").lower().split())
+
+
+def _option_groups(groups) -> Dict[str, List[Dict[str, Any]]]:
+    return {
+        group_name: [{"id": opt.id, "name": opt.name, "price_adjustment": opt.price_adjustment} for opt in options]
+        for group_name, options in (groups or {}).items()
+    }
+
+
+class MenuSnapshot:
+    # 한 시점의 메뉴 전체, 만든 뒤에는 바꾸지 않고 메뉴가 바뀌면 새 스냅샷으로 교체
+    def __init__(self, version: int, data_version: int, categories: List[MenuCategory]):
+        self.version = version
+        self.data_version = data_version
+        self.categories = categories
+        self.created_at = time.time()
+
+        # get_menu_by_name과 같은 형태의 메뉴 dict, 메뉴 id 순
+        items = []
+        for category in categories:
+            for item in category.items:
+                items.append({
+                    "id": item.id,
+                    "name": item.name,
+                    "description": item.description,
+                    "base_price": item.base_price,
+                    "image_url": item.image_url,
+                    "is_available": item.is_available,
+                    "category": category.name,
+                    "aliases": list(getattr(item, "aliases", None) or []),
+                    "options": [
+                        {"id": opt.id, "name": opt.name, "price_adjustment": opt.price_adjustment}
+                        for opt in flatten_options(item.required_options, item.optional_options)
+                    ],
+                    "required_options": _option_groups(item.required_options),
+                    "optional_options": _option_groups(item.optional_options)
+                })
+        items.sort(key=lambda menu: menu["id"])
+        self.items = items
+        self.by_id = {menu["id"]: menu for menu in items}
+        self.by_name = {menu["name"]: menu for menu in items}
+        # 공백/대소문자를 무시한 이름과 별칭의 정확한 일치는 DB 없이 바로 찾음
+        self._by_compact: Dict[str, Dict[str, Any]] = {}
+        for menu in items:
+            for alias in menu["aliases"]:
+                self._by_compact.setdefault(_compact(alias), menu)
+        for menu in items:
+            self._by_compact[_compact(menu["name"])] = menu
+        # 규칙 기반 대화에서 쓰는 이름/가격/카테고리 목록
+        self.rows = [
+            {"name": menu["name"], "base_price": menu["base_price"], "category": menu["category"]}
+            for menu in items
+        ]
+        self.fingerprint = hashlib.sha256(
+            json.dumps(
+                [[category.id, category.name, category.description] for category in categories] + items,
+                ensure_ascii=False, sort_keys=True, default=str
+            ).encode("utf-8")
+        ).hexdigest()
+
+    def find(self, menu_name: str) -> Optional[Dict[str, Any]]:
+        if not menu_name:
+            return None
+        menu = self.by_name.get(menu_name) or self._by_compact.get(_compact(menu_name))
+        if menu is not None:
+            return menu
+        # 부분 일치는 DB 검색 색인의 순위(이름 접두 > 이름 포함 > 별칭 포함)를 따라 항상 같은 결과
+        for result in search_menu(menu_name, limit=3, include_description=False):
+            menu = self.by_id.get(result["id"])
+            if menu is not None:
+                return menu
+        return None
+
+
+class MenuSnapshotStore:
+    # 메뉴 DB 변경 카운터가 바뀔 때만 스냅샷을 다시 만들고 등록된 캐시에 알림
+    def __init__(self, check_interval: float = 1.0):
+        self.check_interval = check_interval
+        self._snapshot: Optional[MenuSnapshot] = None
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[MenuSnapshot], None]] = []
+        self.stats = {"builds": 0, "checks": 0, "unchanged_rebuilds": 0, "build_seconds": 0.0}
+
+    def add_listener(self, listener: Callable[[MenuSnapshot], None]):
+        with self._lock:
+            if listener not in self._listeners:
+                self._listeners.append(listener)
+
+    def fresh(self) -> Optional[MenuSnapshot]:
+        # 확인 간격 안이면 쿼리 없이 쓸 수 있는 스냅샷, 아니면 None (DB 확인 필요)
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - self._last_check < self.check_interval:
+            return snapshot
+        return None
+
+    def current(self) -> MenuSnapshot:
+        snapshot = self.fresh()
+        if snapshot is not None:
+            return snapshot
+        return self.refresh()
+
+    def refresh(self, force: bool = False) -> MenuSnapshot:
+        with self._lock:
+            data_version = get_menu_data_version()
+            self._last_check = time.monotonic()
+            self.stats["checks"] += 1
+            previous = self._snapshot
+            if previous is not None and not force and previous.data_version == data_version:
+                return previous
+
+            start = time.perf_counter()
+            candidate = MenuSnapshot(
+                (previous.version + 1) if previous else 1,
+                data_version,
+                get_menu_categories()
+            )
+            self.stats["build_seconds"] += time.perf_counter() - start
+            self.stats["builds"] += 1
+
+            if previous is not None and previous.fingerprint == candidate.fingerprint:
+                # 같은 내용을 다시 쓴 경우(재시작 시 시드 등)는 버전을 올리지 않아 의존 캐시를 유지
+                previous.data_version = data_version
+                self.stats["unchanged_rebuilds"] += 1
+                return previous
+
+            self._snapshot = candidate
+            listeners = list(self._listeners)
+        logger.info(f"메뉴 스냅샷 v{candidate.version} 생성: 메뉴 {len(candidate.items)}개 ({(time.perf_counter() - start) * 1000:.1f}ms)")
+        for listener in listeners:
+            try:
+                listener(candidate)
+            except Exception as e:
+                logger.error(f"메뉴 변경 알림 처리 중 오류: {str(e)}")
+        return candidate
+
+    def get_stats(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        stats = dict(self.stats)
+        stats["build_seconds"] = round(stats["build_seconds"], 4)
+        stats["listeners"] = len(self._listeners)
+        if snapshot is not None:
+            stats.update({
+                "version": snapshot.version,
+                "data_version": snapshot.data_version,
+                "items": len(snapshot.items),
+                "fingerprint": snapshot.fingerprint[:16]
+            })
+        return stats
+
+
+_menu_snapshot_store: Optional[MenuSnapshotStore] = None
+_menu_snapshot_store_lock = threading.Lock()
+
+
+def get_menu_snapshot_store() -> MenuSnapshotStore:
+    global _menu_snapshot_store
+    if _menu_snapshot_store is None:
+        with _menu_snapshot_store_lock:
+            if _menu_snapshot_store is None:
+                _menu_snapshot_store = MenuSnapshotStore(
+                    check_interval=float(os.getenv("MENU_SNAPSHOT_CHECK_INTERVAL", 1.0))
+                )
+    return _menu_snapshot_store
+
+
+def get_menu_snapshot() -> MenuSnapshot:
+    return get_menu_snapshot_store().current()
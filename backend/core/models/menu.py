@@ -21,6 +21,7 @@ class MenuItem(BaseModel):
     is_available: bool = True
     required_options: Dict[str, List[MenuOption]] = {}  # 필수 옵션
     optional_options: Dict[str, List[MenuOption]] = {}  # 선택 옵션
+    aliases: List[str] = []  # 줄임말 등 메뉴 검색용 다른 이름
 
 class MenuCategory(BaseModel):
     id: int
@@ -58,6 +59,7 @@ MENU_DATA = [
                 id=1,
                 category_id=1,
                 name="아메리카노",
+                aliases=["아메", "아아", "뜨아"],
                 description="깊고 진한 에스프레소의 맛을 느낄 수 있는 클래식한 커피",
                 base_price=4500,
                 image_url="/images/menu/americano.jpg",
@@ -73,6 +75,7 @@ MENU_DATA = [
                 id=2,
                 category_id=1,
                 name="카페라떼",
+                aliases=["라떼", "카페 라떼"],
                 description="부드러운 우유와 에스프레소의 완벽한 조화",
                 base_price=5000,
                 image_url="/images/menu/latte.jpg",
@@ -95,6 +98,7 @@ MENU_DATA = [
                 id=3,
                 category_id=2,
                 name="그린티 라떼",
+                aliases=["녹차라떼", "녹차 라떼", "말차라떼"],
                 description="고급 말차와 우유의 조화",
                 base_price=5500,
                 image_url="/images/menu/green-tea-latte.jpg",
@@ -110,6 +114,7 @@ MENU_DATA = [
                 id=4,
                 category_id=2,
                 name="캐모마일",
+                aliases=["카모마일", "캐모마일 티"],
                 description="진정 효과가 있는 캐모마일 티",
                 base_price=4000,
                 image_url="/images/menu/chamomile.jpg",
@@ -140,6 +145,7 @@ MENU_DATA = [
                 id=6,
                 category_id=3,
                 name="치즈케이크",
+                aliases=["치즈 케이크"],
                 description="부드러운 뉴욕 치즈케이크",
                 base_price=6000,
                 image_url="/images/menu/cheesecake.jpg",
@@ -2,6 +2,9 @@ from typing import List, Optional, Dict, Any, Set
 from pydantic import BaseModel
 from datetime import datetime, timedelta
 
+# 세션에 보관하는 대화 기록 최대 개수 (프롬프트에는 이 중 일부만 사용)
+MAX_CONVERSATION_HISTORY = 50
+
 class OrderSession(BaseModel):
     session_id: str
     created_at: datetime
@@ -47,6 +50,8 @@ class OrderSessionManager:
             "content": content,
             "timestamp": datetime.now().isoformat()
         })
+        if len(session.conversation_history) > MAX_CONVERSATION_HISTORY:
+            del session.conversation_history[:-MAX_CONVERSATION_HISTORY]
     
     def clear_pending_clarifications(self, session_id: str):
         if session_id not in self.sessions:
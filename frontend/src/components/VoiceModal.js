@@ -3,7 +3,7 @@ import styled from 'styled-components';
 import { motion, AnimatePresence } from 'framer-motion';
 import { FaMicrophone, FaTimes } from 'react-icons/fa';
 import useVoiceRecognition from '../hooks/useVoiceRecognition';
-import { analyzeOrder, respondToClarification } from '../services/api';
+import { analyzeOrderStream, respondToClarificationStream } from '../services/api';
 
 const ModalOverlay = styled(motion.div)`
   position: fixed;
@@ -192,6 +192,8 @@ const VoiceModal = ({ isOpen, onClose, onOrderComplete }) => {
   const [clarificationItem, setClarificationItem] = useState('');
   const [clarificationMode, setClarificationMode] = useState(false);
   const processedAudioRef = useRef(false);
+  // 스트리밍 중 먼저 읽어 준 문장, 최종 응답이 같으면 다시 읽지 않음
+  const spokenEarlyRef = useRef('');
   const [currentOrder, setCurrentOrder] = useState(null);
 
   useEffect(() => {
@@ -217,10 +219,31 @@ const VoiceModal = ({ isOpen, onClose, onOrderComplete }) => {
   }, [error]);
 
   useEffect(() => {
+    const speakEarly = (message) => {
+      if (message && message !== spokenEarlyRef.current) {
+        spokenEarlyRef.current = message;
+        speakMessage(message);
+      }
+    };
+
+    const handleStreamEvent = (event, data) => {
+      if (event === 'transcript' && data.text) {
+        setStatus(`"${data.text}" 처리 중...`);
+      } else if (event === 'rule_result' && data.success && data.response) {
+        // 규칙 기반 응답은 LLM을 기다리지 않고 바로 읽어 줌
+        speakEarly(data.response.message);
+      } else if (event === 'partial_order' && (data.source === 'llm' || data.source === 'cache') && data.order
+        && data.order.is_order_related === false) {
+        // 완성된 LLM 분석이 일상 대화면 인사 문구를 바로 읽어 줌 (스트리밍 중 잘린 문장/추측 실행 결과는 읽지 않음)
+        speakEarly(data.order.greeting_response);
+      }
+    };
+
     const processAudio = async () => {
       
       if (!isListening && audioBlob && audioBlob.size > 0 && !processedAudioRef.current) {
         processedAudioRef.current = true; 
+        spokenEarlyRef.current = '';
         setIsLoading(true);
         setHasError(false);
         
@@ -230,7 +253,7 @@ const VoiceModal = ({ isOpen, onClose, onOrderComplete }) => {
           
           if (clarificationMode) {
             setStatus('추가 정보 처리 중...');
-            const result = await respondToClarification(audioBlob);
+            const result = await respondToClarificationStream(audioBlob, handleStreamEvent);
             console.log('명확화 응답 결과:', result);
             
             if (result.status === 'success' && result.data) {
@@ -284,7 +307,7 @@ const VoiceModal = ({ isOpen, onClose, onOrderComplete }) => {
           
           else {
             setStatus('주문 분석 중...');
-            const result = await analyzeOrder(audioBlob);
+            const result = await analyzeOrderStream(audioBlob, handleStreamEvent);
             console.log('서버 응답 수신:', result);
             
             if (result.status === 'success' && result.data) {
@@ -415,7 +438,7 @@ const VoiceModal = ({ isOpen, onClose, onOrderComplete }) => {
 
   // 응답이 업데이트될 때 TTS로
   useEffect(() => {
-    if (response && response.message) {
+    if (response && response.message && response.message !== spokenEarlyRef.current) {
       speakMessage(response.message);
     }
   }, [response]);
@@ -98,4 +98,110 @@ export const respondToClarification = async (audioBlob) => {
   }
 };
 
+const parseSSEChunk = (buffer, onEvent) => {
+  const blocks = buffer.split('\n\n');
+  const rest = blocks.pop();
+  blocks.forEach((block) => {
+    let event = 'message';
+    const dataLines = [];
+    block.split('\n').forEach((line) => {
+      if (line.startsWith('event:')) {
+        event = line.slice(6).trim();
+      } else if (line.startsWith('data:')) {
+        dataLines.push(line.slice(5).trim());
+      }
+    });
+    if (dataLines.length > 0) {
+      onEvent(event, JSON.parse(dataLines.join('\n')));
+    }
+  });
+  return rest;
+};
+
+const streamAudioRequest = async (path, formData, headers, onEvent) => {
+  const response = await fetch(`${API_BASE_URL}${path}`, {
+    method: 'POST',
+    headers,
+    body: formData,
+  });
+
+  if (!response.ok || !response.body) {
+    throw new Error(`스트리밍 요청 실패: ${response.status}`);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder('utf-8');
+  let buffer = '';
+  let finalResult = null;
+
+  const handleEvent = (event, data) => {
+    if (event === 'result') {
+      finalResult = data;
+    } else if (event === 'error') {
+      throw new Error(data.detail || '스트리밍 처리 중 오류가 발생했습니다.');
+    }
+    if (onEvent) {
+      onEvent(event, data);
+    }
+  };
+
+  try {
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+      buffer = parseSSEChunk(buffer, handleEvent);
+    }
+    parseSSEChunk(buffer + '\n\n', handleEvent);
+  } catch (error) {
+    // error 이벤트 등으로 중단하면 남은 스트림을 닫아 연결을 바로 끊음
+    await reader.cancel().catch(() => {});
+    throw error;
+  }
+
+  if (!finalResult) {
+    throw new Error('서버 응답 형식이 올바르지 않습니다');
+  }
+  return finalResult;
+};
+
+export const analyzeOrderStream = async (audioBlob, onEvent) => {
+  try {
+    const formData = new FormData();
+    const uniqueFilename = `audio_recording_${Date.now()}.webm`;
+    formData.append('audio_file', audioBlob, uniqueFilename);
+
+    const headers = {};
+    if (sessionId) {
+      headers['session-id'] = sessionId;
+    }
+
+    const result = await streamAudioRequest('/analyze-order/stream', formData, headers, onEvent);
+    if (result.session_id) {
+      setSessionId(result.session_id);
+    }
+    return result;
+  } catch (error) {
+    console.error('Error streaming order analysis:', error);
+    throw error;
+  }
+};
+
+export const respondToClarificationStream = async (audioBlob, onEvent) => {
+  try {
+    if (!sessionId) {
+      throw new Error('세션이 없습니다. 새로운 주문을 시작해주세요.');
+    }
+
+    const formData = new FormData();
+    const uniqueFilename = `clarification_response_${Date.now()}.webm`;
+    formData.append('audio_file', audioBlob, uniqueFilename);
+
+    return await streamAudioRequest('/respond-clarification/stream', formData, { 'session-id': sessionId }, onEvent);
+  } catch (error) {
+    console.error('Error streaming clarification response:', error);
+    throw error;
+  }
+};
+
 export default api;